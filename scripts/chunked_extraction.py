@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+分块提取 - 长文档按章节切块，各块并发提取后合并（map-reduce）
+
+整份文档放进一个提示词时，长简历和 34 个主题的盖洛普完整报告会超出 token 预算、耗时很长。
+这里把文本在章节边界处切成不超过 max_chars 的块，每块单独调用提取函数（并发执行），
+再按合并规则把各块的部分结果合并成一份：
+
+    合并规则（merge_rules）：
+        "first"       取第一个非空值（如 summary、tested_at）
+        "fields"      字典逐字段取第一个非空值（如 basics、domain_scores）
+        "unique"      列表去重合并，保持出现顺序（如 skills）
+        ("a", "b")    字典列表按这些字段去重（如 work_history 按公司+职位+开始时间），
+                      重复条目互相补全缺失字段
+    未列出的字段按值的类型处理：字典 → fields，列表 → unique，其他 → first
+
+使用方法：
+    from chunked_extraction import extract_chunked, split_into_chunks
+
+    result = extract_chunked(text, extract_chunk, RESUME_MERGE_RULES)
+"""
+
+import re
+import copy
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from similarity import normalize_text
+
+
+# 单块最大字符数（不超过该长度的文档不切分，行为与整份提取相同）
+CHUNK_MAX_CHARS = 8000
+
+# 同步提取时的最大并发块数
+CHUNK_WORKERS = 4
+
+# 章节标题：Markdown 标题、中文序号、"第X部分"、短的编号行
+HEADING_PATTERN = re.compile(
+    r'^\s*(#{1,6}\s+\S|[一二三四五六七八九十]+[、.．]|第[一二三四五六七八九十\d]+[章节部分]|\d{1,2}[.、]\s*\S)'
+)
+
+# 常见的简历 / 盖洛普报告章节名
+SECTION_KEYWORDS = (
+    '工作经历', '工作经验', '职业经历', '项目经历', '项目经验', '教育背景', '教育经历',
+    '专业技能', '技能', '获奖', '证书', '语言能力', '自我评价', '个人简介',
+    '主题', '领域', '优势',
+    'Experience', 'Education', 'Skills', 'Projects', 'Awards', 'Summary', 'Themes'
+)
+
+# 超过该长度的行不视为标题
+HEADING_MAX_CHARS = 40
+
+
+def is_section_boundary(line: str) -> bool:
+    """判断一行是否是章节开头（可以在它之前切分）"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > HEADING_MAX_CHARS:
+        return False
+    return bool(HEADING_PATTERN.match(stripped)) or any(keyword in stripped for keyword in SECTION_KEYWORDS)
+
+
+def split_sections(text: str) -> List[str]:
+    """在章节边界处切分文本（各段拼接后与原文相同）"""
+    sections = []
+    current = []
+    for line in text.splitlines(keepends=True):
+        if current and is_section_boundary(line):
+            sections.append(''.join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append(''.join(current))
+    return sections
+
+
+def pack(pieces: List[str], max_chars: int) -> List[str]:
+    """把连续的片段贪心地装进不超过 max_chars 的块"""
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ''
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_oversized(section: str, max_chars: int) -> List[str]:
+    """单个章节超长时，依次按空行段落、按行、按固定长度切分"""
+    if len(section) <= max_chars:
+        return [section]
+
+    paragraphs = re.split(r'(?<=\n)(?=\s*\n)', section)
+    if len(paragraphs) == 1:
+        paragraphs = section.splitlines(keepends=True)
+        if len(paragraphs) == 1:
+            return [section[i:i + max_chars] for i in range(0, len(section), max_chars)]
+
+    pieces = []
+    for paragraph in paragraphs:
+        pieces.extend(split_oversized(paragraph, max_chars))
+    return pack(pieces, max_chars)
+
+
+def split_into_chunks(text: str, max_chars: int = CHUNK_MAX_CHARS) -> List[str]:
+    """按章节切块（优先在章节边界切分，各块拼接后与原文相同）"""
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces = []
+    for section in split_sections(text):
+        pieces.extend(split_oversized(section, max_chars))
+    return pack(pieces, max_chars)
+
+
+def is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def dedupe_key(item: Any, fields: tuple) -> str:
+    """去重键：关键字段规范化后拼接；关键字段都为空时使用整个条目"""
+    if isinstance(item, dict):
+        values = [normalize_text(str(item.get(field) or "")) for field in fields]
+        if any(values):
+            return "\x1f".join(values)
+    return json.dumps(item, ensure_ascii=False, sort_keys=True)
+
+
+def merge_unique(target: List[Any], values: List[Any]):
+    seen = {json.dumps(v, ensure_ascii=False, sort_keys=True) for v in target}
+    for value in values:
+        key = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            target.append(value)
+
+
+def merge_fields(target: Dict[str, Any], values: Dict[str, Any]):
+    """逐字段补全：目标为空的字段取新值，两边都是列表时去重合并"""
+    for key, value in values.items():
+        if is_empty(target.get(key)):
+            target[key] = value
+        elif isinstance(target[key], list) and isinstance(value, list):
+            merge_unique(target[key], value)
+
+
+def merge_results(parts: List[Dict[str, Any]], merge_rules: Dict[str, Any]) -> Dict[str, Any]:
+    """按合并规则合并各块的提取结果（按块的顺序，前面的块优先；不修改传入的结果）"""
+    parts = copy.deepcopy(parts)
+    merged: Dict[str, Any] = {}
+    indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    for part in parts:
+        for key, value in part.items():
+            rule = merge_rules.get(key)
+            if rule is None:
+                rule = "fields" if isinstance(value, dict) else "unique" if isinstance(value, list) else "first"
+
+            if rule == "first":
+                if is_empty(merged.get(key)):
+                    merged[key] = value
+
+            elif rule == "fields":
+                if isinstance(value, dict):
+                    merge_fields(merged.setdefault(key, {}), value)
+
+            elif rule == "unique":
+                if isinstance(value, list):
+                    merge_unique(merged.setdefault(key, []), value)
+
+            elif isinstance(rule, tuple):
+                if not isinstance(value, list):
+                    continue
+                items = merged.setdefault(key, [])
+                index = indexes.setdefault(key, {})
+                for item in value:
+                    item_key = dedupe_key(item, rule)
+                    if item_key in index:
+                        if isinstance(item, dict):
+                            merge_fields(index[item_key], item)
+                    else:
+                        index[item_key] = item
+                        items.append(item)
+
+    return merged
+
+
+def extract_chunked(
+    text: str,
+    extract_chunk: Callable[[str], Optional[Dict[str, Any]]],
+    merge_rules: Dict[str, Any],
+    max_chars: int = CHUNK_MAX_CHARS,
+    workers: int = CHUNK_WORKERS
+) -> Optional[Dict[str, Any]]:
+    """
+    分块提取（线程池并发调用同步的 extract_chunk）
+
+    文本不超过 max_chars 时直接整份提取。任一块提取失败（返回 None）时整体返回 None，
+    由调用方回退到下一个提供方或规则提取，避免只拿到部分内容。
+    """
+    chunks = split_into_chunks(text, max_chars)
+    if len(chunks) == 1:
+        return extract_chunk(text)
+
+    print(f"✂️  文档较长（{len(text)} 字符），切成 {len(chunks)} 块并发提取")
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        parts = list(executor.map(extract_chunk, chunks))
+
+    if any(part is None for part in parts):
+        return None
+    return merge_results(parts, merge_rules)
+
+
+async def extract_chunked_async(
+    text: str,
+    extract_chunk: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    merge_rules: Dict[str, Any],
+    max_chars: int = CHUNK_MAX_CHARS
+) -> Optional[Dict[str, Any]]:
+    """
+    extract_chunked 的异步版本（各块并发执行，任一块抛出异常时异常照常抛出）
+
+    任一块失败（抛出异常或返回 None）时立即取消其余仍在进行的块，不再等它们完成后丢弃。
+    并发请求数由 extract_chunk 自己限制（例如 resume_parser 在每次 API 请求外取共享信号量）。
+    """
+    chunks = split_into_chunks(text, max_chars)
+    if len(chunks) == 1:
+        return await extract_chunk(text)
+
+    tasks = [asyncio.ensure_future(extract_chunk(chunk)) for chunk in chunks]
+    try:
+        for future in asyncio.as_completed(tasks):
+            if await future is None:
+                return None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # 同时失败的其他块：取出异常，避免 "exception was never retrieved" 警告
+                task.exception()
+    return merge_results([task.result() for task in tasks], merge_rules)
@@ -5,11 +5,14 @@
 
 使用方法：
     python decision_server.py
+    python decision_server.py --persona interviews/my-persona.md   # 预加载画像用于风险检测
 
 服务器启动后：
     - 访问 http://localhost:8000 查看网页
     - API会自动处理 /api/* 的请求
+    - POST /api/check-risk 返回完整的风险评估（画像启动时加载一次，文件变化后自动重新加载）
     - 数据存储在 data/decisions/ 目录
+    - 请求头 X-Tenant-ID 可选择租户，数据存储在 data/tenants/<tenant>/decisions/ 目录
 """
 
 import http.server
@@ -31,14 +34,20 @@ from decision_tracker import (
     record_decision,
     load_decision,
     load_all_decisions,
+    check_risk,
     get_decision_dir,
     DECISION_TYPES
 )
+from tenant_storage import TENANT_HEADER, normalize_tenant
+from risk_engine import PersonaContext
 
 
 class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
     """处理决策API请求的HTTP处理器"""
 
+    # 预加载的画像（由 run_server 设置，所有请求共享）
+    persona_context = None
+
     def __init__(self, *args, **kwargs):
         self.json_content_type = 'application/json;charset=utf-8'
         super().__init__(*args, **kwargs)
@@ -63,14 +72,28 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
         else:
             self.send_error(404, "Not Found")
 
+    def get_tenant(self):
+        """从请求头中获取租户ID（未提供时使用默认租户，无效时抛出 ValueError）"""
+        return normalize_tenant(self.headers.get(TENANT_HEADER))
+
     def handle_api_get(self, parsed):
         """处理API GET请求"""
         path = parsed.path
 
+        # 无效的租户ID是客户端错误
+        try:
+            tenant = self.get_tenant()
+        except ValueError as e:
+            self.send_json_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+            return
+
         try:
             if path == '/api/decisions':
                 # 获取所有决策
-                decisions = load_all_decisions()
+                decisions = load_all_decisions(tenant=tenant)
                 self.send_json_response({
                     'success': True,
                     'data': decisions
@@ -79,7 +102,7 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
             elif path.startswith('/api/decisions/'):
                 # 获取单个决策
                 decision_id = path.split('/')[-1]
-                decision = load_decision(decision_id)
+                decision = load_decision(decision_id, tenant)
 
                 if decision:
                     self.send_json_response({
@@ -94,7 +117,7 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
 
             elif path == '/api/stats':
                 # 获取统计信息
-                decisions = load_all_decisions()
+                decisions = load_all_decisions(tenant=tenant)
                 stats = self.calculate_stats(decisions)
                 self.send_json_response({
                     'success': True,
@@ -117,6 +140,16 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
         """处理API POST请求"""
         path = parsed.path
 
+        # 无效的租户ID是客户端错误
+        try:
+            tenant = self.get_tenant()
+        except ValueError as e:
+            self.send_json_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+            return
+
         try:
             # 读取请求体
             content_length = int(self.headers.get('Content-Length', 0))
@@ -124,17 +157,34 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
             data = json.loads(post_data.decode('utf-8'))
 
             if path == '/api/decisions':
-                # 创建新决策
+                # 创建新决策（同时做一次风险检测，引擎已预编译，耗时可忽略）
+                risk_assessment = check_risk(
+                    data.get('description', ''),
+                    persona_context=self.persona_context
+                )
                 decision = record_decision(
                     description=data.get('description', ''),
                     decision_type=data.get('type', 'important'),
                     rational_analysis=data.get('rational_analysis', ''),
                     emotional_factors=data.get('emotional_factors', []),
-                    ai_warning=data.get('ai_warning', '')
+                    ai_warning=data.get('ai_warning', ''),
+                    tenant=tenant
+                )
+                self.send_json_response({
+                    'success': True,
+                    'data': decision,
+                    'risk_assessment': risk_assessment
+                })
+
+            elif path == '/api/check-risk':
+                # 风险检测（不记录决策）
+                risk_assessment = check_risk(
+                    data.get('description', ''),
+                    persona_context=self.persona_context
                 )
                 self.send_json_response({
                     'success': True,
-                    'data': decision
+                    'data': risk_assessment
                 })
 
             elif path.startswith('/api/decisions/') and path.endswith('/status'):
@@ -145,7 +195,7 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
 
                 from decision_tracker import update_decision_status
 
-                updated_decision = update_decision_status(decision_id, new_status, note)
+                updated_decision = update_decision_status(decision_id, new_status, note, tenant)
                 self.send_json_response({
                     'success': True,
                     'data': updated_decision
@@ -160,7 +210,7 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
 
                 from decision_tracker import complete_decision
 
-                completed_decision = complete_decision(decision_id, result, outcome, lessons)
+                completed_decision = complete_decision(decision_id, result, outcome, lessons, tenant)
                 self.send_json_response({
                     'success': True,
                     'data': completed_decision
@@ -204,19 +254,28 @@ class DecisionAPIHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Content-Type', self.json_content_type)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', f'Content-Type, {TENANT_HEADER}')
         self.end_headers()
 
         response = json.dumps(data, ensure_ascii=False, indent=2)
         self.wfile.write(response.encode('utf-8'))
 
 
-def run_server(port=8000):
+class DecisionServer(socketserver.ThreadingTCPServer):
+    """多线程服务器：每个请求独立线程处理，一个租户的慢请求不会阻塞其他租户"""
+    daemon_threads = True
+
+
+def run_server(port=8000, persona_path=None):
     """启动Web服务器"""
     # 确保数据目录存在
     decision_dir = get_decision_dir()
     decision_dir.mkdir(parents=True, exist_ok=True)
 
+    # 预加载画像（在切换工作目录之前解析路径）
+    if persona_path:
+        DecisionAPIHandler.persona_context = PersonaContext(str(Path(persona_path).resolve()))
+
     # 设置MIME类型
     mimetypes.init()
 
@@ -228,6 +287,7 @@ def run_server(port=8000):
 📂 数据目录：{decision_dir}
 📄 API文档：http://localhost:{port}/api/
 🔄 状态检查：http://localhost:{port}/api/stats
+🔍 风险检测：POST http://localhost:{port}/api/check-risk（画像：{persona_path or '未加载'}）
 
 按 Ctrl+C 停止服务器
     """)
@@ -237,7 +297,7 @@ def run_server(port=8000):
 
     Handler = DecisionAPIHandler
 
-    with socketserver.TCPServer(("", port), Handler) as httpd:
+    with DecisionServer(("", port), Handler) as httpd:
         httpd.serve_forever()
 
 
@@ -246,10 +306,11 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="决策追踪Web服务器")
     parser.add_argument("--port", type=int, default=8000, help="端口号（默认8000）")
+    parser.add_argument("--persona", help="画像文件路径（预加载，用于风险检测）")
 
     args = parser.parse_args()
 
     try:
-        run_server(port=args.port)
+        run_server(port=args.port, persona_path=args.persona)
     except KeyboardInterrupt:
         print("\n\n✅ 服务器已停止")
@@ -6,7 +6,10 @@
     python decision_tracker.py record --type life_level --description "考虑买房"
     python decision_tracker.py history --days 30
     python decision_tracker.py analyze --pattern emotion_hijack
+    python decision_tracker.py analyze --all
     python decision_tracker.py check-risk --description "我要结婚"
+    python decision_tracker.py check-risk --input journal.ndjson > risks.ndjson   # 批量（- 表示stdin）
+    python decision_tracker.py --tenant alice history   # 按租户分片存储
 
 功能：
 - 记录决策（类型、时间、理由、情感因素）
@@ -22,6 +25,10 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
+from tenant_storage import get_decision_dir as get_tenant_decision_dir
+from risk_engine import get_risk_engine, PersonaContext
+from persona_store import load_persona
+
 
 # 决策分类
 DECISION_TYPES = {
@@ -55,18 +62,12 @@ DECISION_TYPES = {
     }
 }
 
-# 风险关键词
-HIGH_RISK_KEYWORDS = ["买房", "结婚", "生子", "投资", "换工作", "创业"]
-EMOTION_KEYWORDS = ["为了父母", "为了家人", "结婚需求", "应该", "必须"]
-OPPORTUNITY_KEYWORDS = ["发现了", "新机会", "有个想法", "我想做"]
+# 风险关键词和画像规则见 templates/risk_rules.json（由 risk_engine 编译）
 
 
-def get_decision_dir() -> Path:
-    """获取决策记录目录"""
-    script_dir = Path(__file__).parent.parent
-    decision_dir = script_dir / "data" / "decisions"
-    decision_dir.mkdir(parents=True, exist_ok=True)
-    return decision_dir
+def get_decision_dir(tenant: Optional[str] = None) -> Path:
+    """获取决策记录目录（指定租户时返回该租户的分片目录）"""
+    return get_tenant_decision_dir(tenant)
 
 
 def generate_decision_id() -> str:
@@ -80,7 +81,8 @@ def record_decision(
     decision_type: str = "important",
     rational_analysis: str = "",
     emotional_factors: List[str] = None,
-    ai_warning: str = ""
+    ai_warning: str = "",
+    tenant: Optional[str] = None
 ) -> Dict[str, Any]:
     """记录一个决策"""
     decision_id = generate_decision_id()
@@ -117,7 +119,7 @@ def record_decision(
     }
 
     # 保存到文件
-    decision_dir = get_decision_dir()
+    decision_dir = get_decision_dir(tenant)
     file_path = decision_dir / f"{decision_id}.json"
 
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -126,9 +128,9 @@ def record_decision(
     return decision
 
 
-def load_decision(decision_id: str) -> Optional[Dict[str, Any]]:
+def load_decision(decision_id: str, tenant: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """加载决策记录"""
-    decision_dir = get_decision_dir()
+    decision_dir = get_decision_dir(tenant)
     file_path = decision_dir / f"{decision_id}.json"
 
     if not file_path.exists():
@@ -138,9 +140,9 @@ def load_decision(decision_id: str) -> Optional[Dict[str, Any]]:
         return json.load(f)
 
 
-def load_all_decisions(days: Optional[int] = None) -> List[Dict[str, Any]]:
+def load_all_decisions(days: Optional[int] = None, tenant: Optional[str] = None) -> List[Dict[str, Any]]:
     """加载所有决策记录"""
-    decision_dir = get_decision_dir()
+    decision_dir = get_decision_dir(tenant)
     decisions = []
 
     cutoff_date = None
@@ -161,81 +163,38 @@ def load_all_decisions(days: Optional[int] = None) -> List[Dict[str, Any]]:
     return decisions
 
 
-def check_risk(description: str, persona_path: Optional[str] = None) -> Dict[str, Any]:
-    """检查决策风险"""
-    risk_assessment = {
-        "description": description,
-        "detected_keywords": [],
-        "decision_type_suggestion": "daily",
-        "emotion_factors": [],
-        "emotion_ratio": 0.0,
-        "risk_level": "low",
-        "warnings": [],
-        "required_actions": [],
-        "persona_references": []
-    }
-
-    # 检测高风险关键词
-    for keyword in HIGH_RISK_KEYWORDS:
-        if keyword in description:
-            risk_assessment["detected_keywords"].append(keyword)
-            risk_assessment["decision_type_suggestion"] = "life_level"
-
-    # 检测情感关键词
-    for keyword in EMOTION_KEYWORDS:
-        if keyword in description:
-            risk_assessment["emotion_factors"].append(keyword)
-
-    # 计算情感占比
-    if risk_assessment["emotion_factors"]:
-        risk_assessment["emotion_ratio"] = min(len(risk_assessment["emotion_factors"]) * 0.25, 1.0)
-
-    # 确定风险等级
-    if risk_assessment["decision_type_suggestion"] == "life_level":
-        risk_assessment["risk_level"] = "high"
-    elif risk_assessment["emotion_ratio"] > 0.5:
-        risk_assessment["risk_level"] = "high"
-        risk_assessment["decision_type_suggestion"] = "important"
-    elif len(risk_assessment["detected_keywords"]) > 0:
-        risk_assessment["risk_level"] = "medium"
-        risk_assessment["decision_type_suggestion"] = "important"
-
-    # 生成警告
-    if risk_assessment["risk_level"] == "high":
-        risk_assessment["warnings"].append("⚠️ 检测到高风险决策")
-
-        if risk_assessment["emotion_ratio"] > 0.5:
-            risk_assessment["warnings"].append(
-                f"⚠️ 情感因素占比{risk_assessment['emotion_ratio']*100:.0f}%，可能劫持理性"
-            )
-
-        risk_assessment["warnings"].append("⚠️ 建议执行7天冷静期")
+def check_risk(
+    description: str,
+    persona_path: Optional[str] = None,
+    rules_path: Optional[str] = None,
+    persona_context: Optional[PersonaContext] = None
+) -> Dict[str, Any]:
+    """
+    检查决策风险
+
+    关键词和画像规则来自 templates/risk_rules.json（可用 rules_path 指定），
+    编译成自动机后一次扫描完成评分。
+    画像从画像存储加载；常驻进程可传入预加载的 persona_context，避免每次检查画像文件，
+    此时规则取自 persona_context（规则文件编辑到一半时继续使用上次加载的规则）。
+    """
+    if persona_context:
+        engine, references = persona_context.current()
+    else:
+        engine = get_risk_engine(rules_path)
+    risk_assessment = engine.assess(description)
 
     # 必要行动
     if risk_assessment["decision_type_suggestion"] == "life_level":
         risk_assessment["required_actions"] = DECISION_TYPES["life_level"]["required_actions"]
 
     # 引用画像（如果提供）
-    if persona_path:
-        try:
-            with open(persona_path, 'r', encoding='utf-8') as f:
-                persona_content = f.read()
-
-            # 提取关键引用
-            if "战略规划14年" in persona_content:
-                risk_assessment["persona_references"].append(
-                    "你简历上写着战略规划14年，这次有做战略分析吗？"
-                )
+    if persona_context:
+        risk_assessment["persona_references"] = references
 
-            if "盖洛普" in persona_content and "责任" in persona_content:
-                risk_assessment["persona_references"].append(
-                    "你盖洛普'责任'主题排名第3，是不是又在对他人的期待负责？"
-                )
-
-            if "情感劫持" in persona_content:
-                risk_assessment["persona_references"].append(
-                    "根据你的画像，纯理性判断准确率>2/3，情感介入往往失败。这次是什么情况？"
-                )
+    elif persona_path:
+        try:
+            persona = load_persona(persona_path, save=False)
+            risk_assessment["persona_references"] = engine.persona_references(persona["content"])
 
         except Exception as e:
             print(f"⚠️  无法读取画像文件：{e}")
@@ -243,35 +202,169 @@ def check_risk(description: str, persona_path: Optional[str] = None) -> Dict[str
     return risk_assessment
 
 
-def analyze_pattern(pattern: str) -> Dict[str, Any]:
-    """分析决策模式"""
-    decisions = load_all_decisions()
+# 批量风险检测的子进程状态（由 _init_risk_worker 设置）
+_risk_worker_state: Dict[str, Any] = {}
+
+
+def _init_risk_worker(rules_path: Optional[str], persona_references: List[str]):
+    """子进程初始化：编译一次规则，画像引用由主进程预先计算"""
+    _risk_worker_state["rules_path"] = rules_path
+    _risk_worker_state["persona_references"] = persona_references
+    get_risk_engine(rules_path)
 
-    analysis = {
-        "pattern": pattern,
-        "total_decisions": len(decisions),
-        "findings": [],
-        "recommendations": []
-    }
 
-    if pattern == "emotion_hijack":
-        # 分析情感劫持模式
-        emotion_decisions = [d for d in decisions if d.get("emotion_ratio", 0) > 0.5]
+def _score_line(item) -> tuple:
+    """对一行输入做风险检测，返回 (是否失败, 一行NDJSON)"""
+    line_no, line = item
+
+    try:
+        entry = json.loads(line)
+        if isinstance(entry, str):
+            entry = {"description": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("description"), str):
+            raise ValueError("缺少 description 字段")
 
+        risk_assessment = check_risk(entry["description"], rules_path=_risk_worker_state.get("rules_path"))
+        risk_assessment["persona_references"] = list(_risk_worker_state.get("persona_references", []))
+
+        result = {"line": line_no}
+        if "id" in entry:
+            result["id"] = entry["id"]
+        result.update(risk_assessment)
+
+    except Exception as e:
+        return True, json.dumps({"line": line_no, "error": str(e)}, ensure_ascii=False)
+
+    return False, json.dumps(result, ensure_ascii=False)
+
+
+def check_risk_stream(
+    input_stream,
+    output_stream,
+    persona_path: Optional[str] = None,
+    rules_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 10000
+) -> Dict[str, int]:
+    """
+    批量风险检测
+
+    输入每行一个JSON对象（{"id": ..., "description": "..."}）或JSON字符串，
+    输出每行一个风险评估（NDJSON，顺序与输入一致，附带行号和id）。
+    按 batch_size 分批读入，多进程评分，同时最多只有两批在内存中。
+    """
+    import os
+    from itertools import islice
+    from multiprocessing import Pool
+
+    # 画像只读取一次，引用结果下发给所有子进程
+    persona_references = []
+    if persona_path:
+        persona_references = PersonaContext(persona_path, rules_path).references()
+
+    workers = workers or os.cpu_count() or 1
+    stats = {"total": 0, "errors": 0}
+
+    def batches():
+        numbered = ((i, line) for i, line in enumerate(input_stream, 1) if line.strip())
+        while True:
+            batch = list(islice(numbered, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def write(results: List[tuple]):
+        for failed, result in results:
+            stats["total"] += 1
+            stats["errors"] += failed
+            output_stream.write(result + "\n")
+        output_stream.flush()
+
+    if workers == 1:
+        _init_risk_worker(rules_path, persona_references)
+        for batch in batches():
+            write([_score_line(item) for item in batch])
+        return stats
+
+    chunksize = max(1, batch_size // (workers * 8))
+    with Pool(workers, initializer=_init_risk_worker, initargs=(rules_path, persona_references)) as pool:
+        # 双缓冲：提交下一批后再写出上一批的结果
+        pending = None
+        for batch in batches():
+            submitted = pool.map_async(_score_line, batch, chunksize)
+            if pending:
+                write(pending.get())
+            pending = submitted
+        if pending:
+            write(pending.get())
+
+    return stats
+
+
+# 决策模式检测器注册表：模式名称 -> 检测器类
+PATTERN_DETECTORS: Dict[str, type] = {}
+
+
+def register_pattern(name: str):
+    """注册决策模式检测器（装饰器）"""
+    def decorator(cls):
+        cls.name = name
+        PATTERN_DETECTORS[name] = cls
+        return cls
+    return decorator
+
+
+class PatternDetector:
+    """
+    决策模式检测器基类
+
+    analyze_patterns 只遍历一次决策记录（按时间倒序），依次调用每个检测器的
+    observe()，最后调用 finish() 填写发现和建议。新增检测器不会增加扫描次数。
+    """
+    name = ""
+
+    def observe(self, index: int, decision: Dict[str, Any]):
+        """接收一条决策（index 为按时间倒序的序号，0 为最新）"""
+
+    def finish(self, analysis: Dict[str, Any]):
+        """填写 analysis["findings"] 和 analysis["recommendations"]"""
+
+
+@register_pattern("emotion_hijack")
+class EmotionHijackDetector(PatternDetector):
+    """情感劫持模式：情感占比>50%的决策，以及最近5个决策的情感趋势"""
+
+    def __init__(self):
+        self.emotion_count = 0
+        self.emotion_sum = 0.0
+        self.recent_count = 0
+        self.recent_sum = 0.0
+
+    def observe(self, index, decision):
+        emotion_ratio = decision.get("emotion_ratio", 0)
+        if emotion_ratio > 0.5:
+            self.emotion_count += 1
+            self.emotion_sum += emotion_ratio
+        if index < 5:
+            self.recent_count += 1
+            self.recent_sum += emotion_ratio
+
+    def finish(self, analysis):
         analysis["findings"].append(
-            f"发现{len(emotion_decisions)}个可能被情感劫持的决策（占比>50%）"
+            f"发现{self.emotion_count}个可能被情感劫持的决策（占比>50%）"
         )
 
-        if len(emotion_decisions) > 0:
-            avg_emotion = sum(d.get("emotion_ratio", 0) for d in emotion_decisions) / len(emotion_decisions)
+        if self.emotion_count > 0:
+            avg_emotion = self.emotion_sum / self.emotion_count
             analysis["findings"].append(
                 f"平均情感占比：{avg_emotion*100:.0f}%"
             )
 
         # 检查趋势
-        recent_decisions = decisions[:5] if len(decisions) >= 5 else decisions
-        recent_emotion_ratio = sum(d.get("emotion_ratio", 0) for d in recent_decisions) / len(recent_decisions)
+        if self.recent_count == 0:
+            return
 
+        recent_emotion_ratio = self.recent_sum / self.recent_count
         if recent_emotion_ratio > 0.3:
             analysis["recommendations"].append(
                 "⚠️ 最近决策中情感因素较多，建议加强冷静期执行"
@@ -281,33 +374,184 @@ def analyze_pattern(pattern: str) -> Dict[str, Any]:
                 "✅ 最近决策较为理性，继续保持"
             )
 
-    elif pattern == "validation":
-        # 分析验证模式
-        no_validation = [d for d in decisions if "验证" not in d.get("rational_analysis", "")]
 
+@register_pattern("validation")
+class ValidationDetector(PatternDetector):
+    """验证模式：理性分析中没有提到"验证"的决策"""
+
+    def __init__(self):
+        self.no_validation = 0
+
+    def observe(self, index, decision):
+        if "验证" not in decision.get("rational_analysis", ""):
+            self.no_validation += 1
+
+    def finish(self, analysis):
         analysis["findings"].append(
-            f"发现{len(no_validation)}个可能未做充分验证的决策"
+            f"发现{self.no_validation}个可能未做充分验证的决策"
         )
 
-        if len(no_validation) > 3:
+        if self.no_validation > 3:
             analysis["recommendations"].append(
                 "⚠️ 你经常跳过验证环节，建议每次决策前先做市场验证"
             )
 
-    elif pattern == "multi_task":
-        # 分析多任务模式
-        active_decisions = [d for d in decisions if d.get("outcome") == "pending"]
 
+@register_pattern("multi_task")
+class MultiTaskDetector(PatternDetector):
+    """多任务模式：同时待完成的决策数量"""
+
+    def __init__(self):
+        self.active = 0
+
+    def observe(self, index, decision):
+        if decision.get("outcome") == "pending":
+            self.active += 1
+
+    def finish(self, analysis):
         analysis["findings"].append(
-            f"当前有{len(active_decisions)}个待完成决策"
+            f"当前有{self.active}个待完成决策"
         )
 
-        if len(active_decisions) > 3:
+        if self.active > 3:
             analysis["recommendations"].append(
                 "⚠️ 同时进行的决策过多，建议聚焦完成其中一个"
             )
 
-    return analysis
+
+# 分析结果缓存文件（保存在决策目录旁边，不放进决策目录，以免被当成决策记录读取；
+# 目录签名不变时命令行下次运行直接读取）
+PATTERN_CACHE_FILENAME = ".pattern_cache.json"
+
+# 检测器逻辑变化时递增，旧缓存作废
+PATTERN_CACHE_VERSION = 1
+
+# 进程内缓存：决策目录 -> (目录签名, 决策总数, {模式: 分析结果})
+_pattern_cache: Dict[str, tuple] = {}
+
+
+def get_store_signature(decision_dir: Path) -> tuple:
+    """决策目录签名（文件名、修改时间、大小），只读取目录项，不打开文件"""
+    import os
+
+    entries = []
+    with os.scandir(decision_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+def load_pattern_cache(decision_dir: Path, signature: tuple) -> Optional[tuple]:
+    """读取分析结果缓存文件，签名、检测器或缓存版本不一致时返回 None"""
+    cache_path = decision_dir.parent / PATTERN_CACHE_FILENAME
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("cache_version") == PATTERN_CACHE_VERSION \
+                    and cache.get("patterns") == sorted(PATTERN_DETECTORS) \
+                    and cache.get("decision_dir") == str(decision_dir) \
+                    and cache.get("signature") == [list(entry) for entry in signature]:
+                return signature, cache["total"], cache["results"]
+        except (OSError, ValueError, KeyError):
+            pass
+    return None
+
+
+def save_pattern_cache(decision_dir: Path, signature: tuple, total: int, results: Dict[str, Any]):
+    """保存分析结果缓存文件（写入失败只提示，不影响分析）"""
+    cache_path = decision_dir.parent / PATTERN_CACHE_FILENAME
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "cache_version": PATTERN_CACHE_VERSION,
+                "patterns": sorted(PATTERN_DETECTORS),
+                "decision_dir": str(decision_dir),
+                "signature": signature,
+                "total": total,
+                "results": results
+            }, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠️  无法写入模式分析缓存：{e}")
+
+
+def analyze_patterns(
+    patterns: Optional[List[str]] = None,
+    tenant: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    一次扫描分析多个决策模式（patterns 为空时分析所有已注册模式）
+
+    结果按决策目录缓存（进程内，并写入决策目录旁边的 .pattern_cache.json），
+    目录内容变化前重复调用、或命令行再次运行时不会再读取决策文件
+    """
+    import copy
+
+    decision_dir = get_decision_dir(tenant)
+    signature = get_store_signature(decision_dir)
+
+    cached = _pattern_cache.get(str(decision_dir))
+    if not (cached and cached[0] == signature):
+        cached = load_pattern_cache(decision_dir, signature)
+        if cached:
+            _pattern_cache[str(decision_dir)] = cached
+
+    if cached:
+        _, total, results = cached
+    else:
+        decisions = load_all_decisions(tenant=tenant)
+        detectors = {name: cls() for name, cls in PATTERN_DETECTORS.items()}
+
+        for index, decision in enumerate(decisions):
+            for detector in detectors.values():
+                detector.observe(index, decision)
+
+        total = len(decisions)
+        results = {}
+        for name, detector in detectors.items():
+            analysis = {
+                "pattern": name,
+                "total_decisions": len(decisions),
+                "findings": [],
+                "recommendations": []
+            }
+            detector.finish(analysis)
+            results[name] = analysis
+
+        _pattern_cache[str(decision_dir)] = (signature, total, results)
+        save_pattern_cache(decision_dir, signature, total, results)
+
+    analyses = {}
+    for name in patterns or list(results):
+        if name in results:
+            analyses[name] = copy.deepcopy(results[name])
+        else:
+            # 未注册的模式：没有发现和建议
+            analyses[name] = {"pattern": name, "total_decisions": total, "findings": [], "recommendations": []}
+    return analyses
+
+
+def analyze_pattern(pattern: str, tenant: Optional[str] = None) -> Dict[str, Any]:
+    """分析单个决策模式"""
+    return analyze_patterns([pattern], tenant=tenant)[pattern]
+
+
+def print_pattern_analysis(analysis: Dict[str, Any]):
+    """打印模式分析结果"""
+    print(f"\n📊 决策模式分析：{analysis['pattern']}")
+    print(f"  总决策数：{analysis['total_decisions']}")
+
+    if analysis["findings"]:
+        print("\n发现：")
+        for finding in analysis["findings"]:
+            print(f"  • {finding}")
+
+    if analysis["recommendations"]:
+        print("\n建议：")
+        for rec in analysis["recommendations"]:
+            print(f"  {rec}")
 
 
 def print_decision_summary(decision: Dict[str, Any]):
@@ -361,9 +605,14 @@ def print_decision_history(decisions: List[Dict[str, Any]]):
         print()
 
 
-def update_decision_status(decision_id: str, new_status: str, note: str = "") -> Dict[str, Any]:
+def update_decision_status(
+    decision_id: str,
+    new_status: str,
+    note: str = "",
+    tenant: Optional[str] = None
+) -> Dict[str, Any]:
     """更新决策状态"""
-    decision = load_decision(decision_id)
+    decision = load_decision(decision_id, tenant)
     if not decision:
         raise ValueError(f"决策 {decision_id} 不存在")
 
@@ -384,7 +633,7 @@ def update_decision_status(decision_id: str, new_status: str, note: str = "") ->
         })
 
     # 保存更新后的决策
-    decision_dir = get_decision_dir()
+    decision_dir = get_decision_dir(tenant)
     file_path = decision_dir / f"{decision_id}.json"
 
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -393,9 +642,15 @@ def update_decision_status(decision_id: str, new_status: str, note: str = "") ->
     return decision
 
 
-def complete_decision(decision_id: str, result: str, outcome: str, lessons: str = "") -> Dict[str, Any]:
+def complete_decision(
+    decision_id: str,
+    result: str,
+    outcome: str,
+    lessons: str = "",
+    tenant: Optional[str] = None
+) -> Dict[str, Any]:
     """完成决策"""
-    decision = load_decision(decision_id)
+    decision = load_decision(decision_id, tenant)
     if not decision:
         raise ValueError(f"决策 {decision_id} 不存在")
 
@@ -411,7 +666,7 @@ def complete_decision(decision_id: str, result: str, outcome: str, lessons: str
     decision["updated_at"] = datetime.now().isoformat()
 
     # 保存
-    decision_dir = get_decision_dir()
+    decision_dir = get_decision_dir(tenant)
     file_path = decision_dir / f"{decision_id}.json"
 
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -420,9 +675,13 @@ def complete_decision(decision_id: str, result: str, outcome: str, lessons: str
     return decision
 
 
-def list_decisions_by_status(status: str, days: Optional[int] = None) -> List[Dict[str, Any]]:
+def list_decisions_by_status(
+    status: str,
+    days: Optional[int] = None,
+    tenant: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """按状态列出决策"""
-    decisions = load_all_decisions(days=days)
+    decisions = load_all_decisions(days=days, tenant=tenant)
 
     filtered = [d for d in decisions if d.get("outcome") == status]
 
@@ -432,10 +691,37 @@ def list_decisions_by_status(status: str, days: Optional[int] = None) -> List[Di
     return filtered
 
 
+def positive_int(value: str) -> int:
+    """argparse 参数类型：正整数"""
+    import argparse
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数：{value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须大于等于 1：{value}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """argparse 参数类型：非负整数"""
+    import argparse
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数：{value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"必须大于等于 0：{value}")
+    return number
+
+
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="决策追踪系统")
+    parser.add_argument("--tenant", help="租户ID（按用户分片存储，默认使用全局目录）")
     subparsers = parser.add_subparsers(dest="command", help="可用命令")
 
     # record命令
@@ -453,14 +739,19 @@ def main():
 
     # check-risk命令
     risk_parser = subparsers.add_parser("check-risk", help="检查决策风险")
-    risk_parser.add_argument("--description", required=True, help="决策描述")
+    risk_input = risk_parser.add_mutually_exclusive_group(required=True)
+    risk_input.add_argument("--description", help="决策描述")
+    risk_input.add_argument("--input", help="批量检测：NDJSON文件路径（- 表示stdin），结果以NDJSON输出到stdout")
     risk_parser.add_argument("--persona", help="画像文件路径")
+    risk_parser.add_argument("--rules", help="风险规则文件路径（默认 templates/risk_rules.json）")
+    risk_parser.add_argument("--workers", type=positive_int, help="批量检测的进程数（默认CPU核数）")
+    risk_parser.add_argument("--batch-size", type=positive_int, default=10000, help="批量检测每批读取的行数（默认10000）")
 
     # analyze命令
     analyze_parser = subparsers.add_parser("analyze", help="分析决策模式")
-    analyze_parser.add_argument("--pattern", required=True,
-                               choices=["emotion_hijack", "validation", "multi_task"],
-                               help="分析模式")
+    analyze_target = analyze_parser.add_mutually_exclusive_group(required=True)
+    analyze_target.add_argument("--pattern", choices=list(PATTERN_DETECTORS), help="分析模式")
+    analyze_target.add_argument("--all", action="store_true", help="一次扫描分析所有模式")
 
     # update-status命令
     status_parser = subparsers.add_parser("update-status", help="更新决策状态")
@@ -498,17 +789,30 @@ def main():
                 decision_type=args.type,
                 rational_analysis=args.rational or "",
                 emotional_factors=args.emotions,
-                ai_warning=args.warning or ""
+                ai_warning=args.warning or "",
+                tenant=args.tenant
             )
             print("✅ 决策已记录")
             print_decision_summary(decision)
 
         elif args.command == "history":
-            decisions = load_all_decisions(days=args.days)
+            decisions = load_all_decisions(days=args.days, tenant=args.tenant)
             print_decision_history(decisions)
 
+        elif args.command == "check-risk" and args.input:
+            if args.input == "-":
+                stats = check_risk_stream(sys.stdin, sys.stdout, args.persona, args.rules,
+                                          args.workers, args.batch_size)
+            else:
+                with open(args.input, 'r', encoding='utf-8') as f:
+                    stats = check_risk_stream(f, sys.stdout, args.persona, args.rules,
+                                              args.workers, args.batch_size)
+
+            # 统计信息输出到stderr，不污染NDJSON结果
+            print(f"✅ 已检测 {stats['total']} 条，失败 {stats['errors']} 条", file=sys.stderr)
+
         elif args.command == "check-risk":
-            risk_assessment = check_risk(args.description, args.persona)
+            risk_assessment = check_risk(args.description, args.persona, args.rules)
 
             print(f"\n🔍 决策风险评估")
             print(f"  决策：{risk_assessment['description']}")
@@ -521,6 +825,9 @@ def main():
                 print(f"  情感因素：{', '.join(risk_assessment['emotion_factors'])}")
                 print(f"  情感占比：{risk_assessment['emotion_ratio']*100:.0f}%")
 
+            if risk_assessment["opportunity_signals"]:
+                print(f"  机会信号：{', '.join(risk_assessment['opportunity_signals'])}")
+
             print(f"  风险等级：{risk_assessment['risk_level'].upper()}")
 
             if risk_assessment["warnings"]:
@@ -539,26 +846,16 @@ def main():
                     print(f"  • {ref}")
 
         elif args.command == "analyze":
-            analysis = analyze_pattern(args.pattern)
-
-            print(f"\n📊 决策模式分析：{args.pattern}")
-            print(f"  总决策数：{analysis['total_decisions']}")
-
-            if analysis["findings"]:
-                print("\n发现：")
-                for finding in analysis["findings"]:
-                    print(f"  • {finding}")
-
-            if analysis["recommendations"]:
-                print("\n建议：")
-                for rec in analysis["recommendations"]:
-                    print(f"  {rec}")
+            patterns = None if args.all else [args.pattern]
+            for analysis in analyze_patterns(patterns, tenant=args.tenant).values():
+                print_pattern_analysis(analysis)
 
         elif args.command == "update-status":
             decision = update_decision_status(
                 decision_id=args.decision_id,
                 new_status=args.status,
-                note=args.note or ""
+                note=args.note or "",
+                tenant=args.tenant
             )
             print(f"✅ 决策状态已更新：{args.decision_id}")
             print(f"  状态：{args.status}")
@@ -570,7 +867,8 @@ def main():
                 decision_id=args.decision_id,
                 result=args.result,
                 outcome=args.outcome,
-                lessons=args.lessons or ""
+                lessons=args.lessons or "",
+                tenant=args.tenant
             )
             print(f"✅ 决策已完成：{args.decision_id}")
             print(f"  结果：{args.result}")
@@ -580,7 +878,7 @@ def main():
 
         elif args.command == "list":
             if args.status:
-                decisions = list_decisions_by_status(args.status, args.days)
+                decisions = list_decisions_by_status(args.status, args.days, tenant=args.tenant)
                 status_names = {
                     "pending": "待处理",
                     "in_progress": "进行中",
@@ -590,7 +888,7 @@ def main():
                 }
                 print(f"\n📋 {status_names[args.status]}的决策（共{len(decisions)}条）\n")
             else:
-                decisions = load_all_decisions(days=args.days)
+                decisions = load_all_decisions(days=args.days, tenant=args.tenant)
                 print(f"\n📋 所有决策（最近{args.days or '全部'}天，共{len(decisions)}条）\n")
 
             if not decisions:
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+文档读取 - 统一的格式注册表（PDF、DOCX、Markdown、纯文本）
+
+resume_parser 和 gallup_parser 共用。每种格式注册一个逐段生成文本的函数：
+    PDF       逐页（PyPDF2，经 pdf_loader）
+    DOCX      逐段落（python-docx）
+    Markdown  逐行
+    纯文本    逐行
+
+PyPDF2、python-docx 和 pdf_loader 只在读取对应格式时才导入，读取 Markdown 不会加载它们。
+缺少依赖时抛出 MissingDependencyError（而不是退出进程），由命令行入口决定如何提示。
+
+使用方法：
+    from document_ingest import iter_text, read_text
+
+    text = read_text("resume.pdf")            # 整个文档（PDF 页数多时并行提取）
+    for piece in iter_text("report.pdf"):     # 逐页 / 逐段惰性读取，可以提前结束
+        ...
+
+    ''.join(iter_text(path)) == read_text(path)
+"""
+
+import importlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class MissingDependencyError(ImportError):
+    """读取某种格式所需的库未安装"""
+
+    def __init__(self, package: str, format_name: str):
+        super().__init__(f"读取 {format_name} 文件需要安装 {package}（请运行：pip install {package}）")
+        self.package = package
+        self.format_name = format_name
+
+
+class UnsupportedFormatError(ValueError):
+    """不支持的文件格式"""
+
+
+# 格式名称 → {"suffixes", "iter_text", "requires": (模块名, pip 包名) 或 None}
+FORMATS: Dict[str, Dict[str, Any]] = {}
+
+
+def register_format(
+    name: str,
+    suffixes: Tuple[str, ...],
+    iter_func: Callable[..., Iterator[str]],
+    requires: Optional[Tuple[str, str]] = None
+):
+    """注册一种格式（iter_func(path, **options) 逐段生成文本，各段拼接后为全文）"""
+    FORMATS[name] = {"suffixes": tuple(s.lower() for s in suffixes), "iter_text": iter_func, "requires": requires}
+
+
+def supported_suffixes() -> Tuple[str, ...]:
+    return tuple(suffix for spec in FORMATS.values() for suffix in spec["suffixes"])
+
+
+def detect_format(file_path: str) -> str:
+    """按扩展名判断格式"""
+    suffix = Path(file_path).suffix.lower()
+    for name, spec in FORMATS.items():
+        if suffix in spec["suffixes"]:
+            return name
+    raise UnsupportedFormatError(f"不支持的文件格式：{suffix or '（无扩展名）'}")
+
+
+def require(format_name: str):
+    """检查格式依赖（未安装时抛出 MissingDependencyError）"""
+    requires = FORMATS[format_name]["requires"]
+    if requires is None:
+        return
+    module, package = requires
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        raise MissingDependencyError(package, format_name) from None
+
+
+def prepare(file_path: str) -> str:
+    """检查文件存在、格式受支持且依赖已安装，返回格式名称"""
+    if not Path(file_path).exists():
+        raise FileNotFoundError(f"文件不存在：{file_path}")
+    format_name = detect_format(file_path)
+    require(format_name)
+    return format_name
+
+
+def iter_text(file_path: str, **options) -> Iterator[str]:
+    """
+    逐段读取文本（PDF 逐页，DOCX 逐段落，Markdown / 纯文本逐行）
+
+    文件、格式和依赖在调用时立即检查；文本在迭代时才读取。
+    PDF 支持 start / end 页码范围。
+    """
+    format_name = prepare(file_path)
+    return FORMATS[format_name]["iter_text"](file_path, **options)
+
+
+def read_text(file_path: str, workers: Optional[int] = None) -> str:
+    """读取整个文档的文本（PDF 页数多时按页段并行提取，workers 为进程数）"""
+    format_name = prepare(file_path)
+    if format_name == "PDF":
+        from pdf_loader import extract_text
+        return extract_text(file_path, workers)
+    return ''.join(FORMATS[format_name]["iter_text"](file_path))
+
+
+def iter_pdf(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    from pdf_loader import iter_pages
+    yield from iter_pages(file_path, start, end)
+
+
+def iter_docx(file_path: str) -> Iterator[str]:
+    from docx import Document
+    for i, paragraph in enumerate(Document(file_path).paragraphs):
+        yield ('\n' if i else '') + paragraph.text
+
+
+def iter_lines(file_path: str) -> Iterator[str]:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from f
+
+
+register_format("PDF", (".pdf",), iter_pdf, requires=("PyPDF2", "PyPDF2"))
+register_format("DOCX", (".docx",), iter_docx, requires=("docx", "python-docx"))
+register_format("Markdown", (".md", ".markdown"), iter_lines)
+register_format("纯文本", (".txt",), iter_lines)
+
+
+def main():
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="读取文档文本")
+    parser.add_argument("file", help="PDF / DOCX / Markdown / 纯文本文件")
+    args = parser.parse_args()
+
+    try:
+        for piece in iter_text(args.file):
+            sys.stdout.write(piece)
+    except (MissingDependencyError, UnsupportedFormatError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
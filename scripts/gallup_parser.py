@@ -2,15 +2,16 @@
 """
 盖洛普优势解析器 - 从盖洛普优势报告中提取结构化信息
 
-支持格式：PDF
+支持格式：PDF（另支持 DOCX、Markdown、纯文本，见 document_ingest.py）
 输出格式：JSON
 
 使用方法：
     python gallup_parser.py gallup_report.pdf
     python gallup_parser.py gallup_report.pdf --output gallup_data.json
+    python gallup_parser.py gallup_report.pdf --full    # 规则提取时读取完整报告
 
 依赖：
-    PyPDF2>=3.0.0
+    PyPDF2>=3.0.0（读取 PDF 时需要）
 
 注意：盖洛普报告的格式可能因版本不同而有所差异，此脚本基于常见格式设计。
 如果解析失败，会回退到手动输入模式。
@@ -18,44 +19,96 @@
 
 import sys
 import json
-import re
 import os
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
 
+from document_ingest import MissingDependencyError, UnsupportedFormatError, iter_text, read_text
+from llm_cache import cached_extract
+from chunked_extraction import extract_chunked
+from provider_health import get_provider_health
+from llm_clients import stream
+from streaming_json import describe, parse_stream
+from gallup_themes import ReportScanner
 
-def parse_pdf(file_path: str) -> str:
-    """解析 PDF 文件"""
+
+# 提示词版本（修改提取提示词时递增，使旧的缓存结果失效）
+GALLUP_PROMPT_VERSION = "gallup-v1"
+
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+
+# 完整报告分块提取后的合并规则（见 chunked_extraction.merge_results）
+GALLUP_MERGE_RULES = {
+    "tested_at": "first",
+    "top_themes": ("name", "name_en"),
+    "domain_scores": "fields"
+}
+
+
+def parse_report(file_path: str) -> str:
+    """读取盖洛普报告文本（格式见 document_ingest；缺少依赖时抛出 MissingDependencyError，其他读取错误返回空字符串）"""
     try:
-        import PyPDF2
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text()
-        return text
-    except ImportError:
-        print("错误：需要安装 PyPDF2")
-        print("请运行：pip install PyPDF2")
-        sys.exit(1)
+        # PDF 逐页提取，长文档按页段并行，最后只拼接一次
+        return read_text(file_path)
+    except (MissingDependencyError, FileNotFoundError, UnsupportedFormatError):
+        raise
     except Exception as e:
-        print(f"PDF解析错误：{e}")
+        print(f"报告解析错误：{e}")
         return ""
 
 
-def extract_with_claude(text: str) -> Optional[Dict[str, Any]]:
-    """使用 Claude API 提取盖洛普信息"""
+def extract_report_with_rules(file_path: str, full: bool = False) -> Optional[Dict[str, Any]]:
+    """逐页读取报告并规则提取（缺少依赖时抛出 MissingDependencyError，其他读取错误返回 None）"""
+    pages = iter_text(file_path)
     try:
-        import anthropic
+        return extract_with_rules_from_pages(pages, full)
+    except Exception as e:
+        print(f"报告解析错误：{e}")
+        return None
 
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        if not api_key:
-            return None
 
-        client = anthropic.Anthropic(api_key=api_key)
+def extract_with_claude(text: str) -> Optional[Dict[str, Any]]:
+    """使用 Claude API 提取盖洛普信息（完整报告分块并发提取；结果按文本哈希缓存，同一份报告不重复调用）"""
+    info = extract_chunked(
+        text,
+        lambda chunk: cached_extract("anthropic", CLAUDE_MODEL, GALLUP_PROMPT_VERSION, chunk, request_claude),
+        GALLUP_MERGE_RULES
+    )
+
+    if info and isinstance(info.get("top_themes"), list):
+        info["top_themes"] = select_top_themes(info["top_themes"])
+
+    return info
 
-        prompt = f"""请从以下盖洛普优势报告文本中提取结构化信息，以 JSON 格式返回。
+
+def select_top_themes(themes: List[Any], limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    整理各块合并后的前5大主题：每个排名、每个主题只保留一条，按排名排序
+
+    每块都会被要求返回前5大主题，没有排名页的块可能猜出主题；合并结果按块的顺序排列，
+    所以同一排名以前面的块为准（排名页通常在报告开头）。排名不在 1-limit 内的丢弃。
+    """
+    by_rank: Dict[int, Dict[str, Any]] = {}
+    names = set()
+    for theme in themes:
+        if not isinstance(theme, dict):
+            continue
+        rank = theme.get("rank")
+        if not isinstance(rank, int) or isinstance(rank, bool) or not 1 <= rank <= limit or rank in by_rank:
+            continue
+        name = theme.get("name") or theme.get("name_en")
+        if name and name in names:
+            continue
+        by_rank[rank] = theme
+        names.add(name)
+    return [by_rank[rank] for rank in sorted(by_rank)]
+
+
+def build_gallup_prompt(text: str) -> str:
+    """盖洛普提取提示词"""
+    return f"""请从以下盖洛普优势报告文本中提取结构化信息，以 JSON 格式返回。
 
 盖洛普报告文本：
 {text}
@@ -82,27 +135,37 @@ def extract_with_claude(text: str) -> Optional[Dict[str, Any]]:
 
 只返回 JSON，不要有其他文字。"""
 
-        message = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}]
-        )
 
-        response_text = message.content[0].text
+def request_claude(text: str) -> Optional[Dict[str, Any]]:
+    """调用 Claude API 提取盖洛普信息（熔断中时直接返回 None；API 调用异常计入熔断统计）"""
+    if not os.environ.get('ANTHROPIC_API_KEY'):
+        return None
+
+    health = get_provider_health()
+    if not health.allow("anthropic"):
+        print("⏭️  Claude API 熔断中，跳过")
+        return None
 
-        # 尝试解析 JSON
-        response_text = response_text.strip()
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
+    try:
+        # 客户端和连接在整个进程中复用（见 llm_clients.py）；流式接收并增量解析，
+        # 每个字段完整时立即显示，输出格式错误时立即中止
+        start = time.monotonic()
 
-        return json.loads(response_text)
+        def show_member(key: str, value: Any):
+            print(f"  📥 {time.monotonic() - start:.1f}s {key}：{describe(value)}")
 
+        result = parse_stream(
+            stream("anthropic", CLAUDE_MODEL, build_gallup_prompt(text), max_tokens=4096),
+            on_member=show_member
+        )
     except Exception as e:
         print(f"⚠️  Claude API 调用失败：{e}")
+        health.record_failure("anthropic")
         return None
 
+    health.record_success("anthropic")
+    return result
+
 
 def extract_with_rules(text: str) -> Dict[str, Any]:
     """
@@ -110,99 +173,47 @@ def extract_with_rules(text: str) -> Dict[str, Any]:
 
     这是基础实现，当 LLM API 不可用时使用
     """
-    info = {
-        "raw_text": text,
-        "extracted_at": datetime.now().isoformat(),
-        "extraction_method": "规则提取",
-        "tested_at": None,
-        "top_themes": [],
-        "domain_scores": {
-            "executing": None,
-            "influencing": None,
-            "relationship_building": None,
-            "strategic_thinking": None
-        }
-    }
+    return extract_with_rules_from_pages([text], full=True)
 
-    # 尝试提取测试日期
-    date_patterns = [
-        r'(\d{4})[年/-](\d{1,2})[月/-](\d{1,2})',
-        r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',
-    ]
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                if '-' in match.group(0):
-                    info["tested_at"] = match.group(0)
-                else:
-                    # 中文格式
-                    info["tested_at"] = f"{match.group(1)}-{match.group(2).zfill(2)}-{match.group(3).zfill(2)}"
-                break
-            except:
-                pass
-
-    # 尝试提取前5大主题
-    # 盖洛普报告格式通常是："1. 主题Name (ThemeName)"
-    theme_pattern = r'(\d+)\.\s*([^\(]+)\s*(?:\(([^\)]+)\))?'
-    themes_found = re.findall(theme_pattern, text)
-
-    # 盖洛普34个主题的中文映射（用于识别）
-    theme_domains = {
-        # 执行领域
-        "成就": "执行", "统筹": "执行", "信仰": "执行", "公平": "执行",
-        "审慎": "执行", "专注": "执行", "纪律": "执行", "责任": "执行",
-        # 影响领域
-        "行动": "影响", "统率": "影响", "沟通": "影响", "竞争": "影响",
-        "完美": "影响", "自信": "影响", "取悦": "影响",
-        # 关系建立领域
-        "适应": "关系建立", "关联": "关系建立", "个别": "关系建立",
-        "搜集": "关系建立", "体谅": "关系建立", "交往": "关系建立",
-        "和谐": "关系建立",
-        # 战略思维领域
-        "分析": "战略思维", "安排": "战略思维", "回顾": "战略思维",
-        "前瞻": "战略思维", "理念": "战略思维", "学习": "战略思维",
-        "战略": "战略思维", "思维": "战略思维"
-    }
 
-    for rank, theme_name, theme_name_en in themes_found[:5]:
-        theme_name = theme_name.strip()
-        domain = theme_domains.get(theme_name, "未知")
-
-        info["top_themes"].append({
-            "rank": int(rank),
-            "name": theme_name,
-            "name_en": theme_name_en.strip() if theme_name_en else "",
-            "domain": domain,
-            "description": ""
-        })
+def extract_with_rules_from_pages(pages: Iterable[str], full: bool = False) -> Dict[str, Any]:
+    """
+    逐页规则提取（pages 为 document_ingest.iter_text 的惰性页流）
 
-    # 尝试提取四大领域得分
-    # 格式可能是："执行: 22" 或 "Executing: 22"
-    score_patterns = [
-        r'执行[：:]\s*(\d+)',
-        r'影响[：:]\s*(\d+)',
-        r'关系建立[：:]\s*(\d+)',
-        r'战略思维[：:]\s*(\d+)',
-    ]
-
-    domain_mapping = {
-        "执行": "executing",
-        "影响": "influencing",
-        "关系建立": "relationship_building",
-        "战略思维": "strategic_thinking"
+    前5大主题、四大领域得分和测试日期通常在长报告的前几页，默认全部找到后就停止读取，
+    后面的页不再提取文本；full=True 时读完整份报告（all_themes 包含所有页中的排名）。
+    提前停止时 raw_text 只有已读取的页，结果中 raw_text_truncated 为 True，pages_read 为已读取的页数。
+    """
+    scanner = ReportScanner()
+    consumed = []
+    truncated = False
+    try:
+        for page in pages:
+            consumed.append(page)
+            scanner.feed(page)
+            if not full and scanner.complete:
+                truncated = True
+                break
+    finally:
+        # 提前结束时关闭页流，释放 PDF 文件
+        close = getattr(pages, "close", None)
+        if close:
+            close()
+    scanner.close()
+
+    all_themes = scanner.themes
+    return {
+        "raw_text": ''.join(consumed),
+        "raw_text_truncated": truncated,
+        "pages_read": len(consumed),
+        "extracted_at": datetime.now().isoformat(),
+        "extraction_method": "规则提取",
+        "tested_at": scanner.tested_at,
+        "top_themes": [dict(theme, description="") for theme in all_themes if theme["rank"] <= 5],
+        "all_themes": all_themes,
+        "domain_scores": scanner.scores,
     }
 
-    for pattern in score_patterns:
-        match = re.search(pattern, text)
-        if match:
-            domain_cn = pattern.split('[')[0].split('（')[0]
-            domain_en = domain_mapping.get(domain_cn)
-            if domain_en:
-                info["domain_scores"][domain_en] = int(match.group(1))
-
-    return info
-
 
 def manual_input_mode() -> Dict[str, Any]:
     """
@@ -318,6 +329,10 @@ def print_summary(info: Dict[str, Any]):
             domain = theme.get("domain", "未知")
             print(f"    {theme.get('rank')}. {theme_name} ({domain})")
 
+    all_themes = info.get("all_themes", [])
+    if len(all_themes) > len(top_themes):
+        print(f"  - 共识别 {len(all_themes)} 个主题的排名")
+
     domain_scores = info.get("domain_scores", {})
     if any(domain_scores.values()):
         print(f"  - 四大领域得分：")
@@ -339,55 +354,74 @@ def main():
         print("\n示例：")
         print("  python gallup_parser.py gallup_report.pdf")
         print("  python gallup_parser.py gallup_report.pdf --output gallup_data.json")
+        print("  python gallup_parser.py gallup_report.pdf --full    # 规则提取时读取完整报告")
         print("\n环境变量（可选，用于增强提取）：")
         print("  ANTHROPIC_API_KEY - Claude API key")
         sys.exit(1)
 
     gallup_file = sys.argv[1]
+    options = sys.argv[2:]
 
     # 解析输出路径
     output_path = None
-    if len(sys.argv) >= 4 and sys.argv[2] == "--output":
-        output_path = sys.argv[3]
+    if "--output" in options and options.index("--output") + 1 < len(options):
+        output_path = options[options.index("--output") + 1]
+
+    # 规则提取默认在信息找齐后停止读取，--full 读完整份报告
+    full = "--full" in options
 
     try:
-        # 1. 解析PDF
+        # 1. 读取报告
         print(f"📄 正在解析：{gallup_file}")
-        text = parse_pdf(gallup_file)
+
+        # 没有 API key 时直接逐页规则提取，不必先读出整份报告
+        info = None
+        if os.environ.get('ANTHROPIC_API_KEY'):
+            text = parse_report(gallup_file)
+        else:
+            info = extract_report_with_rules(gallup_file, full)
+            text = info["raw_text"] if info else ""
 
         if not text:
-            print("❌ PDF解析失败或文件为空")
+            print("❌ 报告解析失败或文件为空")
             use_manual = input("\n是否使用手动输入模式？(y/n): ").strip().lower()
             if use_manual == 'y':
                 info = manual_input_mode()
-                info["extraction_method"] = "手动输入"
+                extraction_method = "手动输入"
+                info["extraction_method"] = extraction_method
             else:
                 sys.exit(1)
         else:
-            print(f"✅ 解析成功，共 {len(text)} 个字符")
-
-            # 2. 尝试使用 LLM API 提取信息
-            print("\n🔍 正在提取盖洛普优势信息...")
+            if info is None:
+                print(f"✅ 解析成功，共 {len(text)} 个字符")
 
-            # 尝试 Claude API
-            info = extract_with_claude(text)
-            extraction_method = "Claude API"
+                # 2. 尝试使用 LLM API 提取信息
+                print("\n🔍 正在提取盖洛普优势信息...")
 
-            # 如果 Claude 失败，使用规则提取
-            if info is None:
-                print("⚠️  Claude API 不可用，使用规则提取")
-                info = extract_with_rules(text)
-                extraction_method = "规则提取"
+                # 尝试 Claude API
+                info = extract_with_claude(text)
+                extraction_method = "Claude API"
 
-                # 检查提取质量
-                if not info.get("top_themes"):
-                    print("⚠️  规则提取未能识别主题")
-                    use_manual = input("\n是否使用手动输入模式？(y/n): ").strip().lower()
-                    if use_manual == 'y':
-                        info = manual_input_mode()
-                        extraction_method = "手动输入"
+                # 如果 Claude 失败，使用规则提取
+                if info is None:
+                    print("⚠️  Claude API 不可用，使用规则提取")
+                    info = extract_with_rules(text)
+                    extraction_method = "规则提取"
+                else:
+                    print(f"✅ 使用 Claude API 提取成功")
             else:
-                print(f"✅ 使用 Claude API 提取成功")
+                extraction_method = "规则提取"
+                print(f"✅ 规则提取完成，读取了 {info['pages_read']} 页、{len(text)} 个字符")
+                if info["raw_text_truncated"]:
+                    print("   信息找齐后不再读取后面的页，raw_text 只包含已读取的页（--full 读取全文）")
+
+            # 检查提取质量
+            if extraction_method == "规则提取" and not info.get("top_themes"):
+                print("⚠️  规则提取未能识别主题")
+                use_manual = input("\n是否使用手动输入模式？(y/n): ").strip().lower()
+                if use_manual == 'y':
+                    info = manual_input_mode()
+                    extraction_method = "手动输入"
 
             info["extraction_method"] = extraction_method
 
@@ -409,6 +443,9 @@ def main():
         elif extraction_method == "手动输入":
             print("   建议：下次可以尝试设置 ANTHROPIC_API_KEY 进行自动提取")
 
+    except MissingDependencyError as e:
+        print(f"❌ 错误：{e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ 错误：{e}")
         import traceback
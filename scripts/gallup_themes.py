@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+盖洛普 34 个优势主题 - 中英文名称、别名、所属领域，以及报告的逐段扫描
+
+规则提取（gallup_parser.extract_with_rules）用这张表识别报告里的主题排名和领域得分。
+所有名称和别名（简体、繁体、英文，以及四大领域名称）编译成一个关键词自动机，
+对报告文本只扫描一遍就能找到全部带排名的主题（“1. 战略 (Strategic)”、“#1 Achiever”、
+“第1名：交往”），中文报告、英文报告和完整 34 项排名报告都适用。
+
+使用方法：
+    from gallup_themes import THEMES, ReportScanner, find_ranked_themes, find_domain_scores
+
+    themes = find_ranked_themes(text)    # [{"rank", "name", "name_en", "domain"}]，按排名排序
+    scores = find_domain_scores(text)    # {"executing": 22, ...}
+
+    scanner = ReportScanner()            # 逐页扫描，信息找齐后可以不再读取后面的页
+    for page in pages:
+        scanner.feed(page)
+        if scanner.complete:
+            break
+    scanner.close()
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from keyword_automaton import KeywordAutomaton
+
+
+# 四大领域：键 → (中文名称, 英文名称, 别名)
+DOMAINS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "executing": ("执行", "Executing", ("执行力", "執行", "執行力")),
+    "influencing": ("影响", "Influencing", ("影响力", "影響", "影響力")),
+    "relationship_building": ("关系建立", "Relationship Building", ("關係建立",)),
+    "strategic_thinking": ("战略思维", "Strategic Thinking", ("戰略思維",)),
+}
+
+# 34 个主题：(中文名称, 英文名称, 别名, 所属领域键)
+THEMES: List[Tuple[str, str, Tuple[str, ...], str]] = [
+    # 执行（9）
+    ("成就", "Achiever", (), "executing"),
+    ("统筹", "Arranger", ("統籌", "安排"), "executing"),
+    ("信仰", "Belief", (), "executing"),
+    ("公平", "Consistency", (), "executing"),
+    ("审慎", "Deliberative", ("審慎",), "executing"),
+    ("纪律", "Discipline", ("紀律",), "executing"),
+    ("专注", "Focus", ("專注",), "executing"),
+    ("责任", "Responsibility", ("責任",), "executing"),
+    ("排难", "Restorative", ("排難", "修复"), "executing"),
+    # 影响（8）
+    ("行动", "Activator", ("行動",), "influencing"),
+    ("统率", "Command", ("統率",), "influencing"),
+    ("沟通", "Communication", ("溝通",), "influencing"),
+    ("竞争", "Competition", ("競爭",), "influencing"),
+    ("完美", "Maximizer", ("Maximiser",), "influencing"),
+    ("自信", "Self-Assurance", ("Self Assurance", "SelfAssurance"), "influencing"),
+    ("追求", "Significance", (), "influencing"),
+    ("取悦", "Woo", ("取悅",), "influencing"),
+    # 关系建立（9）
+    ("适应", "Adaptability", ("適應",), "relationship_building"),
+    ("关联", "Connectedness", ("關聯",), "relationship_building"),
+    ("伯乐", "Developer", ("伯樂",), "relationship_building"),
+    ("体谅", "Empathy", ("體諒",), "relationship_building"),
+    ("和谐", "Harmony", ("和諧",), "relationship_building"),
+    ("包容", "Includer", ("Inclusiveness",), "relationship_building"),
+    ("个别", "Individualization", ("個別", "Individualisation"), "relationship_building"),
+    ("积极", "Positivity", ("積極",), "relationship_building"),
+    ("交往", "Relator", (), "relationship_building"),
+    # 战略思维（8）
+    ("分析", "Analytical", (), "strategic_thinking"),
+    ("回顾", "Context", ("回顧",), "strategic_thinking"),
+    ("前瞻", "Futuristic", (), "strategic_thinking"),
+    ("理念", "Ideation", (), "strategic_thinking"),
+    ("搜集", "Input", ("蒐集", "收集"), "strategic_thinking"),
+    ("思维", "Intellection", ("思維",), "strategic_thinking"),
+    ("学习", "Learner", ("學習",), "strategic_thinking"),
+    ("战略", "Strategic", ("戰略",), "strategic_thinking"),
+]
+
+# 主题名称之前的排名：“1.”、“1、”、“1)”、“#1”、“第1名：”、“- 1 ”，必须从行首（或列表符号）开始，
+# 排名和主题名称之间不能有其他内容（“In 2019, 12 Individualization experts” 不是排名）
+RANK_PATTERN = re.compile(r'\s*(?:[-*•]\s*)?(?:#|第)?(\d{1,2})\s*(?:名\s*)?[.、:：)）]?\s*$')
+
+# 中文主题名称之后允许的字符（另外允许行尾和紧跟英文名称）：
+# 中文名称多是常用词，“1. 学习能力强，善于分析问题”中的“学习”不是主题
+THEME_END_CHARS = frozenset(" \t\r\n\u3000([（【〔")
+
+# 领域名称之后的得分：“执行: 22”、“Executing：22”、“关系建立领域得分：28”
+SCORE_PATTERN = re.compile(r'\s*(?:领域|領域|domain)?\s*(?:得分|score)?\s*[：:]\s*(\d+)', re.IGNORECASE)
+
+# 测试日期（按顺序尝试）
+DATE_PATTERNS = [
+    re.compile(r'(\d{4})[年/-](\d{1,2})[月/-](\d{1,2})'),
+    re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})'),
+]
+
+def build_automaton() -> KeywordAutomaton:
+    """所有主题名称、别名和领域名称 → ("theme", 主题) 或 ("domain", 领域键)"""
+    automaton = KeywordAutomaton()
+    for theme in THEMES:
+        for name in (theme[0], theme[1]) + theme[2]:
+            automaton.add(name, ("theme", theme))
+    for key, (name, name_en, aliases) in DOMAINS.items():
+        for name in (name, name_en) + aliases:
+            automaton.add(name, ("domain", key))
+    return automaton.build()
+
+
+THEME_AUTOMATON = build_automaton()
+
+
+def is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+def theme_name_ends(text: str, end: int, theme: Tuple[str, str, Tuple[str, ...], str]) -> bool:
+    """中文主题名称之后是空白、括号、行尾或该主题的英文名称"""
+    if end == len(text) or text[end] in THEME_END_CHARS:
+        return True
+    name_en = theme[1]
+    return text[end:end + len(name_en)].lower() == name_en.lower()
+
+
+def find_names(text: str) -> List[Tuple[int, int, str, Any]]:
+    """
+    文本中的主题 / 领域名称 [(起始位置, 结束位置, 类型, 数据)]，按位置排序、互不重叠
+
+    重叠时取最靠前、最长的名称（“战略思维”是领域，不是“战略”+“思维”两个主题）；
+    英文名称要求前后不是字母或数字（避免 “Input” 命中 “Inputs”），
+    中文主题名称要求后面是空白、括号、行尾或英文名称（避免命中“学习能力强”）。
+    """
+    matches = []
+    for start, keyword, (kind, data) in THEME_AUTOMATON.iter_matches(text):
+        end = start + len(keyword)
+        if keyword.isascii():
+            if (start > 0 and is_word_char(text[start - 1])) or (end < len(text) and is_word_char(text[end])):
+                continue
+        elif kind == "theme" and not theme_name_ends(text, end, data):
+            continue
+        matches.append((start, end, kind, data))
+
+    matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+    names = []
+    last_end = 0
+    for match in matches:
+        if match[0] >= last_end:
+            names.append(match)
+            last_end = match[1]
+    return names
+
+
+def rank_before(text: str, start: int) -> Optional[int]:
+    """名称所在行（或列表项）开头的排名（1-34），名称前还有其他内容或没有排名时返回 None"""
+    line_start = text.rfind("\n", 0, start) + 1
+    match = RANK_PATTERN.match(text, line_start, start)
+    if not match:
+        return None
+    rank = int(match.group(1))
+    return rank if 1 <= rank <= 34 else None
+
+
+def theme_entry(rank: int, theme: Tuple[str, str, Tuple[str, ...], str]) -> Dict[str, Any]:
+    name, name_en, _, domain_key = theme
+    return {
+        "rank": rank,
+        "name": name,
+        "name_en": name_en,
+        "domain": DOMAINS[domain_key][0],
+    }
+
+
+def find_test_date(text: str) -> Optional[str]:
+    """测试日期（“2023年5月8日”、“2023-05-08”、“05/08/2023”），没有时返回 None"""
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            if '-' in match.group(0):
+                return match.group(0)
+            # 中文格式
+            return f"{match.group(1)}-{match.group(2).zfill(2)}-{match.group(3).zfill(2)}"
+    return None
+
+
+class ReportScanner:
+    """
+    逐段扫描报告文本（PDF 逐页），累计主题排名、领域得分和测试日期
+
+    排名、得分都写在同一行内，所以只扫描完整的行，行尾未结束的部分留到下一段；
+    各段拼接后的结果与一次扫描全文相同。complete 为 True 时调用方可以停止读取后面的页。
+    """
+
+    def __init__(self, top: int = 5):
+        self.top = top
+        self.ranked: Dict[int, Dict[str, Any]] = {}
+        self.seen = set()
+        self.scores: Dict[str, Optional[int]] = {key: None for key in DOMAINS}
+        self.tested_at: Optional[str] = None
+        self.pending = ""
+
+    def feed(self, piece: str):
+        text = self.pending + piece
+        cut = text.rfind("\n") + 1
+        self.pending = text[cut:]
+        if cut:
+            self.scan(text[:cut])
+
+    def close(self):
+        """输入结束，扫描最后一行"""
+        if self.pending:
+            self.scan(self.pending)
+            self.pending = ""
+
+    def scan(self, text: str):
+        if self.tested_at is None:
+            self.tested_at = find_test_date(text)
+
+        for start, end, kind, data in find_names(text):
+            if kind == "domain":
+                if self.scores[data] is None:
+                    match = SCORE_PATTERN.match(text, end)
+                    if match:
+                        self.scores[data] = int(match.group(1))
+                continue
+
+            if data[1] in self.seen:
+                continue
+            rank = rank_before(text, start)
+            if rank is None or rank in self.ranked:
+                continue
+            self.ranked[rank] = theme_entry(rank, data)
+            self.seen.add(data[1])
+
+    @property
+    def themes(self) -> List[Dict[str, Any]]:
+        """带排名的主题（按排名排序）"""
+        return [self.ranked[rank] for rank in sorted(self.ranked)]
+
+    @property
+    def complete(self) -> bool:
+        """前 top 名主题、四大领域得分和测试日期都已找到"""
+        return (
+            self.tested_at is not None
+            and all(rank in self.ranked for rank in range(1, self.top + 1))
+            and all(score is not None for score in self.scores.values())
+        )
+
+
+def scan_report(text: str) -> Tuple[List[Dict[str, Any]], Dict[str, Optional[int]]]:
+    """
+    扫描一遍文本，返回 (带排名的主题列表, 领域得分)
+
+    同一排名或同一主题出现多次时以第一次为准（报告开头的排名列表通常最完整）。
+    """
+    scanner = ReportScanner()
+    scanner.feed(text)
+    scanner.close()
+    return scanner.themes, scanner.scores
+
+
+def find_ranked_themes(text: str) -> List[Dict[str, Any]]:
+    """文本中所有带排名的主题（按排名排序）"""
+    return scan_report(text)[0]
+
+
+def find_domain_scores(text: str) -> Dict[str, Optional[int]]:
+    """四大领域得分（未找到的为 None）"""
+    return scan_report(text)[1]
+
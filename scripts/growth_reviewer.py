@@ -6,6 +6,8 @@
 - 从画像中动态提取个性化指标（不是硬编码）
 - 计算通用指标（适用于所有人）
 - 生成周报/月报
+- 多用户批量并行生成
+- 监听模式：决策或画像变化时增量更新报告
 - 趋势分析
 
 使用方法：
@@ -15,40 +17,53 @@
     # 生成月报
     python growth_reviewer.py monthly --month 2 --persona ../interviews/my-persona.md
 
+    # 批量生成多个用户的周报和月报（清单格式见 load_batch_manifest）
+    python growth_reviewer.py batch --manifest team.json --week 1 --month 2
+
     # 查看指标趋势
     python growth_reviewer.py trends --days 90
 
+    # 监听决策和画像变化，自动更新受影响的周报/月报
+    python growth_reviewer.py watch --persona ../interviews/my-persona.md
+
+    # 使用租户分片目录
+    python growth_reviewer.py --tenant alice weekly --week 1 --persona ../interviews/my-persona.md
+
     # 提取画像中的元数据
     python growth_reviewer.py extract-metadata --persona ../interviews/my-persona.md
 """
 
 import sys
 import json
-import re
+import time
+import queue
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict, Counter
 
+import tenant_storage
+from persona_markdown import empty_persona_metadata
+from persona_store import load_persona
+from decision_tracker import positive_int
 
-def get_decision_dir() -> Path:
-    """获取决策记录目录"""
-    script_dir = Path(__file__).parent.parent
-    decision_dir = script_dir / "data" / "decisions"
-    return decision_dir
 
+def get_decision_dir(tenant: Optional[str] = None) -> Path:
+    """获取决策记录目录（指定租户时返回该租户的分片目录）"""
+    return tenant_storage.get_decision_dir(tenant, create=False)
 
-def get_review_dir() -> Path:
-    """获取成长回顾目录"""
-    script_dir = Path(__file__).parent.parent
-    review_dir = script_dir / "data" / "reviews"
-    review_dir.mkdir(parents=True, exist_ok=True)
-    return review_dir
 
+def get_review_dir(tenant: Optional[str] = None) -> Path:
+    """获取成长回顾目录（指定租户时返回该租户的分片目录）"""
+    return tenant_storage.get_review_dir(tenant)
 
-def load_all_decisions(days: Optional[int] = None) -> List[Dict[str, Any]]:
-    """加载所有决策记录"""
-    decision_dir = get_decision_dir()
+
+def load_all_decisions(
+    days: Optional[int] = None,
+    decision_dir: Optional[Path] = None
+) -> List[Dict[str, Any]]:
+    """加载所有决策记录（decision_dir 为空时使用默认目录）"""
+    decision_dir = Path(decision_dir) if decision_dir else get_decision_dir()
     decisions = []
 
     cutoff_date = None
@@ -73,7 +88,7 @@ def load_all_decisions(days: Optional[int] = None) -> List[Dict[str, Any]]:
 
 def extract_persona_metadata(persona_path: str) -> Dict[str, Any]:
     """
-    从画像文件中提取元数据
+    从画像文件中提取元数据（通过画像存储加载，画像未变化时不重新解析）
 
     提取内容：
     1. 行为模式（behavioral_patterns）
@@ -82,56 +97,10 @@ def extract_persona_metadata(persona_path: str) -> Dict[str, Any]:
     4. 决策关键词（decision_keywords）
     5. 触发词（triggers）
     """
-    metadata = {
-        "behavioral_patterns": [],
-        "blind_spots": [],
-        "weaknesses": [],
-        "decision_keywords": [],
-        "triggers": [],
-        "improvement_areas": []
-    }
+    metadata = empty_persona_metadata()
 
     try:
-        with open(persona_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # 提取行为模式
-        pattern_section = re.search(r'### 行为模式\n+(.*?)(?=\n###|\n##|$)', content, re.DOTALL)
-        if pattern_section:
-            patterns = re.findall(r'\*\*([\d\.\s]+.*?)\*\*\s*\n', pattern_section.group(1))
-            metadata["behavioral_patterns"] = [p.strip() for p in patterns]
-
-        # 提取盲区
-        blind_section = re.search(r'### 盲区\n+(.*?)(?=\n---|\n##|$)', content, re.DOTALL)
-        if blind_section:
-            blinds = re.findall(r'\\d+\\.\\s+\\*\\*(.+?)\\*\\*', blind_section.group(1))
-            metadata["blind_spots"] = [b.strip() for b in blinds]
-
-        # 提取核心劣势
-        weakness_section = re.search(r'## 我的核心劣势\n+(.*?)(?=\n---|\n##|$)', content, re.DOTALL)
-        if weakness_section:
-            weaknesses = re.findall(r'\*\*([\d\.\s]+.+?)\*\*\s+�?', weakness_section.group(1))
-            metadata["weaknesses"] = [w.strip() for w in weaknesses]
-
-        # 提取决策关键词（从"当我说"或"当我说X时"中提取）
-        triggers = re.findall(r'当(?:我)?说"?([^\"]+)"?', content)
-        metadata["triggers"] = list(set(triggers))  # 去重
-
-        # 提取高风险关键词
-        high_risk_keywords = re.findall(r'提到.*?关键词.*?[:：]\s*([^\n]+)', content)
-        if high_risk_keywords:
-            keywords = re.findall(r'["\uff1c]([\u4e00-\u9fa5A-Za-z]+)["\uff1c]', high_risk_keywords[0])
-            metadata["decision_keywords"] = keywords
-
-        # 提取改进领域（从"待改进"、"需要改进"等部分）
-        improvement_patterns = [
-            r'\*\*待改进\*\*[:：]\s*([^\n]+)',
-            r'需要改进[:：]\s*([^\n]+)',
-            r'改进建议[:：]\s*([^\n]+)'
-        ]
-        for pattern in improvement_patterns:
-            matches = re.findall(pattern, content)
-            metadata["improvement_areas"].extend([m.strip() for m in matches])
+        metadata = dict(load_persona(persona_path, save=False)["metadata"])
 
         print(f"✅ 成功从画像中提取元数据：")
         print(f"  - 行为模式: {len(metadata['behavioral_patterns'])} 个")
@@ -256,9 +225,17 @@ def generate_weekly_report(
     week_num: int,
     persona_path: str,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    decision_dir: Optional[Path] = None,
+    decisions: Optional[List[Dict[str, Any]]] = None,
+    persona_metadata: Optional[Dict[str, Any]] = None
 ) -> str:
-    """生成周报"""
+    """
+    生成周报
+
+    decisions / persona_metadata 可由调用方预先加载（如 watch 模式的内存缓存），
+    为空时从磁盘读取
+    """
     print(f"\n📊 正在生成第 {week_num} 周成长报告...")
 
     # 计算本周日期范围
@@ -270,25 +247,80 @@ def generate_weekly_report(
         end_date = start_date + timedelta(days=6)
 
     # 加载本周决策
-    days_diff = (end_date - start_date).days + 1
-    decisions = load_all_decisions(days=days_diff)
+    if decisions is None:
+        days_diff = (end_date - start_date).days + 1
+        decisions = load_all_decisions(days=days_diff, decision_dir=decision_dir)
     week_decisions = [
         d for d in decisions
         if start_date <= datetime.fromisoformat(d["timestamp"]) <= end_date
     ]
 
     # 提取画像元数据
-    persona_metadata = extract_persona_metadata(persona_path)
+    if persona_metadata is None:
+        persona_metadata = extract_persona_metadata(persona_path)
+
+    title = f"成长周报（第{week_num}周：{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}）"
+    return render_report(title, "周", week_decisions, persona_metadata)
+
+
+def generate_monthly_report(
+    month_num: int,
+    persona_path: str,
+    year: Optional[int] = None,
+    decision_dir: Optional[Path] = None,
+    decisions: Optional[List[Dict[str, Any]]] = None,
+    persona_metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    """生成月报（month_num 为自然月，year 默认为今年）"""
+    print(f"\n📊 正在生成第 {month_num} 月成长报告...")
+
+    if not 1 <= month_num <= 12:
+        raise ValueError(f"无效的月份：{month_num}")
+
+    year = year or datetime.now().year
+    start_date = datetime(year, month_num, 1)
+    if month_num == 12:
+        next_month = datetime(year + 1, 1, 1)
+    else:
+        next_month = datetime(year, month_num + 1, 1)
+    end_date = next_month - timedelta(microseconds=1)
+
+    # 加载本月决策（月份可能不在最近N天内，因此按时间范围过滤全部决策）
+    if decisions is None:
+        decisions = load_all_decisions(decision_dir=decision_dir)
+    month_decisions = [
+        d for d in decisions
+        if start_date <= datetime.fromisoformat(d["timestamp"]) <= end_date
+    ]
+
+    # 提取画像元数据
+    if persona_metadata is None:
+        persona_metadata = extract_persona_metadata(persona_path)
 
+    title = f"成长月报（{year}年{month_num}月：{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}）"
+    return render_report(title, "月", month_decisions, persona_metadata)
+
+
+def render_report(
+    title: str,
+    unit: str,
+    period_decisions: List[Dict[str, Any]],
+    persona_metadata: Dict[str, Any]
+) -> str:
+    """
+    渲染成长报告（周报/月报共用）
+
+    unit 为周期单位（"周" 或 "月"），用于生成"本周/下周"等文案
+    """
     # 计算指标
-    generic_metrics = calculate_generic_metrics(week_decisions)
-    personalized_metrics = calculate_personalized_metrics(week_decisions, persona_metadata)
+    generic_metrics = calculate_generic_metrics(period_decisions)
+    personalized_metrics = calculate_personalized_metrics(period_decisions, persona_metadata)
 
     # 生成报告
     report_lines = [
-        f"# 成长周报（第{week_num}周：{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}）\n",
+        f"# {title}\n",
         "## 📊 决策追踪\n",
-        f"- **本周记录决策**：{len(week_decisions)} 个"
+        f"- **本{unit}记录决策**：{len(period_decisions)} 个"
     ]
 
     if generic_metrics:
@@ -300,12 +332,12 @@ def generate_weekly_report(
         ])
 
     # 具体决策列表
-    if week_decisions:
+    if period_decisions:
         report_lines.extend([
-            "### 本周决策详情\n"
+            f"### 本{unit}决策详情\n"
         ])
 
-        for i, decision in enumerate(week_decisions, 1):
+        for i, decision in enumerate(period_decisions, 1):
             timestamp = datetime.fromisoformat(decision["timestamp"]).strftime("%Y-%m-%d %H:%M")
             dtype = decision.get("type", "unknown")
             risk_level = decision.get("risk_level", "unknown")
@@ -361,12 +393,12 @@ def generate_weekly_report(
         report_lines.append("")
 
     if not personalized_metrics.get("trigger_matches") and not personalized_metrics.get("blind_spot_violations"):
-        report_lines.append("✅ 本周无明显行为模式重复\n")
+        report_lines.append(f"✅ 本{unit}无明显行为模式重复\n")
 
     # 指标追踪
     report_lines.extend([
         "## 📈 指标追踪\n",
-        "| 指标 | 本周 | 说明 |",
+        f"| 指标 | 本{unit} | 说明 |",
         "|------|------|------|"
     ])
 
@@ -378,7 +410,7 @@ def generate_weekly_report(
         emotion_hijack_rate = (high_emotion / total * 100) if total > 0 else 0
 
         report_lines.extend([
-            f"| 决策总数 | {total} | 本周记录的决策数量 |",
+            f"| 决策总数 | {total} | 本{unit}记录的决策数量 |",
             f"| 高情感决策 | {high_emotion} ({emotion_hijack_rate:.0f}%) | 情感占比>50%的决策 |",
             f"| 平均情感占比 | {avg_emotion*100:.0f}% | 所有决策的平均情感因素 |"
         ])
@@ -401,9 +433,9 @@ def generate_weekly_report(
             report_lines.append(f"{i}. {blind}")
         report_lines.append("")
 
-    # 下周建议
+    # 下一周期建议
     report_lines.extend([
-        "## 💡 下周建议\n"
+        f"## 💡 下{unit}建议\n"
     ])
 
     suggestions = []
@@ -432,9 +464,18 @@ def generate_weekly_report(
     return "\n".join(report_lines)
 
 
-def save_report(report: str, report_type: str, identifier: int) -> Path:
-    """保存报告到文件"""
-    review_dir = get_review_dir()
+def save_report(
+    report: str,
+    report_type: str,
+    identifier: Any,
+    review_dir: Optional[Path] = None
+) -> Path:
+    """保存报告到文件（review_dir 为空时使用默认目录）"""
+    if review_dir:
+        review_dir = Path(review_dir)
+        review_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        review_dir = get_review_dir()
 
     timestamp = datetime.now().strftime("%Y%m%d")
     filename = f"{report_type}_{identifier}_{timestamp}.md"
@@ -446,10 +487,384 @@ def save_report(report: str, report_type: str, identifier: int) -> Path:
     return file_path
 
 
+class GrowthWatcher:
+    """
+    监听决策目录和画像文件，增量更新成长报告
+
+    - 优先使用 watchdog（Linux 下基于 inotify），未安装时回退到轮询
+    - 决策记录缓存在内存中，只重新加载发生变化的文件
+    - 只重新生成受影响的周报/月报（决策所在的周和月，包括变更前的周和月）
+    - 画像变化时重新提取元数据，并更新本周和本月报告
+    - 短时间内的连续写入会合并处理（防抖）
+    """
+
+    def __init__(
+        self,
+        persona_path: str,
+        decision_dir: Optional[Path] = None,
+        review_dir: Optional[Path] = None,
+        debounce: float = 2.0,
+        interval: float = 5.0,
+        use_polling: bool = False
+    ):
+        self.persona_path = Path(persona_path).resolve()
+        self.decision_dir = Path(decision_dir or get_decision_dir()).resolve()
+        self.review_dir = review_dir
+        self.debounce = debounce
+        self.interval = interval
+        self.use_polling = use_polling
+
+        self.decisions = {}  # 文件路径 -> 决策记录
+        self.persona_metadata = {}
+        self.snapshot = {}  # 文件路径 -> (mtime_ns, size)，轮询模式使用
+
+    def is_watched(self, path: Path) -> bool:
+        """判断路径是否为需要关注的文件"""
+        if path == self.persona_path:
+            return True
+        return path.parent == self.decision_dir and path.suffix == ".json"
+
+    def take_snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        """记录所有被监听文件的修改时间和大小"""
+        snapshot = {}
+        paths = list(self.decision_dir.glob("*.json")) + [self.persona_path]
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path.resolve()] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll_changes(self) -> set:
+        """轮询模式：对比快照，返回发生变化（新增/修改/删除）的文件"""
+        snapshot = self.take_snapshot()
+        changed = {
+            path for path in set(snapshot) | set(self.snapshot)
+            if snapshot.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = snapshot
+        return changed
+
+    @staticmethod
+    def week_start(timestamp: datetime) -> datetime:
+        """决策所在周的周一零点"""
+        day = datetime(timestamp.year, timestamp.month, timestamp.day)
+        return day - timedelta(days=day.weekday())
+
+    def periods_of(self, decision: Optional[Dict[str, Any]]) -> Tuple[set, set]:
+        """返回决策所在的周（周一日期）和月（年, 月）"""
+        if not decision:
+            return set(), set()
+        try:
+            timestamp = datetime.fromisoformat(decision["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return set(), set()
+        return {self.week_start(timestamp)}, {(timestamp.year, timestamp.month)}
+
+    def current_periods(self) -> Tuple[set, set]:
+        """本周和本月"""
+        now = datetime.now()
+        return {self.week_start(now)}, {(now.year, now.month)}
+
+    def load_initial(self):
+        """启动时全量加载一次决策和画像元数据"""
+        for path in self.decision_dir.glob("*.json"):
+            self.reload_decision(path.resolve())
+        self.persona_metadata = extract_persona_metadata(str(self.persona_path))
+        self.snapshot = self.take_snapshot()
+
+    def reload_decision(self, path: Path) -> Optional[Dict[str, Any]]:
+        """重新加载单个决策文件（文件已删除时从缓存移除）"""
+        self.decisions.pop(path, None)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                decision = json.load(f)
+            datetime.fromisoformat(decision["timestamp"])
+        except Exception as e:
+            print(f"⚠️  警告：无法加载 {path.name}: {e}")
+            return None
+        self.decisions[path] = decision
+        return decision
+
+    def apply_changes(self, paths: set):
+        """处理一批文件变化，只重新生成受影响的报告"""
+        weeks, months = set(), set()
+
+        for path in paths:
+            if path == self.persona_path:
+                print(f"🔄 画像已更新：{path.name}")
+                self.persona_metadata = extract_persona_metadata(str(self.persona_path))
+                current_weeks, current_months = self.current_periods()
+                weeks |= current_weeks
+                months |= current_months
+                continue
+
+            old_weeks, old_months = self.periods_of(self.decisions.get(path))
+            new_weeks, new_months = self.periods_of(self.reload_decision(path))
+            weeks |= old_weeks | new_weeks
+            months |= old_months | new_months
+
+        self.regenerate(weeks, months)
+
+    def regenerate(self, weeks: set, months: set):
+        """重新生成指定的周报和月报"""
+        decisions = sorted(self.decisions.values(), key=lambda x: x["timestamp"], reverse=True)
+        this_week = self.week_start(datetime.now())
+        this_year = datetime.now().year
+
+        for start_date in sorted(weeks):
+            week_num = (this_week - start_date).days // 7 + 1
+            if week_num < 1:
+                continue  # 未来日期的决策不生成报告
+            report = generate_weekly_report(
+                week_num=week_num,
+                persona_path=str(self.persona_path),
+                start_date=start_date,
+                end_date=start_date + timedelta(weeks=1) - timedelta(microseconds=1),
+                decisions=decisions,
+                persona_metadata=self.persona_metadata
+            )
+            file_path = save_report(report, "weekly", week_num, self.review_dir)
+            print(f"✅ 周报已更新：{file_path}")
+
+        for year, month in sorted(months):
+            report = generate_monthly_report(
+                month_num=month,
+                persona_path=str(self.persona_path),
+                year=year,
+                decisions=decisions,
+                persona_metadata=self.persona_metadata
+            )
+            identifier = month if year == this_year else f"{year}-{month:02d}"
+            file_path = save_report(report, "monthly", identifier, self.review_dir)
+            print(f"✅ 月报已更新：{file_path}")
+
+    def start_observer(self, events: queue.Queue):
+        """启动 watchdog 监听（未安装时返回 None，使用轮询）"""
+        if self.use_polling:
+            return None
+
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print("⚠️  未安装 watchdog，使用轮询模式（pip install watchdog 可启用 inotify）")
+            return None
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # 只关心写入类事件（读取文件产生的 opened/closed 事件会导致循环触发）
+                if event.is_directory or event.event_type not in ("created", "modified", "deleted", "moved"):
+                    return
+                for attr in ("src_path", "dest_path"):
+                    path = getattr(event, attr, None)
+                    if path:
+                        events.put(Path(path).resolve())
+
+        observer = Observer()
+        handler = Handler()
+        self.decision_dir.mkdir(parents=True, exist_ok=True)
+        observer.schedule(handler, str(self.decision_dir), recursive=False)
+        if self.persona_path.parent != self.decision_dir:
+            observer.schedule(handler, str(self.persona_path.parent), recursive=False)
+        observer.start()
+        return observer
+
+    def wait_for_changes(self, events: queue.Queue, observer) -> set:
+        """等待一批变化，静默 debounce 秒后才返回"""
+        if observer is None:
+            changed = set()
+            while not changed:
+                time.sleep(self.interval)
+                changed = self.poll_changes()
+            while True:
+                time.sleep(self.debounce)
+                more = self.poll_changes()
+                if not more:
+                    return changed
+                changed |= more
+
+        changed = set()
+        path = events.get()
+        while True:
+            if self.is_watched(path):
+                changed.add(path)
+            try:
+                path = events.get(timeout=self.debounce)
+            except queue.Empty:
+                if changed:
+                    return changed
+                path = events.get()
+
+    def run(self):
+        """启动监听循环（Ctrl+C 退出）"""
+        print(f"\n👀 正在监听：{self.decision_dir}")
+        print(f"   画像文件：{self.persona_path}")
+
+        self.load_initial()
+        self.regenerate(*self.current_periods())
+
+        events = queue.Queue()
+        observer = self.start_observer(events)
+        print(f"   监听方式：{'watchdog' if observer else f'轮询（每{self.interval:g}秒）'}，防抖 {self.debounce:g} 秒")
+
+        try:
+            while True:
+                changed = self.wait_for_changes(events, observer)
+                self.apply_changes(changed)
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+
+
+def load_batch_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    加载批量清单
+
+    清单为JSON文件，格式：
+        {"users": [
+            {"name": "alice", "persona": "alice/my-persona.md",
+             "decisions": "alice/decisions", "reviews": "alice/reviews"}
+        ]}
+    也可以直接是用户列表。相对路径以清单文件所在目录为基准；
+    reviews 缺省时使用 decisions 同级 reviews 目录下以用户名命名的子目录（reviews/<name>）。
+    也可以用 "tenant" 代替 decisions/reviews，使用该租户的分片目录。
+    两个用户的报告目录相同时报错（周报、月报文件名相同，并行生成时会互相覆盖）。
+    """
+    manifest_file = Path(manifest_path)
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    users = manifest.get("users", []) if isinstance(manifest, dict) else manifest
+    if not isinstance(users, list):
+        raise ValueError("清单格式错误：users 应为用户列表")
+    base_dir = manifest_file.resolve().parent
+
+    jobs = []
+    review_owners: Dict[Path, str] = {}
+    for i, user in enumerate(users, 1):
+        if not isinstance(user, dict):
+            raise ValueError(f"清单第{i}项格式错误：应为对象（包含 persona、decisions 等字段），实际为 {type(user).__name__}")
+        if not user.get("persona"):
+            raise ValueError(f"清单第{i}项缺少字段：persona")
+
+        name = user.get("name") or user.get("tenant") or Path(user["persona"]).stem
+        if user.get("tenant"):
+            decision_dir = get_decision_dir(user["tenant"])
+            review_dir = tenant_storage.get_review_dir(user["tenant"], create=False)
+        elif user.get("decisions"):
+            decision_dir = base_dir / user["decisions"]
+            review_dir = base_dir / user["reviews"] if user.get("reviews") else decision_dir.parent / "reviews" / name
+        else:
+            raise ValueError(f"清单第{i}项缺少字段：decisions 或 tenant")
+
+        resolved = review_dir.resolve()
+        if resolved in review_owners:
+            raise ValueError(
+                f"清单第{i}项（{name}）与 {review_owners[resolved]} 的报告目录相同：{review_dir}"
+                "（请设置不同的 name 或 reviews）"
+            )
+        review_owners[resolved] = name
+
+        jobs.append({
+            "name": name,
+            "persona": str(base_dir / user["persona"]),
+            "decisions": str(decision_dir),
+            "reviews": str(review_dir)
+        })
+
+    return jobs
+
+
+def run_batch_job(job: Dict[str, Any], week_num: int, month_num: int) -> Dict[str, Any]:
+    """
+    为单个用户生成周报和月报（在子进程中执行）
+
+    任何异常都被捕获并返回，保证单个用户失败不影响其他用户
+    """
+    import io
+    from contextlib import redirect_stdout
+
+    result = {"name": job["name"], "success": False, "files": [], "error": None}
+
+    try:
+        # 子进程的进度输出会互相穿插，这里统一屏蔽，由主进程汇总
+        with redirect_stdout(io.StringIO()):
+            if not Path(job["persona"]).exists():
+                raise FileNotFoundError(f"画像文件不存在：{job['persona']}")
+
+            weekly = generate_weekly_report(
+                week_num=week_num,
+                persona_path=job["persona"],
+                decision_dir=Path(job["decisions"])
+            )
+            result["files"].append(str(save_report(weekly, "weekly", week_num, Path(job["reviews"]))))
+
+            monthly = generate_monthly_report(
+                month_num=month_num,
+                persona_path=job["persona"],
+                decision_dir=Path(job["decisions"])
+            )
+            result["files"].append(str(save_report(monthly, "monthly", month_num, Path(job["reviews"]))))
+
+        result["success"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def run_batch(
+    manifest_path: str,
+    week_num: int,
+    month_num: int,
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """使用进程池并行生成清单中所有用户的周报和月报"""
+    import os
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    jobs = load_batch_manifest(manifest_path)
+    if not jobs:
+        print("⚠️  清单中没有用户")
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    print(f"\n📊 批量生成成长报告：{len(jobs)} 个用户，{workers} 个进程")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_batch_job, job, week_num, month_num): job
+            for job in jobs
+        }
+
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 子进程异常退出（如被系统杀死）
+                result = {"name": job["name"], "success": False, "files": [], "error": str(e)}
+
+            results.append(result)
+            if result["success"]:
+                print(f"  [{done}/{len(jobs)}] ✅ {result['name']}")
+            else:
+                print(f"  [{done}/{len(jobs)}] ❌ {result['name']}：{result['error']}")
+
+    return results
+
+
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="成长回顾系统")
+    parser.add_argument("--tenant", help="租户ID（按用户分片存储，默认使用全局目录）")
     subparsers = parser.add_subparsers(dest="command", help="可用命令")
 
     # weekly命令
@@ -462,6 +877,20 @@ def main():
     monthly_parser.add_argument("--month", type=int, required=True, help="月数")
     monthly_parser.add_argument("--persona", required=True, help="画像文件路径")
 
+    # batch命令
+    batch_parser = subparsers.add_parser("batch", help="批量生成多个用户的周报和月报")
+    batch_parser.add_argument("--manifest", required=True, help="清单文件路径（JSON）")
+    batch_parser.add_argument("--week", type=int, default=1, help="周数（默认1，即本周）")
+    batch_parser.add_argument("--month", type=int, default=datetime.now().month, help="月份（默认本月）")
+    batch_parser.add_argument("--workers", type=positive_int, help="进程数（默认CPU核数）")
+
+    # watch命令
+    watch_parser = subparsers.add_parser("watch", help="监听决策和画像变化，增量更新报告")
+    watch_parser.add_argument("--persona", required=True, help="画像文件路径")
+    watch_parser.add_argument("--debounce", type=float, default=2.0, help="防抖时间（秒，默认2）")
+    watch_parser.add_argument("--interval", type=float, default=5.0, help="轮询间隔（秒，默认5）")
+    watch_parser.add_argument("--polling", action="store_true", help="强制使用轮询模式")
+
     # trends命令
     trends_parser = subparsers.add_parser("trends", help="查看指标趋势")
     trends_parser.add_argument("--days", type=int, default=90, help="查看最近多少天")
@@ -480,19 +909,47 @@ def main():
         if args.command == "weekly":
             report = generate_weekly_report(
                 week_num=args.week,
-                persona_path=args.persona
+                persona_path=args.persona,
+                decision_dir=get_decision_dir(args.tenant)
             )
-            file_path = save_report(report, "weekly", args.week)
+            file_path = save_report(report, "weekly", args.week, get_review_dir(args.tenant))
             print(f"\n✅ 周报已保存到：{file_path}")
 
         elif args.command == "monthly":
-            print(f"📊 正在生成第 {args.month} 月成长报告...")
-            # TODO: 实现月报生成
-            print("⚠️  月报功能开发中...")
+            report = generate_monthly_report(
+                month_num=args.month,
+                persona_path=args.persona,
+                decision_dir=get_decision_dir(args.tenant)
+            )
+            file_path = save_report(report, "monthly", args.month, get_review_dir(args.tenant))
+            print(f"\n✅ 月报已保存到：{file_path}")
+
+        elif args.command == "batch":
+            results = run_batch(args.manifest, args.week, args.month, args.workers)
+            failed = [r for r in results if not r["success"]]
+
+            print(f"\n✅ 完成：{len(results) - len(failed)} 个用户")
+            if failed:
+                print(f"❌ 失败：{len(failed)} 个用户（{', '.join(r['name'] for r in failed)}）")
+                sys.exit(1)
+
+        elif args.command == "watch":
+            watcher = GrowthWatcher(
+                persona_path=args.persona,
+                decision_dir=get_decision_dir(args.tenant),
+                review_dir=get_review_dir(args.tenant),
+                debounce=args.debounce,
+                interval=args.interval,
+                use_polling=args.polling
+            )
+            try:
+                watcher.run()
+            except KeyboardInterrupt:
+                print("\n\n✅ 监听已停止")
 
         elif args.command == "trends":
             print(f"📈 查看最近 {args.days} 天的指标趋势...")
-            decisions = load_all_decisions(days=args.days)
+            decisions = load_all_decisions(days=args.days, decision_dir=get_decision_dir(args.tenant))
             metrics = calculate_generic_metrics(decisions)
 
             print(f"\n总决策数：{metrics.get('total_decisions', 0)}")
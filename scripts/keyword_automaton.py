@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+关键词自动机 - Aho-Corasick 多模式匹配
+
+把任意数量的关键词编译成一个自动机，对文本只扫描一遍即可找出所有命中的关键词，
+耗时与文本长度成正比，与关键词数量基本无关。
+
+使用方法：
+    from keyword_automaton import KeywordAutomaton
+
+    automaton = KeywordAutomaton()
+    automaton.add("买房", "high_risk")
+    automaton.add("结婚", "high_risk")
+    automaton.build()
+
+    for start, keyword, value in automaton.iter_matches("考虑结婚后买房"):
+        print(start, keyword, value)
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 自动机（默认忽略英文大小写）"""
+
+    def __init__(self, case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[str, Any]]] = [[]]
+        self.built = False
+
+    def normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def add(self, keyword: str, value: Any = None):
+        """添加关键词（value 为命中时返回的附加数据）"""
+        if self.built:
+            raise RuntimeError("自动机已编译，不能再添加关键词")
+        if not keyword:
+            return
+
+        node = 0
+        for ch in self.normalize(keyword):
+            next_node = self.goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][ch] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+
+        self.outputs[node].append((keyword, value))
+
+    def build(self) -> "KeywordAutomaton":
+        """计算失败指针（BFS），完成编译"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+
+                # 合并失败节点的输出，匹配时无需再沿失败链回溯
+                if self.outputs[self.fail[child]]:
+                    self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+        self.built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, Any]]:
+        """扫描文本，依次返回 (起始位置, 关键词, 附加数据)"""
+        if not self.built:
+            self.build()
+
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        node = 0
+        for i, ch in enumerate(self.normalize(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if outputs[node]:
+                for keyword, value in outputs[node]:
+                    yield i - len(keyword) + 1, keyword, value
+
+    def find_all(self, text: str) -> List[Tuple[int, str, Any]]:
+        """返回所有命中（按出现位置排序）"""
+        return sorted(self.iter_matches(text), key=lambda m: m[0])
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+LLM 提取结果缓存 - 同一份文档不重复调用付费 API
+
+缓存键由以下内容计算（任何一项变化都会重新调用 API）：
+- 文档文本的 sha256
+- 提示词版本（修改提示词时递增，例如 resume-v1 → resume-v2）
+- 模型名称
+- 服务提供方（anthropic / openai / stub ...）
+
+缓存文件保存在 data/llm_cache/（可用环境变量 LLM_CACHE_DIR 指定），
+超过 max_age_days 的条目读取时失效；总大小超过 max_bytes 时按最近使用时间淘汰。
+
+使用方法：
+    from llm_cache import cached_extract
+
+    def call_claude(text):
+        ...  # 调用 API，返回 dict，失败返回 None
+
+    info = cached_extract("anthropic", "claude-3-5-sonnet-20241022", "resume-v1", text, call_claude)
+
+    # 测试时用本地桩替代真实 API
+    stub = StubProvider({"basics": {"name": "张三"}})
+    cached_extract("stub", "stub-model", "resume-v1", text, stub)
+    stub.calls  # 1，再次调用命中缓存后仍为 1
+
+    # 异步客户端使用 cached_extract_async，call 为协程函数
+
+命令行：
+    python llm_cache.py stats
+    python llm_cache.py prune
+    python llm_cache.py clear
+"""
+
+import os
+import json
+import asyncio
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tenant_storage import DATA_ROOT
+from schema_check import SchemaError
+
+
+DEFAULT_CACHE_DIR = DATA_ROOT / "llm_cache"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def text_hash(text: str) -> str:
+    """文档文本的 sha256"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_cache_key(provider: str, model: str, prompt_version: str, text_sha256: str) -> str:
+    """缓存键"""
+    raw = json.dumps([provider, model, prompt_version, text_sha256], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """磁盘缓存（每个条目一个 JSON 文件，按键的前两位分目录）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS
+    ):
+        self.cache_dir = Path(cache_dir or os.environ.get("LLM_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def iter_entries(self) -> List[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取条目（过期条目删除后返回 None）"""
+        path = self.entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.max_age:
+            path.unlink(missing_ok=True)
+            return None
+
+        # 更新访问时间，淘汰时按最近使用排序
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]):
+        """写入条目，然后按总大小淘汰"""
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self) -> int:
+        """删除过期条目，并在总大小超限时删除最久未使用的条目，返回删除数量"""
+        now = time.time()
+        files = []
+        removed = 0
+        for path in self.iter_entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def clear(self) -> int:
+        """清空缓存"""
+        entries = self.iter_entries()
+        for path in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.iter_entries()
+        return {
+            "cache_dir": str(self.cache_dir),
+            "entries": len(entries),
+            "bytes": sum(path.stat().st_size for path in entries)
+        }
+
+
+_default_cache: Optional[LLMCache] = None
+
+
+def get_default_cache() -> LLMCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+    return _default_cache
+
+
+def lookup(
+    provider: str,
+    model: str,
+    prompt_version: str,
+    text: str,
+    cache: LLMCache
+) -> tuple:
+    """查找缓存，返回 (缓存键, 文本哈希, 缓存结果或 None)"""
+    text_sha256 = text_hash(text)
+    key = make_cache_key(provider, model, prompt_version, text_sha256)
+    entry = cache.get(key)
+    if entry is not None:
+        print(f"⚡ 命中提取缓存（{provider} / {model} / {prompt_version}），跳过 API 调用")
+        return key, text_sha256, entry["result"]
+    return key, text_sha256, None
+
+
+def store(
+    cache: LLMCache,
+    key: str,
+    provider: str,
+    model: str,
+    prompt_version: str,
+    text_sha256: str,
+    result: Optional[Dict[str, Any]]
+):
+    """写入提取结果（None 表示失败，不缓存）"""
+    if result is not None:
+        cache.set(key, {
+            "created_at": time.time(),
+            "provider": provider,
+            "model": model,
+            "prompt_version": prompt_version,
+            "text_sha256": text_sha256,
+            "result": result
+        })
+
+
+def cached_extract(
+    provider: str,
+    model: str,
+    prompt_version: str,
+    text: str,
+    call: Callable[[str], Optional[Dict[str, Any]]],
+    cache: Optional[LLMCache] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    带缓存的 LLM 提取
+
+    命中缓存时直接返回（不检查 API key，也不发起请求）；未命中时调用 call(text)，
+    结果非 None 才写入缓存，失败不缓存。
+    """
+    cache = cache or get_default_cache()
+    key, text_sha256, cached = lookup(provider, model, prompt_version, text, cache)
+    if cached is not None:
+        return cached
+
+    result = call(text)
+    store(cache, key, provider, model, prompt_version, text_sha256, result)
+    return result
+
+
+async def cached_extract_async(
+    provider: str,
+    model: str,
+    prompt_version: str,
+    text: str,
+    call: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    cache: Optional[LLMCache] = None,
+    validate: Optional[Callable[[Dict[str, Any]], List[str]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    cached_extract 的异步版本（call 为协程函数，调用失败时异常照常抛出）
+
+    传入 validate（返回错误列表）时，只缓存通过校验的结果：未通过校验时抛出 SchemaError，
+    不写入缓存，重试会重新调用；未通过校验的旧缓存条目视为未命中。
+    """
+    cache = cache or get_default_cache()
+    key, text_sha256, cached = lookup(provider, model, prompt_version, text, cache)
+    if cached is not None and not (validate and validate(cached)):
+        return cached
+
+    result = await call(text)
+    if result is not None and validate:
+        errors = validate(result)
+        if errors:
+            raise SchemaError(errors)
+    store(cache, key, provider, model, prompt_version, text_sha256, result)
+    return result
+
+
+class StubProvider:
+    """
+    本地桩：返回固定结果并记录调用次数（用于测试缓存和批量流程，不访问网络）
+
+    delay 为异步调用的模拟延迟（秒），failures 为前几次调用抛出异常的次数（用于测试重试）。
+    """
+
+    def __init__(self, result: Optional[Dict[str, Any]] = None, delay: float = 0.0, failures: int = 0):
+        self.result = result if result is not None else {}
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+
+    def respond(self) -> Dict[str, Any]:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError(f"模拟调用失败（第 {self.calls} 次）")
+        return json.loads(json.dumps(self.result))
+
+    def __call__(self, text: str) -> Optional[Dict[str, Any]]:
+        return self.respond()
+
+    async def call_async(self, text: str) -> Optional[Dict[str, Any]]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.respond()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM 提取结果缓存管理")
+    parser.add_argument("command", choices=["stats", "prune", "clear"], help="命令")
+    parser.add_argument("--cache-dir", help="缓存目录（默认 data/llm_cache）")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024, help="缓存总大小上限（MB）")
+    parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS, help="条目有效期（天）")
+
+    args = parser.parse_args()
+    cache = LLMCache(args.cache_dir, int(args.max_mb * 1024 * 1024), args.max_age_days)
+
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"\n📦 缓存目录：{stats['cache_dir']}")
+        print(f"   条目：{stats['entries']} 个，共 {stats['bytes'] / 1024:.1f} KB\n")
+
+    elif args.command == "prune":
+        print(f"✅ 已淘汰 {cache.evict()} 个条目")
+
+    elif args.command == "clear":
+        print(f"✅ 已清空 {cache.clear()} 个条目")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+LLM 客户端注册表 - 复用客户端和 HTTP 连接（keep-alive）
+
+每次提取都新建 anthropic.Anthropic / openai.OpenAI 客户端时，每份文档都要重新建立
+TCP 连接和 TLS 握手。这里按（提供方、API key、base URL）缓存客户端，整个进程共用：
+
+- 已安装 SDK：缓存 SDK 客户端（同步客户端全进程共用，异步客户端按事件循环缓存），
+  SDK 内部的 httpx 连接池随之复用；通过 httpx 事件钩子统计新建连接和请求数
+- 未安装 SDK：用标准库 http.client 直接调用 HTTP API，按主机维护 keep-alive 连接池
+
+两种方式都可以用 ANTHROPIC_BASE_URL / OPENAI_BASE_URL 指向其他地址（例如本地桩服务器）。
+
+使用方法：
+    from llm_clients import connection_stats, stream, stream_async
+
+    # 流式输出（逐块返回文本，配合 streaming_json 边接收边解析）
+    for chunk in stream("anthropic", "claude-3-5-sonnet-20241022", prompt, max_tokens=8192):
+        ...
+    async for chunk in stream_async("openai", "gpt-4o", prompt, max_tokens=4096):
+        ...
+
+    connection_stats()
+    # {"api.anthropic.com": {"requests": 12, "connections_opened": 1, "connections_reused": 11}}
+"""
+
+import os
+import json
+import time
+import socket
+import asyncio
+import threading
+import http.client
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# 各提供方的 API key / base URL 环境变量（与官方 SDK 相同）和默认地址
+PROVIDERS = {
+    "anthropic": {
+        "api_key_env": "ANTHROPIC_API_KEY",
+        "base_url_env": "ANTHROPIC_BASE_URL",
+        "base_url": "https://api.anthropic.com"
+    },
+    "openai": {
+        "api_key_env": "OPENAI_API_KEY",
+        "base_url_env": "OPENAI_BASE_URL",
+        "base_url": "https://api.openai.com/v1"
+    }
+}
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+# 每个主机最多保留的空闲连接数
+MAX_IDLE_CONNECTIONS = 8
+
+# 空闲连接超过该时间（秒）不再复用（服务端通常在这之前关闭连接）
+IDLE_TIMEOUT = 60.0
+
+DEFAULT_TIMEOUT = 120.0
+
+# 未安装 SDK 时读取流的后台线程数（每个进行中的流占用一个线程），调用方可以用 reserve_stream_threads 调大
+STREAM_THREADS = 32
+
+
+class LLMRequestError(RuntimeError):
+    """HTTP API 返回错误状态"""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"HTTP {status}：{body[:200]}")
+        self.status = status
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def record(host: str, counter: str):
+    with _stats_lock:
+        host_stats = _stats.setdefault(host, {"requests": 0, "connections_opened": 0})
+        host_stats[counter] += 1
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """各主机的请求数、新建连接数和复用连接的请求数"""
+    with _stats_lock:
+        return {
+            host: {**counters, "connections_reused": max(0, counters["requests"] - counters["connections_opened"])}
+            for host, counters in _stats.items()
+        }
+
+
+def format_stats() -> str:
+    """一行连接复用摘要（没有请求时为空字符串）"""
+    parts = []
+    for host, counters in connection_stats().items():
+        parts.append(f"{host} {counters['requests']} 次请求 / 新建 {counters['connections_opened']} 个连接")
+    return "；".join(parts)
+
+
+class StreamHandle:
+    """
+    正在进行的标准库请求的中止句柄（线程安全）
+
+    后台线程读取流式响应时阻塞在 socket 上，取消协程无法让它返回；事件循环调用 abort()
+    关闭该请求的 socket，阻塞的读取立即出错，线程随即结束（连接不再归还连接池）。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.aborted = False
+
+    def attach(self, conn: http.client.HTTPConnection):
+        """登记已建立的连接（已经中止时关闭连接并抛出 ConnectionAbortedError）"""
+        with self.lock:
+            if self.aborted:
+                conn.close()
+                raise ConnectionAbortedError("请求已取消")
+            self.conn = conn
+
+    def detach(self):
+        with self.lock:
+            self.conn = None
+
+    def abort(self):
+        with self.lock:
+            self.aborted = True
+            sock = self.conn.sock if self.conn is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class KeepAlivePool:
+    """标准库 HTTP 连接池：按主机保留空闲连接，请求结束后归还（线程安全）"""
+
+    def __init__(self, max_idle: int = MAX_IDLE_CONNECTIONS, idle_timeout: float = IDLE_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.idle: Dict[Tuple[str, str, int], List[Tuple[float, http.client.HTTPConnection]]] = {}
+
+    def acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """取一个连接，返回 (连接, 是否复用)"""
+        now = time.monotonic()
+        with self.lock:
+            connections = self.idle.get(key, [])
+            while connections:
+                released_at, conn = connections.pop()
+                if now - released_at < self.idle_timeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=timeout), False
+
+    def release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.max_idle:
+                connections.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    def send(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout: float,
+        handle: Optional[StreamHandle] = None
+    ) -> Tuple[Tuple[str, str, int], http.client.HTTPConnection, http.client.HTTPResponse]:
+        """发送 POST JSON，返回 (连接池键, 连接, 响应)；调用方读完响应后归还连接（传入 handle 时可以从其他线程中止）"""
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        host = parts.netloc
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {**headers, "Content-Type": "application/json", "Connection": "keep-alive"}
+
+        record(host, "requests")
+        for attempt in range(2):
+            conn, reused = self.acquire(key, timeout)
+            if not reused:
+                record(host, "connections_opened")
+            try:
+                if handle is not None:
+                    if conn.sock is None:
+                        conn.connect()
+                    handle.attach(conn)
+                conn.request("POST", path, body=body, headers=headers)
+                return key, conn, conn.getresponse()
+            except (ConnectionError, http.client.BadStatusLine):
+                conn.close()
+                # 服务端已关闭空闲连接：换一个新连接重试一次
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+        raise ConnectionError(f"无法连接 {host}")
+
+    def finish(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        """响应已读完：连接可以复用时归还，否则关闭"""
+        if response.will_close:
+            conn.close()
+        else:
+            self.release(key, conn)
+
+    def stream_lines(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout: float = DEFAULT_TIMEOUT,
+        handle: Optional[StreamHandle] = None
+    ) -> Iterator[str]:
+        """
+        POST JSON，逐行返回流式响应（server-sent events）
+
+        读完整个响应后连接归还连接池；调用方提前结束（生成器被 close）或通过 handle 中止时关闭连接。
+        """
+        key, conn, response = self.send(url, payload, headers, timeout, handle)
+        finished = False
+        try:
+            if response.status >= 400:
+                data = response.read()
+                finished = True
+                raise LLMRequestError(response.status, data.decode('utf-8', errors='replace'))
+            for line in response:
+                yield line.decode('utf-8').rstrip("\r\n")
+            finished = True
+        finally:
+            if handle is not None:
+                handle.detach()
+            if finished:
+                self.finish(key, conn, response)
+            else:
+                conn.close()
+
+    def close(self):
+        with self.lock:
+            for connections in self.idle.values():
+                for _, conn in connections:
+                    conn.close()
+            self.idle.clear()
+
+
+_pool = KeepAlivePool()
+
+_client_lock = threading.Lock()
+_sync_clients: Dict[Tuple[str, str, str], Any] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, str], Any]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def resolve(provider: str) -> Tuple[str, str]:
+    """提供方的 (API key, base URL)，未设置 API key 时抛出 ValueError"""
+    if provider not in PROVIDERS:
+        raise ValueError(f"不支持的提供方：{provider}")
+    spec = PROVIDERS[provider]
+    api_key = os.environ.get(spec["api_key_env"])
+    if not api_key:
+        raise ValueError(f"未设置 {spec['api_key_env']}")
+    base_url = (os.environ.get(spec["base_url_env"]) or spec["base_url"]).rstrip("/")
+    return api_key, base_url
+
+
+def load_sdk(provider: str):
+    """导入提供方的官方 SDK（未安装时返回 None）"""
+    try:
+        if provider == "anthropic":
+            import anthropic
+            return anthropic
+        import openai
+        return openai
+    except ImportError:
+        return None
+
+
+def http_client_options(sdk, base_url: str, asynchronous: bool) -> Dict[str, Any]:
+    """给 SDK 传入带统计钩子的 httpx 客户端（httpx 不可用时使用 SDK 默认客户端）"""
+    try:
+        import httpx
+    except ImportError:
+        return {}
+
+    host = urlsplit(base_url).netloc
+
+    def trace(event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            record(host, "connections_opened")
+
+    if asynchronous:
+        async def async_trace(event_name: str, info: Dict[str, Any]):
+            trace(event_name, info)
+
+        async def on_request(request):
+            record(host, "requests")
+            request.extensions["trace"] = async_trace
+
+        client_class = getattr(sdk, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+    else:
+        def on_request(request):
+            record(host, "requests")
+            request.extensions["trace"] = trace
+
+        client_class = getattr(sdk, "DefaultHttpxClient", httpx.Client)
+
+    return {"http_client": client_class(event_hooks={"request": [on_request]})}
+
+
+def get_client(provider: str, asynchronous: bool = False):
+    """
+    获取缓存的 SDK 客户端（未安装 SDK 时返回 None，调用方改用标准库连接池）
+
+    异步客户端的连接池绑定在事件循环上，按当前事件循环分别缓存。
+    """
+    sdk = load_sdk(provider)
+    if sdk is None:
+        return None
+
+    api_key, base_url = resolve(provider)
+    key = (provider, api_key, base_url)
+
+    with _client_lock:
+        if asynchronous:
+            clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+        else:
+            clients = _sync_clients
+        if key not in clients:
+            options = http_client_options(sdk, base_url, asynchronous)
+            if provider == "anthropic":
+                client_class = sdk.AsyncAnthropic if asynchronous else sdk.Anthropic
+            else:
+                client_class = sdk.AsyncOpenAI if asynchronous else sdk.OpenAI
+            clients[key] = client_class(api_key=api_key, base_url=base_url, **options)
+        return clients[key]
+
+
+def http_request(provider: str, model: str, prompt: str, max_tokens: int, temperature: Optional[float]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    """HTTP API 的 (URL, 请求体, 请求头)"""
+    api_key, base_url = resolve(provider)
+    payload = {"model": model, "max_tokens": max_tokens, "messages": [{"role": "user", "content": prompt}]}
+    if temperature is not None:
+        payload["temperature"] = temperature
+
+    if provider == "anthropic":
+        return f"{base_url}/v1/messages", payload, {"x-api-key": api_key, "anthropic-version": ANTHROPIC_VERSION}
+    return f"{base_url}/chat/completions", payload, {"Authorization": f"Bearer {api_key}"}
+
+
+def sse_events(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str]]:
+    """把 server-sent events 的行组合成 (事件名, 数据)"""
+    event, data = None, []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = None, []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+    if data:
+        yield event, "\n".join(data)
+
+
+def stream_http(
+    provider: str,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    temperature: Optional[float],
+    timeout: float,
+    handle: Optional[StreamHandle] = None
+) -> Iterator[str]:
+    """不经过 SDK 的流式调用，逐块返回模型输出的文本（handle 用于从其他线程中止）"""
+    url, payload, headers = http_request(provider, model, prompt, max_tokens, temperature)
+    payload["stream"] = True
+    lines = _pool.stream_lines(url, payload, headers, timeout, handle)
+
+    try:
+        for event, data in sse_events(lines):
+            if provider == "openai":
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                text = (choices[0].get("delta") or {}).get("content")
+            else:
+                message = json.loads(data)
+                if message.get("type") == "error":
+                    raise LLMRequestError(200, json.dumps(message.get("error"), ensure_ascii=False))
+                delta = message.get("delta") or {}
+                text = delta.get("text") if message.get("type") == "content_block_delta" else None
+            if text:
+                yield text
+        # 读完剩余内容，连接才能归还连接池
+        for _ in lines:
+            pass
+    finally:
+        lines.close()
+
+
+def stream(
+    provider: str,
+    model: str,
+    prompt: str,
+    max_tokens: int = 4096,
+    temperature: Optional[float] = None,
+    timeout: float = DEFAULT_TIMEOUT
+) -> Iterator[str]:
+    """流式发送单轮提示词，逐块返回模型输出的文本（提前 close 生成器会中止请求）"""
+    client = get_client(provider)
+    if client is None:
+        yield from stream_http(provider, model, prompt, max_tokens, temperature, timeout)
+        return
+
+    options = {"temperature": temperature} if temperature is not None else {}
+    messages = [{"role": "user", "content": prompt}]
+    if provider == "anthropic":
+        with client.messages.stream(model=model, max_tokens=max_tokens, messages=messages, timeout=timeout, **options) as response:
+            yield from response.text_stream
+        return
+
+    response = client.chat.completions.create(
+        model=model, max_tokens=max_tokens, messages=messages, timeout=timeout, stream=True, **options
+    )
+    try:
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        response.close()
+
+
+async def stream_async(
+    provider: str,
+    model: str,
+    prompt: str,
+    max_tokens: int = 4096,
+    temperature: Optional[float] = None,
+    timeout: float = DEFAULT_TIMEOUT
+) -> AsyncIterator[str]:
+    """
+    stream 的异步版本（未安装 SDK 时在后台线程中读取标准库连接的流）
+
+    协程被取消（例如对冲 / 竞速中落败）时关闭后台线程的 socket，线程立即结束，
+    不会拖住 asyncio.run 的退出。
+    """
+    client = get_client(provider, asynchronous=True)
+    if client is None:
+        handle = StreamHandle()
+        async for text in iterate_in_thread(
+            lambda: stream_http(provider, model, prompt, max_tokens, temperature, timeout, handle),
+            abort=handle.abort
+        ):
+            yield text
+        return
+
+    options = {"temperature": temperature} if temperature is not None else {}
+    messages = [{"role": "user", "content": prompt}]
+    if provider == "anthropic":
+        async with client.messages.stream(
+            model=model, max_tokens=max_tokens, messages=messages, timeout=timeout, **options
+        ) as response:
+            async for text in response.text_stream:
+                yield text
+        return
+
+    response = await client.chat.completions.create(
+        model=model, max_tokens=max_tokens, messages=messages, timeout=timeout, stream=True, **options
+    )
+    try:
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        await response.close()
+
+
+_stream_lock = threading.Lock()
+_stream_executor: Optional[ThreadPoolExecutor] = None
+_stream_threads = STREAM_THREADS
+
+
+def reserve_stream_threads(count: int):
+    """
+    保证至少 count 个流可以同时读取（调用方传入自己的最大并发请求数）
+
+    流在专用线程池中读取，不占用事件循环的默认线程池（只有 min(32, CPU 数 + 4) 个线程）：
+    线程不够时多出的流只能排队，排队时间计入提取超时，会被误记为提供方失败。
+    """
+    global _stream_executor, _stream_threads
+    with _stream_lock:
+        if count <= _stream_threads:
+            return
+        _stream_threads = count
+        if _stream_executor is not None:
+            # 已在读取的流继续在旧线程池中完成
+            _stream_executor.shutdown(wait=False)
+            _stream_executor = None
+
+
+def stream_executor() -> ThreadPoolExecutor:
+    """读取流的专用线程池（按需创建）"""
+    global _stream_executor
+    with _stream_lock:
+        if _stream_executor is None:
+            _stream_executor = ThreadPoolExecutor(max_workers=_stream_threads, thread_name_prefix="llm-stream")
+        return _stream_executor
+
+
+async def iterate_in_thread(
+    make_iterator: Callable[[], Iterator[str]],
+    abort: Optional[Callable[[], None]] = None
+) -> AsyncIterator[str]:
+    """
+    在专用线程池（stream_executor）中消费同步迭代器，结果通过队列交给事件循环
+
+    调用方提前结束（取消或 aclose）时通知线程停止，并调用 abort() 打断线程中阻塞的读取。
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+    end = object()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # 事件循环已关闭
+            stopped.set()
+
+    def produce():
+        iterator = None
+        try:
+            iterator = make_iterator()
+            for item in iterator:
+                if stopped.is_set():
+                    break
+                put((item, None))
+            put((end, None))
+        except Exception as e:
+            put((None, e))
+        finally:
+            if iterator is not None:
+                iterator.close()
+
+    loop.run_in_executor(stream_executor(), produce)
+    finished = False
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                finished = True
+                raise error
+            if item is end:
+                finished = True
+                return
+            yield item
+    finally:
+        stopped.set()
+        if not finished and abort is not None:
+            abort()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+LLM 提取编排 - 多个提供方对冲 / 竞速，取第一个通过 schema 校验的结果
+
+提供方配置：templates/llm_providers.json
+    - strategy：
+        sequential  依次尝试，前一个失败后才启动下一个（最坏延迟为各提供方超时之和）
+        hedge       先启动第一个，hedge_delay 秒内没有有效结果（或提前失败）就启动下一个
+        race        同时启动所有提供方
+    - hedge_delay：对冲延迟（秒）
+    - providers：每个提供方的 name / label / model / api_key_env，以及
+        timeout       单次提取的超时（秒，包含分块提取的所有块）
+        max_tokens    输出 token 上限
+        max_requests  本进程内最多发起的提取次数（预算用完后跳过该提供方）
+
+第一个返回且通过 schema 校验的结果胜出，其余仍在进行的请求立即取消。
+传入 health（provider_health.ProviderHealth）时，熔断中的提供方直接跳过，
+调用异常和超时计入熔断统计（结果未通过校验、因竞速失败被取消的不计入）。
+
+使用方法：
+    from llm_orchestrator import ExtractionOrchestrator, create_providers, load_provider_config
+
+    config = load_provider_config()
+    providers = create_providers(config, build_prompt)
+    orchestrator = ExtractionOrchestrator.from_config(config, providers, schema)
+    result, label = await orchestrator.extract(text)
+"""
+
+import os
+import json
+import asyncio
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from schema_check import SchemaError, validate
+from provider_health import ProviderHealth
+from llm_clients import DEFAULT_TIMEOUT, PROVIDERS, stream_async
+from streaming_json import parse_stream_async
+
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "templates" / "llm_providers.json"
+
+STRATEGIES = ("sequential", "hedge", "race")
+
+
+def load_provider_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """加载提供方配置"""
+    with open(config_path or DEFAULT_CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    if config.get("strategy", "hedge") not in STRATEGIES:
+        raise ValueError(f"未知的编排策略：{config['strategy']}（可选：{', '.join(STRATEGIES)}）")
+    return config
+
+
+def create_sdk_call(
+    spec: Dict[str, Any],
+    build_prompt: Callable[[str], str],
+    on_member: Optional[Callable[[str, str, Any], None]] = None
+) -> Optional[Callable[[str], Awaitable[Dict[str, Any]]]]:
+    """
+    按配置创建异步调用（未设置 API key 或不支持的提供方返回 None）
+
+    模型输出按流式接收、增量解析：每个顶层字段完整时回调 on_member(提供方名称, 字段名, 值)，
+    输出格式错误时立即中止请求并抛出 StreamingJSONError。客户端和连接由 llm_clients 复用。
+    """
+    if not os.environ.get(spec.get("api_key_env", "")):
+        return None
+
+    if spec["name"] not in PROVIDERS:
+        print(f"⚠️  不支持的提供方：{spec['name']}")
+        return None
+
+    temperature = 0 if spec["name"] == "openai" else None
+    callback = (lambda key, value: on_member(spec["label"], key, value)) if on_member else None
+
+    async def call(text: str) -> Dict[str, Any]:
+        chunks = stream_async(
+            spec["name"], spec["model"], build_prompt(text),
+            max_tokens=spec.get("max_tokens", 4096),
+            temperature=temperature,
+            timeout=spec.get("timeout", DEFAULT_TIMEOUT)
+        )
+        return await parse_stream_async(chunks, callback)
+
+    return call
+
+
+def create_providers(
+    config: Dict[str, Any],
+    build_prompt: Callable[[str], str],
+    on_member: Optional[Callable[[str, str, Any], None]] = None
+) -> List[Dict[str, Any]]:
+    """按配置创建可用的提供方（按配置顺序排列，每个提供方是配置字段加上 "call"）"""
+    providers = []
+    for spec in config.get("providers", []):
+        call = create_sdk_call(spec, build_prompt, on_member)
+        if call is None:
+            continue
+        provider = dict(spec)
+        provider["call"] = call
+        providers.append(provider)
+    return providers
+
+
+class ExtractionOrchestrator:
+    """按策略调度多个提供方，返回第一个有效结果"""
+
+    def __init__(
+        self,
+        providers: List[Dict[str, Any]],
+        strategy: str = "hedge",
+        hedge_delay: float = 8.0,
+        schema: Optional[Dict[str, Any]] = None,
+        health: Optional[ProviderHealth] = None
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"未知的编排策略：{strategy}（可选：{', '.join(STRATEGIES)}）")
+        self.providers = providers
+        self.strategy = strategy
+        self.hedge_delay = hedge_delay
+        self.schema = schema
+        self.health = health
+        self.request_counts: Dict[str, int] = {p["name"]: 0 for p in providers}
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        providers: List[Dict[str, Any]],
+        schema: Optional[Dict[str, Any]] = None,
+        health: Optional[ProviderHealth] = None
+    ) -> "ExtractionOrchestrator":
+        return cls(providers, config.get("strategy", "hedge"), config.get("hedge_delay", 8.0), schema, health)
+
+    def available(self) -> List[Dict[str, Any]]:
+        """预算未用完、且没有熔断的提供方"""
+        return [
+            p for p in self.providers
+            if (p.get("max_requests") is None or self.request_counts[p["name"]] < p["max_requests"])
+            and (self.health is None or self.health.is_available(p["name"]))
+        ]
+
+    async def attempt(self, provider: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """调用一个提供方（带超时），熔断中时抛出 RuntimeError，结果不通过校验时抛出 SchemaError"""
+        name = provider["name"]
+        if self.health is not None and not self.health.allow(name):
+            raise RuntimeError("熔断中，跳过")
+
+        self.request_counts[name] += 1
+        try:
+            result = await asyncio.wait_for(provider["call"](text), timeout=provider.get("timeout"))
+        except asyncio.CancelledError:
+            # 被取消（竞速 / 对冲时其他提供方先成功）不说明提供方的好坏，只归还半开探测名额
+            if self.health is not None:
+                self.health.release(name)
+            raise
+        except SchemaError:
+            # 请求本身成功，只是结果不合格（分块提取时在写入缓存前校验），不计入熔断统计
+            if self.health is not None:
+                self.health.record_success(name)
+            raise
+        except Exception:
+            if self.health is not None:
+                self.health.record_failure(name)
+            raise
+        if self.health is not None:
+            self.health.record_success(name)
+
+        if result is None:
+            raise ValueError("没有返回结果")
+        if self.schema:
+            errors = validate(result, self.schema)
+            if errors:
+                raise SchemaError(errors)
+        return result
+
+    async def extract(self, text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        提取（返回 (结果, 提供方名称)，全部失败时返回 (None, None)）
+
+        sequential 只在没有进行中的请求时启动下一个；hedge 每隔 hedge_delay 秒再启动一个；
+        race 一开始就全部启动。任何请求失败（异常、超时或未通过校验）时立即启动下一个。
+        """
+        queue = self.available()
+        if not queue:
+            return None, None
+
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Task, Dict[str, Any]] = {}
+        next_start = loop.time()
+
+        def launch():
+            nonlocal next_start
+            provider = queue.pop(0)
+            running[asyncio.ensure_future(self.attempt(provider, text))] = provider
+            next_start = loop.time() + self.hedge_delay
+
+        try:
+            while queue or running:
+                if queue:
+                    if self.strategy == "race":
+                        while queue:
+                            launch()
+                    elif not running or (self.strategy == "hedge" and loop.time() >= next_start):
+                        launch()
+
+                # 对冲模式下等到下一次启动时间，否则等任意请求结束
+                timeout = None
+                if self.strategy == "hedge" and queue:
+                    timeout = max(0.0, next_start - loop.time())
+
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = running.pop(task)
+                    try:
+                        return task.result(), provider["label"]
+                    except asyncio.TimeoutError:
+                        print(f"⚠️  {provider['label']} 超时（{provider.get('timeout')}s）")
+                    except Exception as e:
+                        print(f"⚠️  {provider['label']} 调用失败：{e}")
+
+                    # 失败后不再等待对冲延迟，立即启动下一个
+                    next_start = loop.time()
+
+            return None, None
+
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
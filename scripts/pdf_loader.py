@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+PDF 加载器 - 按页惰性提取文本，长文档按页段并行提取
+
+resume_parser 和 gallup_parser 共用：
+- iter_pages()：生成器，逐页提取文本，调用方可以边提取边处理（例如找到所需内容后提前结束）
+- extract_text()：页数较多时把页码切成若干段，交给进程池并行提取，
+  各段结果按页序收集后只做一次拼接
+
+使用方法：
+    from pdf_loader import extract_text, iter_pages
+
+    text = extract_text("gallup_report.pdf")
+    for page_text in iter_pages("resume.pdf"):
+        ...
+
+依赖：
+    PyPDF2>=3.0.0（未安装时抛出 ImportError）
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+
+# 页数达到该值才启用进程池（短文档启动进程的开销大于收益）
+PARALLEL_MIN_PAGES = 16
+
+# 每个工作进程平均分到的页段数（页段越多负载越均衡，但每段都要重新打开文件）
+SEGMENTS_PER_WORKER = 2
+
+
+def open_reader(file_path: str):
+    """打开 PDF（延迟导入 PyPDF2）"""
+    import PyPDF2
+    return PyPDF2.PdfReader(file_path)
+
+
+def count_pages(file_path: str) -> int:
+    """PDF 页数"""
+    return len(open_reader(file_path).pages)
+
+
+def iter_pages(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    """逐页提取文本（[start, end) 范围内，按页序惰性生成）"""
+    reader = open_reader(file_path)
+    pages = reader.pages
+    end = len(pages) if end is None else min(end, len(pages))
+
+    for index in range(start, end):
+        yield pages[index].extract_text() or ""
+
+
+def _extract_segment(segment: Tuple[str, int, int]) -> List[str]:
+    """工作进程：提取一个页段的文本"""
+    file_path, start, end = segment
+    return list(iter_pages(file_path, start, end))
+
+
+def split_segments(page_count: int, segment_count: int) -> List[Tuple[int, int]]:
+    """把页码切成 segment_count 个连续页段"""
+    segment_count = max(1, min(segment_count, page_count))
+    size, remainder = divmod(page_count, segment_count)
+
+    segments = []
+    start = 0
+    for i in range(segment_count):
+        end = start + size + (1 if i < remainder else 0)
+        segments.append((start, end))
+        start = end
+    return segments
+
+
+def extract_text(file_path: str, workers: Optional[int] = None) -> str:
+    """
+    提取整个 PDF 的文本
+
+    workers 为进程数（默认 CPU 核数）。页数少于 PARALLEL_MIN_PAGES 或只有一个进程时
+    在当前进程中逐页提取。
+    """
+    workers = workers or os.cpu_count() or 1
+    page_count = count_pages(file_path)
+
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        return ''.join(iter_pages(file_path))
+
+    segments = [
+        (file_path, start, end)
+        for start, end in split_segments(page_count, workers * SEGMENTS_PER_WORKER)
+    ]
+
+    page_texts = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map 按提交顺序返回结果，页序不会错乱
+        for segment_texts in executor.map(_extract_segment, segments):
+            page_texts.extend(segment_texts)
+
+    return ''.join(page_texts)
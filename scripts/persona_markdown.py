@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+画像文档解析器 - 一次扫描把画像 Markdown 解析成章节树
+
+解析结果包含：
+- 章节树（标题、级别、起止行号、子章节）
+- 每个章节自身正文中的列表项（- / * / • / 1. 开头的行）
+- 文档级的加粗字段（**生成时间**：2026-02-05）和引用块（> ...）
+
+version_comparer 和 growth_reviewer 所需的字段都基于章节树提取（extract_version_fields、
+extract_metadata_fields），不再对全文反复做正则扫描；persona_store 编译画像时调用这两个函数。
+
+使用方法：
+    from persona_markdown import load_document
+
+    doc = load_document("interviews/my-persona-v1.2.md")
+    section = doc.find("我的核心优势")
+    print(section.own_text())
+    print(section.list_items)
+"""
+
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+LIST_ITEM_PATTERN = re.compile(r'^(\s*)([-*•+]|\d+[.、])\s+(.*)$')
+FIELD_PATTERN = re.compile(r'\*\*([^*]+)\*\*[：:]\s*(.+)')
+RULE_PATTERN = re.compile(r'^\s*(-{3,}|\*{3,}|_{3,})\s*$')
+
+
+class Section:
+    """章节节点（level 0 为文档根节点）"""
+
+    def __init__(self, document: "MarkdownDocument", title: str, level: int, start_line: int):
+        self.document = document
+        self.title = title
+        self.level = level
+        self.start_line = start_line  # 标题所在行（根节点为 -1）
+        self.end_line = len(document.lines)  # 章节结束行（不含），包含子章节
+        self.own_end_line = self.end_line  # 自身正文结束行（第一个子章节标题之前）
+        self.parent: Optional["Section"] = None
+        self.children: List["Section"] = []
+        self.list_items: List[Dict[str, Any]] = []  # 自身正文中的列表项
+
+    def __repr__(self) -> str:
+        return f"Section({self.title!r}, level={self.level}, lines={self.start_line}-{self.end_line})"
+
+    def own_lines(self, stop_at_rule: bool = False) -> List[str]:
+        """自身正文的行（不含标题和子章节），stop_at_rule 时在分隔线 --- 处截止"""
+        lines = self.document.lines[self.start_line + 1:self.own_end_line]
+        if stop_at_rule:
+            for i, line in enumerate(lines):
+                if RULE_PATTERN.match(line):
+                    return lines[:i]
+        return lines
+
+    def own_text(self, stop_at_rule: bool = False) -> str:
+        """自身正文文本"""
+        return "\n".join(self.own_lines(stop_at_rule)) + "\n"
+
+    def text(self) -> str:
+        """整个章节的文本（包含子章节）"""
+        return "\n".join(self.document.lines[self.start_line + 1:self.end_line]) + "\n"
+
+    def iter_sections(self):
+        """深度优先遍历所有子孙章节"""
+        for child in self.children:
+            yield child
+            yield from child.iter_sections()
+
+
+class MarkdownDocument:
+    """解析后的画像文档"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.split('\n')
+        self.root = Section(self, "", 0, -1)
+        self.sections: List[Section] = []
+        self.fields: Dict[str, str] = {}  # 加粗字段（同名字段保留第一次出现的值）
+        self.blockquotes: List[str] = []
+        self.list_items: List[Dict[str, Any]] = []  # 全文列表项
+
+        self.parse()
+
+    def parse(self):
+        """逐行扫描一次，构建章节树"""
+        stack = [self.root]
+        in_code_block = False
+
+        for index, line in enumerate(self.lines):
+            stripped = line.strip()
+
+            # 代码块中的内容不参与解析
+            if stripped.startswith('```'):
+                in_code_block = not in_code_block
+                continue
+            if in_code_block:
+                continue
+
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                level = len(heading.group(1))
+                while stack[-1].level >= level:
+                    closed = stack.pop()
+                    closed.end_line = index
+                    if not closed.children:
+                        closed.own_end_line = index
+
+                parent = stack[-1]
+                if not parent.children:
+                    parent.own_end_line = index
+
+                section = Section(self, heading.group(2).strip(), level, index)
+                section.parent = parent
+                parent.children.append(section)
+                self.sections.append(section)
+                stack.append(section)
+                continue
+
+            item = LIST_ITEM_PATTERN.match(line)
+            if item:
+                entry = {
+                    "line": index,
+                    "indent": len(item.group(1)),
+                    "marker": item.group(2),
+                    "text": item.group(3).strip()
+                }
+                stack[-1].list_items.append(entry)
+                self.list_items.append(entry)
+
+            if stripped.startswith('>'):
+                self.blockquotes.append(stripped.lstrip('>').strip())
+
+            field = FIELD_PATTERN.search(line)
+            if field:
+                self.fields.setdefault(field.group(1).strip(), field.group(2).strip())
+
+    def find(self, title_prefix: str, level: Optional[int] = None) -> Optional[Section]:
+        """查找第一个标题以 title_prefix 开头的章节（可限定级别）"""
+        for section in self.sections:
+            if section.title.startswith(title_prefix) and (level is None or section.level == level):
+                return section
+        return None
+
+
+def parse_markdown(content: str) -> MarkdownDocument:
+    """解析 Markdown 文本"""
+    return MarkdownDocument(content)
+
+
+# 解析结果缓存：文件路径 -> (修改时间, 大小, 文档)
+_document_cache: "OrderedDict[str, tuple]" = OrderedDict()
+DOCUMENT_CACHE_SIZE = 32
+
+
+def load_document(file_path: str) -> MarkdownDocument:
+    """读取并解析画像文件（按修改时间缓存，同一文档只解析一次）"""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    key = str(path)
+
+    cached = _document_cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _document_cache.move_to_end(key)
+        return cached[2]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        document = parse_markdown(f.read())
+
+    _document_cache[key] = (stat.st_mtime_ns, stat.st_size, document)
+    _document_cache.move_to_end(key)
+    while len(_document_cache) > DOCUMENT_CACHE_SIZE:
+        _document_cache.popitem(last=False)
+
+    return document
+
+
+def extract_version_fields(document: MarkdownDocument) -> Dict[str, Any]:
+    """从画像章节树中提取 version_comparer 所需的字段"""
+    data = {
+        "created_at": None,
+        "data_sources": [],
+        "summary": "",
+        "key_findings": [],
+        "strengths": [],
+        "weaknesses": [],
+        "suitable_directions": [],
+        "unsuitable_directions": []
+    }
+
+    # 提取创建时间
+    date_match = re.match(r'(\d{4}-\d{2}-\d{2})', document.fields.get("生成时间", ""))
+    if date_match:
+        data["created_at"] = date_match.group(1)
+
+    # 提取数据源
+    if document.fields.get("数据来源"):
+        data["data_sources"] = [s.strip() for s in document.fields["数据来源"].split('+')]
+
+    # 提取摘要（第一个引用块）
+    if document.blockquotes:
+        data["summary"] = document.blockquotes[0]
+
+    # 提取核心发现
+    findings_section = document.find("核心发现")
+    if findings_section:
+        data["key_findings"] = [
+            item["text"] for item in findings_section.list_items
+            if item["marker"] in ('-', '•')
+        ]
+
+    # 提取优势（⭐⭐⭐⭐⭐ 的项目）
+    strengths_section = document.find("我的核心优势")
+    if strengths_section:
+        strength_items = re.findall(r'[⭐*]{5}\s+(.+?)(?:\n|$)', strengths_section.own_text())
+        data["strengths"] = [s.strip() for s in strength_items]
+
+    # 提取劣势
+    weaknesses_section = document.find("我的核心劣势")
+    if weaknesses_section:
+        weakness_items = re.findall(r'[-*]\s+(.+?)(?:\n|$)', weaknesses_section.own_text())
+        data["weaknesses"] = [w.strip() for w in weakness_items if w.strip()]
+
+    # 提取适合方向（⭐⭐⭐⭐⭐ 的项目）
+    suitable_section = document.find("适合的职业方向")
+    if suitable_section:
+        suitable_items = re.findall(r'[⭐*]{5}\s+(.+?)(?:\n|$)', suitable_section.own_text())
+        data["suitable_directions"] = [s.strip() for s in suitable_items]
+
+    # 提取不适合方向
+    data["unsuitable_directions"] = [
+        item["text"][1:].strip() for item in document.list_items
+        if item["text"].startswith('❌') and item["text"][1:].strip()
+    ]
+
+    return data
+
+
+def empty_persona_metadata() -> Dict[str, Any]:
+    """空的画像元数据"""
+    return {
+        "behavioral_patterns": [],
+        "blind_spots": [],
+        "weaknesses": [],
+        "decision_keywords": [],
+        "triggers": [],
+        "improvement_areas": []
+    }
+
+
+def extract_metadata_fields(document: MarkdownDocument) -> Dict[str, Any]:
+    """从画像章节树中提取 growth_reviewer 所需的元数据字段"""
+    metadata = empty_persona_metadata()
+    content = document.content
+
+    # 提取行为模式
+    pattern_section = document.find("行为模式", level=3)
+    if pattern_section:
+        patterns = re.findall(r'\*\*([\d\.\s]+.*?)\*\*\s*\n', pattern_section.own_text())
+        metadata["behavioral_patterns"] = [p.strip() for p in patterns]
+
+    # 提取盲区（编号列表中的加粗标题）
+    blind_section = document.find("盲区", level=3)
+    if blind_section:
+        for item in blind_section.list_items:
+            blind = re.match(r'\*\*(.+?)\*\*', item["text"])
+            if item["marker"][0].isdigit() and blind:
+                metadata["blind_spots"].append(blind.group(1).strip())
+
+    # 提取核心劣势
+    weakness_section = document.find("我的核心劣势", level=2)
+    if weakness_section:
+        weaknesses = re.findall(r'\*\*([\d\.\s]+.+?)\*\*\s+', weakness_section.own_text(stop_at_rule=True))
+        metadata["weaknesses"] = [w.strip() for w in weaknesses]
+
+    # 提取决策关键词（从"当我说"或"当我说X时"中提取）
+    triggers = re.findall(r'当(?:我)?说"?([^\"]+)"?', content)
+    metadata["triggers"] = list(set(triggers))  # 去重
+
+    # 提取高风险关键词
+    high_risk_keywords = re.findall(r'提到.*?关键词.*?[:：]\s*([^\n]+)', content)
+    if high_risk_keywords:
+        keywords = re.findall(r'["\uff1c]([\u4e00-\u9fa5A-Za-z]+)["\uff1c]', high_risk_keywords[0])
+        metadata["decision_keywords"] = keywords
+
+    # 提取改进领域（从"待改进"、"需要改进"等部分）
+    improvement_patterns = [
+        r'\*\*待改进\*\*[:：]\s*([^\n]+)',
+        r'需要改进[:：]\s*([^\n]+)',
+        r'改进建议[:：]\s*([^\n]+)'
+    ]
+    for pattern in improvement_patterns:
+        matches = re.findall(pattern, content)
+        metadata["improvement_areas"].extend([m.strip() for m in matches])
+
+    return metadata
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+画像存储 - 把手写的画像 Markdown 编译成结构化数据，供各工具统一加载
+
+存储结构（data/personas/）：
+    <文件名>-<路径哈希>.json     # 编译结果，按 schemas/persona_store_schema.json 校验
+    <文件名>-<路径哈希>.pickle   # 同一结果的二进制缓存，加载只需几毫秒
+
+加载流程：
+1. 进程内缓存：源文件修改时间和大小未变化时直接返回
+2. pickle 缓存：记录的源文件修改时间和大小一致时直接使用
+3. 源文件内容哈希未变化（例如只是 touch 了文件）时复用已有结果，只更新文件信息
+4. 否则解析 Markdown 一次，提取 version_comparer / growth_reviewer / check_risk 所需字段
+   （提取函数在 persona_markdown.py），校验后写入 JSON 和 pickle
+
+只读命令（版本对比、成长复盘、风险检查）以 save=False 加载，不写入存储。
+
+使用方法：
+    from persona_store import load_persona
+
+    persona = load_persona("interviews/my-persona-v1.2.md")
+    persona["profile"]["strengths"]
+    persona["metadata"]["blind_spots"]
+
+    # 命令行预编译
+    python persona_store.py compile ../interviews/my-persona-v1.2.md
+"""
+
+import sys
+import os
+import json
+import time
+import pickle
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from persona_markdown import extract_metadata_fields, extract_version_fields, parse_markdown
+from tenant_storage import DATA_ROOT
+from schema_check import load_schema, validate
+
+
+# 编译格式版本（提取逻辑变化时递增，旧结果自动重新编译）
+STORE_VERSION = 1
+
+STORE_DIR = DATA_ROOT / "personas"
+SCHEMA_NAME = "persona_store_schema.json"
+
+# 进程内缓存：源文件绝对路径 -> (修改时间, 大小, 编译结果)
+_memory_cache: Dict[str, tuple] = {}
+
+
+class PersonaValidationError(ValueError):
+    """编译结果不符合 schema"""
+
+
+def validate_record(record: Dict[str, Any]):
+    """校验编译结果（已安装 jsonschema 时使用 jsonschema，否则使用内置的最小校验）"""
+    errors = validate(record, load_schema(SCHEMA_NAME))
+    if errors:
+        raise PersonaValidationError("画像编译结果校验失败：" + "；".join(errors[:5]))
+
+
+def get_store_paths(source_path: Path, store_dir: Optional[Path] = None) -> tuple:
+    """源文件对应的 JSON 和 pickle 路径（同名文件按绝对路径区分）"""
+    store_dir = Path(store_dir or STORE_DIR)
+    path_hash = hashlib.sha1(str(source_path).encode('utf-8')).hexdigest()[:8]
+    stem = f"{source_path.stem}-{path_hash}"
+    return store_dir / f"{stem}.json", store_dir / f"{stem}.pickle"
+
+
+def compile_persona(source_path: str) -> Dict[str, Any]:
+    """解析画像 Markdown，生成并校验编译结果（不写入存储）"""
+    path = Path(source_path).resolve()
+    stat = path.stat()
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    document = parse_markdown(raw.decode('utf-8'))
+    record = {
+        "store_version": STORE_VERSION,
+        "compiled_at": datetime.now().isoformat(),
+        "source": {
+            "path": str(path),
+            "file": path.name,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        },
+        "profile": extract_version_fields(document),
+        "metadata": extract_metadata_fields(document),
+        "content": document.content
+    }
+
+    validate_record(record)
+    return record
+
+
+def _atomic_write(path: Path, data: bytes):
+    """先写临时文件再替换，避免并发读取到半截文件"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def save_record(record: Dict[str, Any], store_dir: Optional[Path] = None):
+    """写入 JSON 和 pickle"""
+    json_path, pickle_path = get_store_paths(Path(record["source"]["path"]), store_dir)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+
+    _atomic_write(json_path, json.dumps(record, ensure_ascii=False, indent=2).encode('utf-8'))
+    _atomic_write(pickle_path, pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _read_stored(json_path: Path, pickle_path: Path) -> Optional[Dict[str, Any]]:
+    """读取已有编译结果（优先 pickle，损坏或缺失时回退到 JSON）"""
+    if pickle_path.exists():
+        try:
+            with open(pickle_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+
+    if json_path.exists():
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    return None
+
+
+def load_persona(
+    source_path: str,
+    store_dir: Optional[Path] = None,
+    force: bool = False,
+    save: bool = True
+) -> Dict[str, Any]:
+    """
+    从存储加载画像（源文件变化时自动重新编译）
+
+    save=False 时只读取已有编译结果、不写入存储（对比、复盘等只读命令使用；
+    编译结果过期时在内存中重新编译，预编译请运行 persona_store.py compile）。
+    返回的字典由多个调用方共享，请勿修改。
+    """
+    path = Path(source_path).resolve()
+    stat = path.stat()
+    key = str(path)
+
+    cached = _memory_cache.get(key)
+    if not force and cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    json_path, pickle_path = get_store_paths(path, store_dir)
+    record = None if force else _read_stored(json_path, pickle_path)
+
+    if record and record.get("store_version") == STORE_VERSION:
+        source = record["source"]
+        if source["mtime_ns"] == stat.st_mtime_ns and source["size"] == stat.st_size:
+            if save and not pickle_path.exists():
+                save_record(record, store_dir)
+        else:
+            # 文件信息变化但内容可能没变：只在内容哈希不同时重新编译
+            with open(path, 'rb') as f:
+                sha256 = hashlib.sha256(f.read()).hexdigest()
+            if sha256 == source["sha256"]:
+                record["source"] = dict(source, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            else:
+                record = None
+            if record and save:
+                save_record(record, store_dir)
+    else:
+        record = None
+
+    if record is None:
+        record = compile_persona(str(path))
+        if save:
+            save_record(record, store_dir)
+
+    _memory_cache[key] = (stat.st_mtime_ns, stat.st_size, record)
+    return record
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="画像存储：把画像 Markdown 编译成结构化数据")
+    subparsers = parser.add_subparsers(dest="command", help="命令")
+
+    compile_parser = subparsers.add_parser("compile", help="编译画像（已是最新的画像会直接跳过）")
+    compile_parser.add_argument("paths", nargs="+", help="画像 Markdown 文件路径")
+    compile_parser.add_argument("--force", action="store_true", help="忽略缓存，强制重新编译")
+
+    show_parser = subparsers.add_parser("show", help="输出画像的编译结果（JSON）")
+    show_parser.add_argument("path", help="画像 Markdown 文件路径")
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    try:
+        if args.command == "compile":
+            for persona_path in args.paths:
+                start = time.perf_counter()
+                record = load_persona(persona_path, force=args.force)
+                elapsed = (time.perf_counter() - start) * 1000
+                json_path, _ = get_store_paths(Path(record["source"]["path"]))
+                print(f"✅ {record['source']['file']} → {json_path}（{elapsed:.1f}ms）")
+
+        elif args.command == "show":
+            record = load_persona(args.path)
+            print(json.dumps(record, ensure_ascii=False, indent=2))
+
+    except (OSError, PersonaValidationError) as e:
+        print(f"❌ 错误：{e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+LLM 提供方健康状态 - 熔断器（跨进程运行持久化）
+
+提供方宕机时，每份文档都会重新尝试同一个提供方并等满超时。这里记录每个提供方最近的调用结果：
+
+    closed     正常调用；最近 window 次调用中至少 min_requests 次、且失败率达到
+               failure_threshold 时熔断（→ open）
+    open       熔断中，直接跳过该提供方（调用方回退到下一个提供方或规则提取），
+               cooldown 秒后进入半开状态
+    half_open  只放行一个探测请求：成功 → closed，失败 → open（重新计算冷却时间）
+
+状态保存在 data/provider_health.json（可用环境变量 PROVIDER_HEALTH_PATH 指定），
+批量工具下次运行时仍然记得哪个提供方在熔断中。
+
+使用方法：
+    from provider_health import get_provider_health
+
+    health = get_provider_health()
+    if health.allow("anthropic"):
+        try:
+            result = call(...)
+            health.record_success("anthropic")
+        except Exception:
+            health.record_failure("anthropic")
+
+命令行：
+    python provider_health.py status
+    python provider_health.py reset [provider]
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tenant_storage import DATA_ROOT
+
+
+DEFAULT_HEALTH_PATH = DATA_ROOT / "provider_health.json"
+
+# 统计最近多少次调用
+DEFAULT_WINDOW = 10
+
+# 窗口内至少多少次调用才判断失败率（避免一次偶发失败就熔断）
+DEFAULT_MIN_REQUESTS = 3
+
+# 失败率达到该值时熔断
+DEFAULT_FAILURE_THRESHOLD = 0.5
+
+# 熔断后多少秒进入半开状态
+DEFAULT_COOLDOWN = 300.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """各提供方的熔断状态（线程安全，每次状态变化后写回磁盘）"""
+
+    def __init__(
+        self,
+        state_path: Optional[str] = None,
+        window: int = DEFAULT_WINDOW,
+        min_requests: int = DEFAULT_MIN_REQUESTS,
+        failure_threshold: float = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN
+    ):
+        self.state_path = Path(state_path or os.environ.get("PROVIDER_HEALTH_PATH") or DEFAULT_HEALTH_PATH)
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.providers: Dict[str, Dict[str, Any]] = self.load()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("providers", {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """先写临时文件再替换（调用方持有锁）"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"updated_at": time.time(), "providers": self.providers}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def state(self, provider: str) -> Dict[str, Any]:
+        return self.providers.setdefault(provider, {"status": CLOSED, "outcomes": [], "opened_at": None, "probe_at": None})
+
+    def is_available(self, provider: str) -> bool:
+        """是否可以调用（只查询，不占用半开探测名额）"""
+        with self.lock:
+            state = self.state(provider)
+            now = time.time()
+            if state["status"] == OPEN:
+                return now - state["opened_at"] >= self.cooldown
+            if state["status"] == HALF_OPEN:
+                return state["probe_at"] is None or now - state["probe_at"] >= self.cooldown
+            return True
+
+    def allow(self, provider: str) -> bool:
+        """
+        申请调用（冷却结束的熔断提供方转为半开状态，并占用唯一的探测名额）
+
+        探测请求迟迟没有结果（进程中断等）时，cooldown 秒后允许重新探测。
+        """
+        with self.lock:
+            state = self.state(provider)
+            now = time.time()
+
+            if state["status"] == CLOSED:
+                return True
+
+            if state["status"] == OPEN:
+                if now - state["opened_at"] < self.cooldown:
+                    return False
+                state["status"] = HALF_OPEN
+                state["probe_at"] = None
+
+            if state["probe_at"] is not None and now - state["probe_at"] < self.cooldown:
+                return False
+            state["probe_at"] = now
+            self.save()
+            return True
+
+    def record_success(self, provider: str):
+        with self.lock:
+            state = self.state(provider)
+            if state["status"] != CLOSED:
+                print(f"✅ {provider} 已恢复，解除熔断")
+                state.update(status=CLOSED, outcomes=[], opened_at=None, probe_at=None)
+            state["outcomes"] = (state["outcomes"] + [1])[-self.window:]
+            self.save()
+
+    def release(self, provider: str):
+        """
+        放弃调用，不记录结果（请求被取消，例如竞速时另一个提供方先返回）
+
+        半开状态下归还探测名额，下一个请求可以立即探测，不必等 cooldown 秒。
+        """
+        with self.lock:
+            state = self.state(provider)
+            if state["status"] == HALF_OPEN and state["probe_at"] is not None:
+                state["probe_at"] = None
+                self.save()
+
+    def record_failure(self, provider: str):
+        with self.lock:
+            state = self.state(provider)
+            state["outcomes"] = (state["outcomes"] + [0])[-self.window:]
+
+            if state["status"] == HALF_OPEN:
+                self.trip(provider, state, "探测请求失败")
+            elif state["status"] == CLOSED:
+                failures = state["outcomes"].count(0)
+                if len(state["outcomes"]) >= self.min_requests \
+                        and failures / len(state["outcomes"]) >= self.failure_threshold:
+                    self.trip(provider, state, f"最近 {len(state['outcomes'])} 次调用失败 {failures} 次")
+            self.save()
+
+    def trip(self, provider: str, state: Dict[str, Any], reason: str):
+        print(f"🔌 {provider} 已熔断（{reason}），{self.cooldown:.0f} 秒内跳过该提供方")
+        state.update(status=OPEN, opened_at=time.time(), probe_at=None)
+
+    def reset(self, provider: Optional[str] = None):
+        with self.lock:
+            if provider is None:
+                self.providers.clear()
+            else:
+                self.providers.pop(provider, None)
+            self.save()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            now = time.time()
+            return {
+                name: {
+                    "status": state["status"],
+                    "recent_failures": state["outcomes"].count(0),
+                    "recent_calls": len(state["outcomes"]),
+                    "retry_in": max(0.0, state["opened_at"] + self.cooldown - now) if state["status"] == OPEN else 0.0
+                }
+                for name, state in self.providers.items()
+            }
+
+
+_default_health: Optional[ProviderHealth] = None
+
+
+def get_provider_health() -> ProviderHealth:
+    global _default_health
+    if _default_health is None:
+        _default_health = ProviderHealth()
+    return _default_health
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM 提供方熔断状态")
+    parser.add_argument("command", choices=["status", "reset"], help="命令")
+    parser.add_argument("provider", nargs="?", help="提供方（reset 时省略表示全部）")
+    parser.add_argument("--state-path", help="状态文件（默认 data/provider_health.json）")
+
+    args = parser.parse_args()
+    health = ProviderHealth(args.state_path)
+
+    if args.command == "status":
+        summary = health.summary()
+        if not summary:
+            print("\n📭 还没有调用记录\n")
+            return
+        print()
+        for name, info in summary.items():
+            icon = {CLOSED: "🟢", HALF_OPEN: "🟡", OPEN: "🔴"}[info["status"]]
+            line = f"{icon} {name}：{info['status']}，最近 {info['recent_calls']} 次调用失败 {info['recent_failures']} 次"
+            if info["status"] == OPEN:
+                line += f"，{info['retry_in']:.0f} 秒后探测"
+            print(line)
+        print()
+
+    elif args.command == "reset":
+        health.reset(args.provider)
+        print(f"✅ 已重置 {args.provider or '全部提供方'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,24 @@
 """
 简历解析器 - 从简历中提取结构化信息（增强版）
 
-支持格式：PDF, DOCX, Markdown
+支持格式：PDF, DOCX, Markdown, 纯文本（见 document_ingest.py）
 输出格式：JSON
 
 特性：
-- 自动检测可用的 LLM API（Claude、OpenAI）
-- 使用 LLM 进行智能信息提取
+- 自动检测可用的 LLM API（Claude、OpenAI），按 templates/llm_providers.json 对冲或竞速调用，
+  取第一个通过 schema 校验的结果；连续失败的提供方熔断后直接跳过（见 provider_health.py）
+- 使用 LLM 进行智能信息提取（长简历按章节分块并发提取后合并）
 - 回退到规则提取（当 API 不可用时）
+- 批量模式：进程池解析文件，异步客户端并发调用 API（失败重试），进度清单支持断点续跑
 
 使用方法：
     python resume_parser.py resume.pdf
     python resume_parser.py resume.docx
     python resume_parser.py resume.md
 
+    # 批量处理整个目录（解析、LLM 提取、保存流水线并发执行，可中断后继续）
+    python resume_parser.py batch resumes/ --output-dir parsed/ --concurrency 4
+
 环境变量：
     ANTHROPIC_API_KEY - Claude API key
     OPENAI_API_KEY - OpenAI API key
@@ -22,78 +27,65 @@
 
 import sys
 import json
-import re
 import os
+import time
+import random
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-
-
-def parse_markdown(file_path: str) -> str:
-    """解析 Markdown 文件"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return f.read()
-
-
-def parse_docx(file_path: str) -> str:
-    """解析 DOCX 文件"""
-    try:
-        from docx import Document
-        doc = Document(file_path)
-        return '\n'.join([para.text for para in doc.paragraphs])
-    except ImportError:
-        print("错误：需要安装 python-docx")
-        print("请运行：pip install python-docx")
-        sys.exit(1)
-
-
-def parse_pdf(file_path: str) -> str:
-    """解析 PDF 文件"""
-    try:
-        import PyPDF2
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text()
-        return text
-    except ImportError:
-        print("错误：需要安装 PyPDF2")
-        print("请运行：pip install PyPDF2")
-        sys.exit(1)
-
-
-def parse_resume(file_path: str) -> str:
-    """根据文件扩展名选择解析方法"""
-    path = Path(file_path)
-
-    if not path.exists():
-        raise FileNotFoundError(f"文件不存在：{file_path}")
-
-    suffix = path.suffix.lower()
-
-    if suffix == '.md' or suffix == '.markdown':
-        return parse_markdown(file_path)
-    elif suffix == '.docx':
-        return parse_docx(file_path)
-    elif suffix == '.pdf':
-        return parse_pdf(file_path)
-    else:
-        raise ValueError(f"不支持的文件格式：{suffix}")
-
-
-def extract_with_claude(text: str) -> Optional[Dict[str, Any]]:
-    """使用 Claude API 提取简历信息"""
-    try:
-        import anthropic
+from typing import Dict, Any, Callable, List, Optional
+
+from document_ingest import MissingDependencyError, read_text, supported_suffixes
+from llm_cache import cached_extract_async
+from chunked_extraction import extract_chunked_async
+from resume_rules import extract_resume_rules
+from llm_orchestrator import STRATEGIES, ExtractionOrchestrator, create_providers, load_provider_config
+from schema_check import load_schema, validate
+from provider_health import get_provider_health
+from llm_clients import format_stats, reserve_stream_threads
+from streaming_json import describe
+from decision_tracker import non_negative_int, positive_int
+
+
+# 提示词版本（修改提取提示词时递增，使旧的缓存结果失效）
+RESUME_PROMPT_VERSION = "resume-v1"
+
+# LLM 提取结果的 schema（编排器只接受通过校验的结果）
+RESUME_SCHEMA_NAME = "resume_extraction_schema.json"
+
+# 长简历分块提取后的合并规则（见 chunked_extraction.merge_results）
+RESUME_MERGE_RULES = {
+    "basics": "fields",
+    "summary": "first",
+    "work_history": ("company", "position", "start_date"),
+    "education": ("school", "major", "degree"),
+    "projects": ("name",),
+    "skills": "unique",
+    "awards": "unique",
+    "languages": "unique"
+}
+
+# 批量进度清单文件（保存在输出目录中）
+BATCH_MANIFEST_FILENAME = ".batch_manifest.json"
+
+# 重试退避的基准时间（秒），第 n 次重试等待 RETRY_BASE_DELAY * 2^n 加随机抖动
+RETRY_BASE_DELAY = 1.0
+
+
+def parse_resume(file_path: str, pdf_workers: Optional[int] = None) -> str:
+    """
+    读取简历文本（格式见 document_ingest，pdf_workers 为 PDF 并行提取的进程数）
 
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        if not api_key:
-            return None
+    缺少依赖时抛出 MissingDependencyError，不支持的格式抛出 UnsupportedFormatError。
+    """
+    return read_text(file_path, workers=pdf_workers)
 
-        client = anthropic.Anthropic(api_key=api_key)
 
-        prompt = f"""请从以下简历文本中提取结构化信息，以 JSON 格式返回。
+def build_resume_prompt(text: str) -> str:
+    """简历提取提示词（Claude 和 OpenAI 共用）"""
+    return f"""请从以下简历文本中提取结构化信息，以 JSON 格式返回。
 
 简历文本：
 {text}
@@ -144,177 +136,19 @@ def extract_with_claude(text: str) -> Optional[Dict[str, Any]]:
 
 只返回 JSON，不要有其他文字。"""
 
-        message = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=8192,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        response_text = message.content[0].text
-
-        # 尝试解析 JSON
-        # 移除可能的 markdown 代码块标记
-        response_text = response_text.strip()
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
-
-        return json.loads(response_text)
-
-    except Exception as e:
-        print(f"⚠️  Claude API 调用失败：{e}")
-        return None
-
-
-def extract_with_openai(text: str) -> Optional[Dict[str, Any]]:
-    """使用 OpenAI API 提取简历信息"""
-    try:
-        import openai
-
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if not api_key:
-            return None
-
-        client = openai.OpenAI(api_key=api_key)
-
-        prompt = f"""请从以下简历文本中提取结构化信息，以 JSON 格式返回。
-
-简历文本：
-{text}}
-
-请提取以下信息（如果找不到就留空或返回空数组）：
-{{
-  "basics": {{
-    "name": "姓名",
-    "gender": "性别",
-    "age": "年龄",
-    "email": "邮箱",
-    "phone": "电话",
-    "location": "所在地"
-  }},
-  "summary": "个人简介（一句话）",
-  "work_history": [
-    {{
-      "company": "公司名称",
-      "position": "职位",
-      "department": "部门",
-      "start_date": "开始时间",
-      "end_date": "结束时间",
-      "location": "地点",
-      "description": "工作描述（数组，每条一个要点）"
-    }}
-  ],
-  "education": [
-    {{
-      "school": "学校名称",
-      "major": "专业",
-      "degree": "学位",
-      "start_date": "开始时间",
-      "end_date": "结束时间"
-    }}
-  ],
-  "skills": ["技能1", "技能2", ...],
-  "projects": [
-    {{
-      "name": "项目名称",
-      "description": "项目描述",
-      "role": "角色",
-      "technologies": ["技术1", "技术2"]
-    }}
-  ],
-  "awards": ["奖项1", "奖项2", ...],
-  "languages": ["语言1", "语言2", ...]
-}}
-
-只返回 JSON，不要有其他文字。"""
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-            max_tokens=4096
-        )
-
-        response_text = response.choices[0].message.content
-
-        # 尝试解析 JSON
-        response_text = response_text.strip()
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
-
-        return json.loads(response_text)
-
-    except Exception as e:
-        print(f"⚠️  OpenAI API 调用失败：{e}")
-        return None
-
 
 def extract_with_rules(text: str) -> Dict[str, Any]:
     """
-    使用规则和正则表达式从简历文本中提取关键信息
+    使用规则从简历文本中提取关键信息（LLM API 不可用时使用）
 
-    这是基础实现，当 LLM API 不可用时使用
+    单遍扫描的状态机，章节标题由关键词自动机识别，见 resume_rules.py。
     """
     info = {
         "raw_text": text,
         "extracted_at": datetime.now().isoformat(),
-        "extraction_method": "rules",
-        "basics": {},
-        "work_history": [],
-        "education": [],
-        "skills": [],
-        "projects": []
+        "extraction_method": "rules"
     }
-
-    lines = text.split('\n')
-    current_section = None
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # 识别章节标题（简单规则：常见标题）
-        if any(keyword in line for keyword in ['工作经历', '工作体验', '经历', 'Work Experience', 'Experience', '职业经历']):
-            current_section = 'work'
-            continue
-        elif any(keyword in line for keyword in ['教育', '学历', 'Education']):
-            current_section = 'education'
-            continue
-        elif any(keyword in line for keyword in ['技能', '专长', 'Skills', '技术栈']):
-            current_section = 'skills'
-            continue
-        elif any(keyword in line for keyword in ['项目', 'Project', 'Projects']):
-            current_section = 'projects'
-            continue
-
-        # 提取信息（简化版）
-        if current_section == 'work':
-            parts = line.split()
-            if len(parts) >= 2:
-                info["work_history"].append({
-                    "company": parts[0],
-                    "position": parts[1] if len(parts) > 1 else "",
-                    "description": line
-                })
-        elif current_section == 'skills':
-            skills = re.split(r'[,、|]', line)
-            info["skills"].extend([s.strip() for s in skills if s.strip()])
-
-    # 尝试提取基本信息（名字、邮箱、电话）
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    if emails:
-        info["basics"]["email"] = emails[0]
-
-    phone_pattern = r'1[3-9]\d{9}'
-    phones = re.findall(phone_pattern, text)
-    if phones:
-        info["basics"]["phone"] = phones[0]
-
+    info.update(extract_resume_rules(text))
     return info
 
 
@@ -361,6 +195,330 @@ def print_summary(info: Dict[str, Any]):
             print(f"    • {edu.get('school', 'N/A')} - {edu.get('major', 'N/A')}")
 
 
+def file_sha256(file_path: str) -> str:
+    """文件内容的 SHA-256（批量模式判断文件是否变化，在进程池中运行）"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_resume_for_batch(file_path: str) -> str:
+    """批量模式的解析任务（在进程池中运行，文件级已并行，PDF 不再开子进程；缺少依赖时只让当前文件失败）"""
+    return parse_resume(file_path, pdf_workers=1)
+
+
+def create_async_providers(
+    config: Optional[Dict[str, Any]] = None,
+    on_member: Optional[Callable[[str, str, Any], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    按提供方配置（templates/llm_providers.json）创建异步 LLM 提供方
+
+    每个提供方：配置中的字段加上 "call"，call 为协程函数，失败时抛出异常。
+    未设置 API key 的提供方跳过；客户端和连接池在整个进程中复用（见 llm_clients.py）。
+    模型输出流式解析，每个顶层字段完整时回调 on_member(提供方名称, 字段名, 值)。
+    """
+    return create_providers(config or load_provider_config(), build_resume_prompt, on_member)
+
+
+def with_chunking_and_cache(
+    provider: Dict[str, Any],
+    schema: Optional[Dict[str, Any]] = None,
+    limit: Optional[asyncio.Semaphore] = None
+) -> Dict[str, Any]:
+    """
+    包装提供方的调用：长简历分块并发提取，每块结果按文本哈希缓存（重试时已成功的块直接命中缓存）
+
+    传入 schema 时每块结果先校验再缓存，未通过校验的回复不会被缓存，重试时重新请求。
+    传入 limit 时每次 API 请求（每一块、每个对冲 / 竞速的提供方）都先取得信号量，
+    所有文档共享同一个 limit，同时进行的请求数不超过它的初始值；命中缓存的块不占用名额。
+    """
+    check = (lambda result: validate(result, schema)) if schema else None
+
+    async def request(chunk: str) -> Optional[Dict[str, Any]]:
+        if limit is None:
+            return await provider["call"](chunk)
+        async with limit:
+            return await provider["call"](chunk)
+
+    async def call(text: str) -> Optional[Dict[str, Any]]:
+        return await extract_chunked_async(
+            text,
+            lambda chunk: cached_extract_async(
+                provider["name"], provider["model"], RESUME_PROMPT_VERSION, chunk, request,
+                validate=check
+            ),
+            RESUME_MERGE_RULES
+        )
+
+    return {**provider, "call": call}
+
+
+def create_orchestrator(
+    providers: List[Dict[str, Any]],
+    config: Optional[Dict[str, Any]] = None,
+    strategy: Optional[str] = None,
+    limit: Optional[asyncio.Semaphore] = None
+) -> ExtractionOrchestrator:
+    """
+    创建简历提取编排器（策略和对冲延迟取自配置，strategy 可以覆盖配置；熔断状态跨运行共享）
+
+    limit 为所有 API 请求共享的信号量（见 with_chunking_and_cache），批量模式用它限制并发请求数。
+    """
+    config = config or load_provider_config()
+    schema = load_schema(RESUME_SCHEMA_NAME)
+    return ExtractionOrchestrator(
+        [with_chunking_and_cache(provider, schema, limit) for provider in providers],
+        strategy or config.get("strategy", "hedge"),
+        config.get("hedge_delay", 8.0),
+        schema,
+        get_provider_health()
+    )
+
+
+async def extract_with_providers(
+    text: str,
+    orchestrator: ExtractionOrchestrator,
+    retries: int = 2
+) -> tuple:
+    """
+    通过编排器提取（对冲 / 竞速各提供方），所有提供方都失败时按指数退避整体重试 retries 次
+
+    返回 (提取结果, 提取方式)；全部失败时返回 (None, None)。
+    """
+    for attempt in range(retries + 1):
+        result, label = await orchestrator.extract(text)
+        if result is not None:
+            return result, label
+        if attempt < retries and orchestrator.available():
+            await asyncio.sleep(RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random() * 0.5))
+
+    return None, None
+
+
+def load_batch_manifest(output_dir: Path) -> Dict[str, Any]:
+    """加载批量进度清单"""
+    manifest_path = output_dir / BATCH_MANIFEST_FILENAME
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {"files": {}}
+
+
+def save_batch_manifest(output_dir: Path, manifest: Dict[str, Any]):
+    """保存批量进度清单（先写临时文件再替换，中断时不会留下半截清单）"""
+    manifest_path = output_dir / BATCH_MANIFEST_FILENAME
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def batch_output_names(files: List[Path]) -> Dict[str, str]:
+    """
+    每个文件的输出文件名：<文件名>_parsed.json
+
+    同名不同格式的文件（resume.pdf 和 resume.docx）加上扩展名区分：resume_pdf_parsed.json、
+    resume_docx_parsed.json，避免互相覆盖。
+    """
+    stem_counts: Dict[str, int] = {}
+    for file in files:
+        stem_counts[file.stem] = stem_counts.get(file.stem, 0) + 1
+    return {
+        file.name: f"{file.stem}_{file.suffix.lstrip('.').lower()}_parsed.json" if stem_counts[file.stem] > 1
+        else f"{file.stem}_parsed.json"
+        for file in files
+    }
+
+
+async def run_batch_async(
+    input_dir: str,
+    output_dir: Optional[str] = None,
+    concurrency: int = 4,
+    workers: Optional[int] = None,
+    retries: int = 2,
+    use_llm: bool = True,
+    providers: Optional[List[Dict[str, Any]]] = None,
+    strategy: Optional[str] = None,
+    providers_config: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    批量解析目录中的简历
+
+    流水线：进程池计算哈希并解析文件（CPU 密集）→ 有界队列 → 异步调用 LLM（最多 concurrency 个并发请求）→ 保存结果。
+    文件逐个进入流水线，不会一次把整个目录读入内存。每个文件完成后更新进度清单，内容未变化且已完成的文件在下次运行时跳过。
+    providers 默认按 providers_config（默认 templates/llm_providers.json）创建，strategy 覆盖配置中的编排策略。
+    """
+    input_path = Path(input_dir)
+    output_path = Path(output_dir) if output_dir else input_path / "parsed"
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    config = load_provider_config(providers_config)
+    if providers is None:
+        providers = create_async_providers(config) if use_llm else []
+    # 限制的是 API 请求（分块的每一块、对冲 / 竞速的每个提供方），不是文档数；
+    # 每个请求都有自己的读取线程，不会在线程池里排队耗掉超时
+    reserve_stream_threads(concurrency)
+    orchestrator = create_orchestrator(providers, config, strategy, asyncio.Semaphore(concurrency))
+
+    files = sorted(p for p in input_path.iterdir() if p.is_file() and p.suffix.lower() in supported_suffixes())
+    output_names = batch_output_names(files)
+    manifest = load_batch_manifest(output_path)
+    entries = manifest.setdefault("files", {})
+
+    print(f"📂 共 {len(files)} 个文件（内容未变化且已完成的文件自动跳过）")
+    if providers:
+        print(f"🔍 LLM 提供方：{' → '.join(p['label'] for p in providers)}"
+              f"（{orchestrator.strategy}，最多 {concurrency} 个并发请求）")
+    else:
+        print("⚠️  LLM API 不可用，使用规则提取（效果较差）")
+
+    loop = asyncio.get_running_loop()
+    parse_slots = workers or os.cpu_count() or 1
+    # 解析好的文本排队等待提取，队列有界：内存中最多 parse_slots + 2 × concurrency 份文本，与目录大小无关
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    remaining = iter(files)
+    done_count = 0
+    skipped = 0
+    failed = []
+
+    def finish(file: Path, entry: Dict[str, Any], error: Optional[Exception] = None):
+        """记录一个文件的结果并更新进度清单"""
+        if error is not None:
+            entry["error"] = str(error)
+            failed.append(file.name)
+            print(f"  ❌ [{skipped + done_count + len(failed)}/{len(files)}] {file.name}：{error}")
+        entries[file.name] = entry
+        save_batch_manifest(output_path, manifest)
+
+    async def parse_stage(pool: ProcessPoolExecutor):
+        """计算哈希、跳过已完成的文件、解析文本（都在进程池中，不阻塞事件循环）"""
+        nonlocal skipped
+        for file in remaining:
+            start = time.monotonic()
+            entry = {"sha256": None, "status": "failed", "attempted_at": datetime.now().isoformat()}
+            try:
+                entry["sha256"] = await loop.run_in_executor(pool, file_sha256, str(file))
+                previous = entries.get(file.name)
+                if previous and previous.get("status") == "done" and previous.get("sha256") == entry["sha256"] \
+                        and (output_path / previous["output"]).exists():
+                    skipped += 1
+                    continue
+                text = await loop.run_in_executor(pool, parse_resume_for_batch, str(file))
+            except Exception as e:
+                finish(file, entry, e)
+                continue
+            await parsed.put((file, entry, text, start))
+
+    async def extract_stage():
+        """从队列取出解析好的文本，调用 LLM（或规则）提取并保存结果"""
+        nonlocal done_count
+        while True:
+            item = await parsed.get()
+            if item is None:
+                return
+            file, entry, text, start = item
+            try:
+                info, extraction_method = None, None
+                if providers:
+                    info, extraction_method = await extract_with_providers(text, orchestrator, retries)
+
+                if info is None:
+                    info = extract_with_rules(text)
+                    extraction_method = "规则提取"
+
+                info['raw_text'] = text
+                info['extracted_at'] = datetime.now().isoformat()
+                info['extraction_method'] = extraction_method
+                info['source_file'] = file.name
+
+                output_name = output_names[file.name]
+                with open(output_path / output_name, 'w', encoding='utf-8') as f:
+                    json.dump(info, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                finish(file, entry, e)
+                continue
+
+            entry.update(status="done", output=output_name, extraction_method=extraction_method)
+            done_count += 1
+            print(f"  ✅ [{skipped + done_count + len(failed)}/{len(files)}] {file.name}"
+                  f"（{extraction_method}，{time.monotonic() - start:.1f}s）")
+            finish(file, entry)
+
+    # 三个阶段组成流水线：parse_slots 个解析任务 → 有界队列 → concurrency 个提取任务
+    with ProcessPoolExecutor(max_workers=parse_slots) as pool:
+        extractors = [asyncio.ensure_future(extract_stage()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*(parse_stage(pool) for _ in range(parse_slots)))
+            for _ in extractors:
+                await parsed.put(None)
+            await asyncio.gather(*extractors)
+        finally:
+            for task in extractors:
+                task.cancel()
+
+    return {
+        "total": len(files),
+        "processed": done_count,
+        "skipped": skipped,
+        "failed": failed,
+        "output_dir": str(output_path)
+    }
+
+
+def run_batch(input_dir: str, **kwargs) -> Dict[str, Any]:
+    """批量解析目录中的简历（同步入口，参数见 run_batch_async）"""
+    return asyncio.run(run_batch_async(input_dir, **kwargs))
+
+
+def batch_main(argv: List[str]):
+    """batch 子命令"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="resume_parser.py batch", description="批量解析目录中的简历")
+    parser.add_argument("input_dir", help="简历目录（支持 PDF、DOCX、Markdown、纯文本）")
+    parser.add_argument("--output-dir", help="输出目录（默认 <简历目录>/parsed）")
+    parser.add_argument("--concurrency", type=positive_int, default=4, help="最多同时进行的 LLM 请求数（默认 4）")
+    parser.add_argument("--workers", type=positive_int, help="解析文件的进程数（默认 CPU 核数）")
+    parser.add_argument("--retries", type=non_negative_int, default=2, help="所有提供方都失败后的重试次数（默认 2）")
+    parser.add_argument("--strategy", choices=STRATEGIES, help="编排策略：sequential / hedge / race（默认取提供方配置）")
+    parser.add_argument("--providers-config", help="提供方配置文件（默认 templates/llm_providers.json）")
+    parser.add_argument("--no-llm", action="store_true", help="不调用 LLM，只使用规则提取")
+
+    args = parser.parse_args(argv)
+
+    if not Path(args.input_dir).is_dir():
+        print(f"❌ 目录不存在：{args.input_dir}")
+        sys.exit(1)
+
+    start = time.monotonic()
+    summary = run_batch(
+        args.input_dir,
+        output_dir=args.output_dir,
+        concurrency=args.concurrency,
+        workers=args.workers,
+        retries=args.retries,
+        use_llm=not args.no_llm,
+        strategy=args.strategy,
+        providers_config=args.providers_config
+    )
+
+    print(f"\n📊 批量处理完成（{time.monotonic() - start:.1f}s）：成功 {summary['processed']} 个，"
+          f"跳过 {summary['skipped']} 个，失败 {len(summary['failed'])} 个")
+    print(f"   输出目录：{summary['output_dir']}")
+    if format_stats():
+        print(f"   API 连接：{format_stats()}")
+
+    if summary["failed"]:
+        print("   失败的文件可以修复后重新运行同一命令，已完成的文件会自动跳过")
+        sys.exit(1)
+
+
 def main():
     if len(sys.argv) < 2:
         print("使用方法：")
@@ -369,11 +527,17 @@ def main():
         print("  python resume_parser.py resume.pdf")
         print("  python resume_parser.py resume.docx")
         print("  python resume_parser.py resume.md")
+        print("  python resume_parser.py batch resumes/ --output-dir parsed/")
         print("\n环境变量（可选，用于增强提取）：")
         print("  ANTHROPIC_API_KEY - Claude API key")
         print("  OPENAI_API_KEY - OpenAI API key")
         sys.exit(1)
 
+    # 名为 batch 的文件（没有其他参数时）按单个文件解析
+    if sys.argv[1] == "batch" and (len(sys.argv) > 2 or not Path("batch").is_file()):
+        batch_main(sys.argv[2:])
+        return
+
     resume_file = sys.argv[1]
 
     try:
@@ -385,14 +549,19 @@ def main():
         # 2. 尝试使用 LLM API 提取信息
         print("\n🔍 正在提取关键信息...")
 
-        # 尝试 Claude API
-        info = extract_with_claude(text)
-        extraction_method = "Claude API"
+        # 按提供方配置对冲 / 竞速调用 Claude 和 OpenAI，取第一个通过校验的结果
+        # 流式解析，字段一完整就显示，不必等整个输出结束
+        start = time.monotonic()
 
-        # 如果 Claude 失败，尝试 OpenAI
-        if info is None:
-            info = extract_with_openai(text)
-            extraction_method = "OpenAI API"
+        def show_member(label: str, key: str, value: Any):
+            print(f"  📥 {time.monotonic() - start:.1f}s {key}：{describe(value)}（{label}）")
+
+        config = load_provider_config()
+        providers = create_async_providers(config, show_member)
+        info, extraction_method = None, None
+        if providers:
+            orchestrator = create_orchestrator(providers, config)
+            info, extraction_method = asyncio.run(orchestrator.extract(text))
 
         # 如果 LLM 都失败，使用规则提取
         if info is None:
@@ -418,6 +587,9 @@ def main():
         if extraction_method == "规则提取":
             print("   建议：设置 ANTHROPIC_API_KEY 或 OPENAI_API_KEY 环境变量以获得更好的提取效果")
 
+    except MissingDependencyError as e:
+        print(f"❌ 错误：{e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ 错误：{e}")
         import traceback
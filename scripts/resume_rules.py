@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+简历规则提取 - 不调用 LLM 的离线提取（单遍扫描的状态机）
+
+没有 API key 时 resume_parser 使用这里的规则提取。对文本逐行扫描一遍：
+
+- 章节标题：所有标题关键词编译成一个 KeywordAutomaton，只检查短行，
+  多个关键词命中时取最长的（"项目经历" 优先于 "经历"）
+- 状态机：当前章节决定每一行的处理方式
+    basics     姓名、邮箱、电话、所在地（第一个章节标题之前）
+    work       带时间段的行开始一段新经历，从中识别公司、职位；其余行作为描述
+    education  带时间段或学校名的行开始一段新经历，从中识别学校、学位、专业
+    skills     按分隔符切分技能（去掉 "编程语言：" 之类的标签）
+    projects   带时间段的行或短行开始一个新项目
+    summary / awards / languages
+- 正则表达式在模块加载时编译一次；邮箱、电话只在可能出现的行上匹配
+
+使用方法：
+    from resume_rules import extract_resume_rules
+
+    info = extract_resume_rules(text)
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from keyword_automaton import KeywordAutomaton
+from similarity import normalize_text
+
+
+# 章节标题关键词 → 章节
+SECTION_HEADERS = {
+    "work": (
+        "工作经历", "工作经验", "工作履历", "工作体验", "职业经历", "实习经历", "任职经历", "经历",
+        "Work Experience", "Professional Experience", "Employment", "Experience", "Work History"
+    ),
+    "education": ("教育背景", "教育经历", "学历", "教育", "Education", "Academic Background"),
+    "skills": ("专业技能", "技能", "专长", "技术栈", "技术能力", "Skills", "Technical Skills", "Tech Stack"),
+    "projects": ("项目经历", "项目经验", "项目", "Projects", "Project Experience", "Project"),
+    "summary": ("自我评价", "个人简介", "个人总结", "自我介绍", "Summary", "Profile", "About Me"),
+    "awards": ("获奖情况", "获奖经历", "荣誉奖项", "荣誉", "获奖", "证书", "Awards", "Honors", "Certifications"),
+    "languages": ("语言能力", "外语能力", "语言", "Languages"),
+    "basics": ("基本信息", "个人信息", "联系方式", "Contact", "Personal Information")
+}
+
+# 去掉标题修饰（Markdown #、粗体、括号、冒号、序号等）后不超过该长度的行才可能是标题
+HEADER_MAX_CHARS = 20
+
+HEADER_STRIP = " \t#*_=【】[]（）()：:|-—·•●◆■▪"
+HEADER_NUMBER_PATTERN = re.compile(r'^(?:[一二三四五六七八九十]+|\d{1,2})\s*[、.．]\s*')
+
+# 时间段：2020.03 - 2022.06、2019年9月-至今、2018/07–Present、2015 - 2019
+DATE = r'(\d{4})(?:\s*[./年-]\s*(\d{1,2})\s*月?)?'
+DATE_RANGE_PATTERN = re.compile(
+    DATE + r'\s*(?:-|–|—|~|～|至|到|to)\s*(?:' + DATE + r'|(至今|现在|今|Present|present|Now|now|Current|current))'
+)
+
+EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE_PATTERN = re.compile(r'(?<!\d)(?:\+?86[-\s]?)?(1[3-9]\d[-\s]?\d{4}[-\s]?\d{4})(?!\d)')
+LABEL_PATTERN = re.compile(r'^(姓名|Name|所在地|现居地?|居住地|城市|地址|Location|性别|Gender|年龄|Age)\s*[:：]\s*(.+)$', re.IGNORECASE)
+
+LABEL_FIELDS = {
+    "姓名": "name", "name": "name",
+    "所在地": "location", "现居": "location", "现居地": "location", "居住地": "location",
+    "城市": "location", "地址": "location", "location": "location",
+    "性别": "gender", "gender": "gender",
+    "年龄": "age", "age": "age"
+}
+
+# 简历标题行，不会是姓名（规范化：去掉空白和标点、英文转小写）
+RESUME_TITLES = frozenset((
+    "简历", "个人简历", "求职简历", "中文简历", "英文简历", "履历", "个人履历", "简历表", "个人简历表",
+    "resume", "myresume", "cv", "curriculumvitae", "résumé"
+))
+
+# 行内字段分隔符（单个空格只在两个中文字段之间才算分隔，"Software Engineer" 不拆开）
+FIELD_SPLIT_PATTERN = re.compile(r'\s*[|｜/／,，·•]\s*|\s{2,}|\t|(?<=[\u4e00-\u9fff）)])\s(?=[\u4e00-\u9fff（(])')
+SKILL_SPLIT_PATTERN = re.compile(r'\s*[,，、|｜/；;]\s*')
+SKILL_LABEL_PATTERN = re.compile(r'^[^:：]{1,12}[:：]\s*')
+BULLET_CHARS = set("-*+•●◆■▪0123456789")
+BULLET_PATTERN = re.compile(r'^\s*(?:[-*+](?=\s)|[•●◆■▪]|\d{1,2}[.、)）](?!\d))\s*')
+
+COMPANY_SUFFIXES = (
+    "公司", "集团", "科技", "银行", "研究院", "研究所", "事务所", "工作室", "中心", "医院",
+    "Inc", "Ltd", "LLC", "Co.", "Corp", "Corporation", "GmbH", "Group", "Technologies"
+)
+POSITION_KEYWORDS = (
+    "工程师", "经理", "总监", "主管", "专员", "负责人", "架构师", "设计师", "分析师", "顾问", "实习生",
+    "助理", "总裁", "合伙人", "研究员", "开发", "运营", "产品", "组长", "主任",
+    "Engineer", "Manager", "Director", "Developer", "Lead", "Intern", "Analyst", "Designer",
+    "Consultant", "Architect", "CEO", "CTO", "CFO", "COO", "Scientist"
+)
+SCHOOL_KEYWORDS = ("大学", "学院", "学校", "中学", "University", "College", "Institute", "School")
+DEGREE_KEYWORDS = (
+    "博士", "硕士", "研究生", "本科", "学士", "大专", "专科", "MBA", "EMBA",
+    "PhD", "Ph.D", "Master", "Bachelor", "Doctor", "Associate"
+)
+
+
+def build_automaton(table: Dict[str, tuple]) -> KeywordAutomaton:
+    automaton = KeywordAutomaton()
+    for value, keywords in table.items():
+        for keyword in keywords:
+            automaton.add(keyword, value)
+    return automaton.build()
+
+
+HEADER_AUTOMATON = build_automaton(SECTION_HEADERS)
+
+# 标题关键词必须在行首或行尾：先用首尾字符过滤，绝大多数正文行不进入自动机
+HEADER_FIRST_CHARS = {k[0].lower() for keywords in SECTION_HEADERS.values() for k in keywords}
+HEADER_LAST_CHARS = {k[-1].lower() for keywords in SECTION_HEADERS.values() for k in keywords}
+HEADER_REJECT_PATTERN = re.compile(r'[，。；,;]')
+FIELD_AUTOMATON = build_automaton({
+    "company": COMPANY_SUFFIXES,
+    "position": POSITION_KEYWORDS,
+    "school": SCHOOL_KEYWORDS,
+    "degree": DEGREE_KEYWORDS
+})
+
+
+def detect_header(line: str) -> Optional[str]:
+    """
+    判断一行是否是章节标题，返回章节名
+
+    多个关键词命中时取最长的；关键词必须在行首或行尾（"工作经历 Work Experience"、"我的项目"），
+    且除关键词外只有少量文字，避免把 "负责项目管理" 这样的正文当成标题。
+    """
+    core = line.strip(HEADER_STRIP)
+    if core and (core[0].isdigit() or core[0] in "一二三四五六七八九十"):
+        core = HEADER_NUMBER_PATTERN.sub("", core).strip(HEADER_STRIP)
+    if not core or len(core) > HEADER_MAX_CHARS:
+        return None
+    if core[0].lower() not in HEADER_FIRST_CHARS and core[-1].lower() not in HEADER_LAST_CHARS:
+        return None
+    if HEADER_REJECT_PATTERN.search(core):
+        return None
+
+    best = None
+    for start, keyword, section in HEADER_AUTOMATON.iter_matches(core):
+        if start != 0 and start + len(keyword) != len(core):
+            continue
+        if best is None or len(keyword) > len(best[0]):
+            best = (keyword, section)
+    if best is None or len(core) - len(best[0]) > max(6, len(best[0])):
+        return None
+    return best[1]
+
+
+def format_date(year: Optional[str], month: Optional[str]) -> Optional[str]:
+    if not year:
+        return None
+    return f"{year}-{int(month):02d}" if month else year
+
+
+def parse_date_range(line: str):
+    """找出行内的时间段，返回 (开始, 结束, 去掉时间段后的文本)；没有时间段时返回 None"""
+    match = DATE_RANGE_PATTERN.search(line)
+    if not match:
+        return None
+    start = format_date(match.group(1), match.group(2))
+    end = format_date(match.group(3), match.group(4)) or "至今"
+    rest = (line[:match.start()] + " " + line[match.end():]).strip()
+    return start, end, rest
+
+
+def classify_fields(text: str) -> Dict[str, List[str]]:
+    """把一行切成字段，按关键词归类为 company / position / school / degree / other"""
+    fields: Dict[str, List[str]] = {"company": [], "position": [], "school": [], "degree": [], "other": []}
+    for token in FIELD_SPLIT_PATTERN.split(text.strip(" -—–|｜")):
+        token = token.strip(" ()（）[]【】*_")
+        if not token:
+            continue
+        kinds = {value for _, _, value in FIELD_AUTOMATON.iter_matches(token)}
+        # 同时带学校和公司后缀（"XX大学"）时按学校处理；公司优先于职位（"XX科技产品部"）
+        for kind in ("degree", "school", "company", "position"):
+            if kind in kinds:
+                fields[kind].append(token)
+                break
+        else:
+            fields["other"].append(token)
+    return fields
+
+
+def start_work_entry(text: str, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+    fields = classify_fields(text)
+    company = (fields["company"] or fields["school"] or fields["other"] or [None])[0]
+    position = (fields["position"] or [o for o in fields["other"] if o != company] or [None])[0]
+    return {"company": company, "position": position, "start_date": start, "end_date": end, "description": []}
+
+
+def start_education_entry(text: str, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+    fields = classify_fields(text)
+    school = (fields["school"] or fields["company"] or fields["other"] or [None])[0]
+    major = ([o for o in fields["other"] + fields["position"] if o != school] or [None])[0]
+    degree = (fields["degree"] or [None])[0]
+    return {"school": school, "major": major, "degree": degree, "start_date": start, "end_date": end}
+
+
+def fill_missing(entry: Dict[str, Any], text: str, kind: str):
+    """经历的第二行常常是职位 / 专业，补全第一行没有识别出的字段"""
+    template = start_work_entry(text, None, None) if kind == "work" else start_education_entry(text, None, None)
+    filled = False
+    for key, value in template.items():
+        if value and not entry.get(key) and key not in ("start_date", "end_date", "description"):
+            entry[key] = value
+            filled = True
+    return filled
+
+
+def is_resume_title(line: str) -> bool:
+    """“个人简历”、“Resume”、“CV” 这类标题行"""
+    return normalize_text(line) in RESUME_TITLES
+
+
+def extract_resume_rules(text: str) -> Dict[str, Any]:
+    """单遍扫描提取简历信息（输出字段与 LLM 提取一致）"""
+    basics: Dict[str, Any] = {}
+    summary: List[str] = []
+    work_history: List[Dict[str, Any]] = []
+    education: List[Dict[str, Any]] = []
+    skills: List[str] = []
+    projects: List[Dict[str, Any]] = []
+    awards: List[str] = []
+    languages: List[str] = []
+    seen_skills = set()
+
+    section = "basics"
+    entry: Optional[Dict[str, Any]] = None
+    labelled = set()
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        # 邮箱、电话可能出现在任何位置（页眉、页脚）
+        if "email" not in basics and "@" in line:
+            email = EMAIL_PATTERN.search(line)
+            if email:
+                basics["email"] = email.group(0)
+        if "phone" not in basics and "1" in line:
+            phone = PHONE_PATTERN.search(line)
+            if phone:
+                basics["phone"] = re.sub(r'[-\s]', '', phone.group(1))
+
+        # 符号列表项不会是章节标题（编号行可能是 "1. 工作经历" 这样的标题）
+        content = BULLET_PATTERN.sub("", line) if line[0] in BULLET_CHARS else line
+        is_bullet = content != line
+
+        header = None if is_bullet and not line[0].isdigit() else detect_header(line)
+        if header:
+            section = header
+            entry = None
+            continue
+
+        if section == "basics":
+            label = LABEL_PATTERN.match(content)
+            if label:
+                # 带标签的字段覆盖从首行猜出的姓名（同一字段有多个标签时以第一个为准）
+                field = LABEL_FIELDS.get(label.group(1).lower()) or LABEL_FIELDS.get(label.group(1))
+                if field and field not in labelled:
+                    basics[field] = label.group(2).strip()
+                    labelled.add(field)
+            elif "name" not in basics and "@" not in content and not any(c.isdigit() for c in content) \
+                    and len(content.strip("# ")) <= 20 and not is_resume_title(content):
+                basics["name"] = content.strip("# ").strip()
+
+        elif section == "work":
+            date_range = parse_date_range(content)
+            if date_range and not is_bullet:
+                entry = start_work_entry(date_range[2], date_range[0], date_range[1])
+                work_history.append(entry)
+            elif entry is None and not is_bullet and classify_fields(content)["company"]:
+                # 没有时间段的简历：带公司名的行开始一段新经历
+                entry = start_work_entry(content, None, None)
+                work_history.append(entry)
+            elif entry is not None:
+                if is_bullet or entry["description"] or not fill_missing(entry, content, "work"):
+                    entry["description"].append(content)
+
+        elif section == "education":
+            date_range = parse_date_range(content)
+            if date_range:
+                entry = start_education_entry(date_range[2], date_range[0], date_range[1])
+                education.append(entry)
+            elif entry is None or classify_fields(content)["school"]:
+                entry = start_education_entry(content, None, None)
+                education.append(entry)
+            else:
+                fill_missing(entry, content, "education")
+
+        elif section == "skills":
+            for skill in SKILL_SPLIT_PATTERN.split(SKILL_LABEL_PATTERN.sub("", content)):
+                skill = skill.strip(" 。.")
+                if skill and skill not in seen_skills:
+                    seen_skills.add(skill)
+                    skills.append(skill)
+
+        elif section == "projects":
+            date_range = parse_date_range(content)
+            if date_range and not is_bullet:
+                name = classify_fields(date_range[2])
+                entry = {
+                    "name": (name["other"] or name["company"] or [date_range[2]])[0],
+                    "role": (name["position"] or [None])[0],
+                    "start_date": date_range[0],
+                    "end_date": date_range[1],
+                    "description": ""
+                }
+                projects.append(entry)
+            elif entry is None or (not is_bullet and len(content) <= 30 and entry["description"]):
+                entry = {"name": content, "role": None, "start_date": None, "end_date": None, "description": ""}
+                projects.append(entry)
+            else:
+                entry["description"] = (entry["description"] + "\n" + content).strip()
+
+        elif section == "summary":
+            summary.append(content)
+
+        elif section == "awards":
+            awards.append(content)
+
+        elif section == "languages":
+            languages.extend(s for s in SKILL_SPLIT_PATTERN.split(content) if s)
+
+    return {
+        "basics": basics,
+        "summary": " ".join(summary) or None,
+        "work_history": work_history,
+        "education": education,
+        "skills": skills,
+        "projects": projects,
+        "awards": awards,
+        "languages": languages
+    }
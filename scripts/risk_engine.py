@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+风险检测引擎 - 把可配置的加权关键词和画像规则编译成自动机，一次扫描完成评分
+
+规则文件：templates/risk_rules.json
+    - categories：high_risk / emotion / opportunity 三类关键词，可为每个关键词单独设置权重
+        {"keyword": "投资", "weight": 0.5} 或直接写字符串（使用 default_weight）
+    - thresholds：life_level_score（高风险得分达到即为生命级决策）、high_emotion_ratio
+    - persona_rules：画像中同时出现 all 里的所有词时，给出 message 提醒
+
+使用方法：
+    from risk_engine import get_risk_engine
+
+    engine = get_risk_engine()
+    assessment = engine.assess("为了父母考虑买房")
+    references = engine.persona_references(persona_content)
+
+    # 常驻进程（如 decision_server）预加载画像，画像或规则文件变化时自动重新加载
+    persona = PersonaContext("../interviews/my-persona.md")
+    persona.references()
+"""
+
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from keyword_automaton import KeywordAutomaton
+from persona_store import load_persona
+
+
+DEFAULT_RULES_PATH = Path(__file__).parent.parent / "templates" / "risk_rules.json"
+
+# 关键词类别 -> 风险评估中的字段
+CATEGORY_FIELDS = {
+    "high_risk": "detected_keywords",
+    "emotion": "emotion_factors",
+    "opportunity": "opportunity_signals"
+}
+
+
+class RiskEngine:
+    """编译后的风险检测引擎（线程安全，只读）"""
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.rules = rules
+        thresholds = rules.get("thresholds", {})
+        self.life_level_score = thresholds.get("life_level_score", 1.0)
+        self.high_emotion_ratio = thresholds.get("high_emotion_ratio", 0.5)
+
+        # 所有类别的关键词编译进同一个自动机，value 为 (规则序号, 类别, 权重)
+        self.keyword_automaton = KeywordAutomaton()
+        order = 0
+        for category, config in rules.get("categories", {}).items():
+            if category not in CATEGORY_FIELDS:
+                raise ValueError(f"未知的关键词类别：{category}")
+            default_weight = config.get("default_weight", 1.0)
+            for item in config.get("keywords", []):
+                if isinstance(item, str):
+                    keyword, weight = item, default_weight
+                else:
+                    keyword, weight = item["keyword"], item.get("weight", default_weight)
+                self.keyword_automaton.add(keyword, (order, category, weight))
+                order += 1
+        self.keyword_automaton.build()
+
+        # 画像规则中出现的所有词编译进另一个自动机
+        self.persona_rules = rules.get("persona_rules", [])
+        self.persona_automaton = KeywordAutomaton(case_sensitive=True)
+        for term in {term for rule in self.persona_rules for term in rule.get("all", [])}:
+            self.persona_automaton.add(term)
+        self.persona_automaton.build()
+
+    @classmethod
+    def from_file(cls, rules_path: Optional[str] = None) -> "RiskEngine":
+        """从规则文件加载"""
+        with open(rules_path or DEFAULT_RULES_PATH, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def scan(self, description: str) -> Dict[str, List[tuple]]:
+        """扫描描述，按类别返回命中的 (关键词, 权重)，同一关键词只计一次，按规则顺序排列"""
+        hits = {}
+        for _, keyword, (order, category, weight) in self.keyword_automaton.iter_matches(description):
+            hits.setdefault(order, (category, keyword, weight))
+
+        matched = {category: [] for category in CATEGORY_FIELDS}
+        for order in sorted(hits):
+            category, keyword, weight = hits[order]
+            matched[category].append((keyword, weight))
+        return matched
+
+    def assess(self, description: str) -> Dict[str, Any]:
+        """评估决策描述的风险（不含画像引用和必要行动）"""
+        matched = self.scan(description)
+
+        risk_assessment = {
+            "description": description,
+            "detected_keywords": [k for k, _ in matched["high_risk"]],
+            "decision_type_suggestion": "daily",
+            "emotion_factors": [k for k, _ in matched["emotion"]],
+            "emotion_ratio": 0.0,
+            "opportunity_signals": [k for k, _ in matched["opportunity"]],
+            "risk_score": sum((w for _, w in matched["high_risk"]), 0.0),
+            "risk_level": "low",
+            "warnings": [],
+            "required_actions": [],
+            "persona_references": []
+        }
+
+        # 计算情感占比
+        if matched["emotion"]:
+            risk_assessment["emotion_ratio"] = min(sum(w for _, w in matched["emotion"]), 1.0)
+
+        # 确定风险等级
+        if matched["high_risk"] and risk_assessment["risk_score"] >= self.life_level_score:
+            risk_assessment["decision_type_suggestion"] = "life_level"
+            risk_assessment["risk_level"] = "high"
+        elif risk_assessment["emotion_ratio"] > self.high_emotion_ratio:
+            risk_assessment["risk_level"] = "high"
+            risk_assessment["decision_type_suggestion"] = "important"
+        elif matched["high_risk"]:
+            risk_assessment["risk_level"] = "medium"
+            risk_assessment["decision_type_suggestion"] = "important"
+
+        # 生成警告
+        if risk_assessment["risk_level"] == "high":
+            risk_assessment["warnings"].append("⚠️ 检测到高风险决策")
+
+            if risk_assessment["emotion_ratio"] > self.high_emotion_ratio:
+                risk_assessment["warnings"].append(
+                    f"⚠️ 情感因素占比{risk_assessment['emotion_ratio']*100:.0f}%，可能劫持理性"
+                )
+
+            risk_assessment["warnings"].append("⚠️ 建议执行7天冷静期")
+
+        return risk_assessment
+
+    def persona_references(self, persona_content: str) -> List[str]:
+        """扫描一次画像内容，返回命中的画像规则提醒（按规则顺序）"""
+        found = {keyword for _, keyword, _ in self.persona_automaton.iter_matches(persona_content)}
+        return [
+            rule["message"] for rule in self.persona_rules
+            if rule.get("all") and all(term in found for term in rule["all"])
+        ]
+
+
+_engine_cache: Dict[str, Any] = {}
+
+
+def get_risk_engine(rules_path: Optional[str] = None) -> RiskEngine:
+    """获取编译好的引擎（按规则文件缓存，文件修改后自动重新编译）"""
+    path = Path(rules_path or DEFAULT_RULES_PATH)
+    mtime = path.stat().st_mtime_ns
+
+    cached = _engine_cache.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    engine = RiskEngine.from_file(str(path))
+    _engine_cache[str(path)] = (mtime, engine)
+    return engine
+
+
+class PersonaContext:
+    """
+    预加载的画像
+
+    画像只读取、扫描一次，画像规则的命中结果缓存下来；每次查询时（最多每
+    check_interval 秒一次）检查画像和规则文件是否变化，变化后才重新加载。
+    """
+
+    def __init__(
+        self,
+        persona_path: str,
+        rules_path: Optional[str] = None,
+        check_interval: float = 1.0
+    ):
+        self.persona_path = Path(persona_path)
+        self.rules_path = rules_path
+        self.check_interval = check_interval
+
+        self.lock = threading.Lock()
+        self.signature = None
+        self.engine = None
+        self.cached_references: List[str] = []
+        self.last_check = 0.0
+
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        """
+        画像或规则文件变化时重新加载
+
+        画像或规则文件暂时不可读（编辑器保存时先删除再写入、被移走、读到写了一半的内容）时
+        保留上次加载的画像和规则，下次检查再重试；首次加载失败时抛出异常。
+        """
+        now = time.monotonic()
+        if not force and now - self.last_check < self.check_interval:
+            return
+
+        with self.lock:
+            self.last_check = now
+            try:
+                engine = get_risk_engine(self.rules_path)
+                stat = self.persona_path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if signature == self.signature and engine is self.engine:
+                    return
+                persona = load_persona(str(self.persona_path), save=False)
+                references = engine.persona_references(persona["content"])
+            except (OSError, ValueError):
+                # ValueError 包括 UnicodeDecodeError（画像写了一半）和规则文件格式错误
+                if self.engine is None:
+                    raise
+                return
+
+            self.cached_references = references
+            self.engine = engine
+            self.signature = signature
+
+    def current(self) -> Tuple[RiskEngine, List[str]]:
+        """当前的 (风险引擎, 画像规则提醒)，二者来自同一次加载"""
+        self.refresh()
+        with self.lock:
+            return self.engine, list(self.cached_references)
+
+    def references(self) -> List[str]:
+        """画像规则提醒"""
+        return self.current()[1]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+JSON Schema 校验 - 已安装 jsonschema 时使用 jsonschema，否则使用内置的最小校验
+
+内置校验支持 type / required / properties / items / enum / pattern，足够校验
+schemas/ 下的编译结果和 LLM 提取结果。
+
+使用方法：
+    from schema_check import load_schema, validate
+
+    errors = validate(instance, load_schema("resume_extraction_schema.json"))
+    if errors:
+        ...
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+SCHEMA_DIR = Path(__file__).parent.parent / "schemas"
+
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None)
+}
+
+_schema_cache: Dict[str, Dict[str, Any]] = {}
+
+
+class SchemaError(ValueError):
+    """结果未通过 schema 校验"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("结果未通过 schema 校验：" + "；".join(errors[:3]))
+        self.errors = errors
+
+
+def load_schema(name: str) -> Dict[str, Any]:
+    """加载 schemas/ 下的 schema 文件（每个文件只读取一次）"""
+    if name not in _schema_cache:
+        with open(SCHEMA_DIR / name, 'r', encoding='utf-8') as f:
+            _schema_cache[name] = json.load(f)
+    return _schema_cache[name]
+
+
+def check(instance: Any, schema: Dict[str, Any], path: str, errors: List[str]):
+    """最小化的 JSON Schema 校验，错误追加到 errors"""
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        matched = any(
+            isinstance(instance, JSON_TYPES[t]) and not (t in ("integer", "number") and isinstance(instance, bool))
+            for t in types
+        )
+        if not matched:
+            errors.append(f"{path}: 类型应为 {'/'.join(types)}")
+            return
+
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: 取值不在 {schema['enum']} 中")
+
+    if "pattern" in schema and isinstance(instance, str):
+        if not re.search(schema["pattern"], instance):
+            errors.append(f"{path}: 不匹配 {schema['pattern']}")
+
+    if isinstance(instance, dict):
+        for key in schema.get("required", []):
+            if key not in instance:
+                errors.append(f"{path}: 缺少字段 {key}")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in instance:
+                check(instance[key], sub_schema, f"{path}.{key}", errors)
+
+    if isinstance(instance, list) and "items" in schema:
+        for i, item in enumerate(instance):
+            check(item, schema["items"], f"{path}[{i}]", errors)
+
+
+def validate(instance: Any, schema: Dict[str, Any]) -> List[str]:
+    """校验实例，返回错误列表（为空表示通过）"""
+    try:
+        import jsonschema
+    except ImportError:
+        errors = []
+        check(instance, schema, "$", errors)
+        return errors
+
+    validator = jsonschema.validators.validator_for(schema)(schema)
+    return [
+        f"$.{'.'.join(str(p) for p in error.absolute_path)}: {error.message}"
+        for error in validator.iter_errors(instance)
+    ]
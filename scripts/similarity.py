@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+文本相似度 - 基于字符 shingle + MinHash + LSH 的近似重复匹配
+
+用于版本对比：画像中改写过措辞的条目（核心发现、优势、劣势）应当识别为"调整"，
+而不是"删除一条 + 新增一条"。
+
+流程：
+1. 规范化文本（去掉空白和标点，英文转小写），切成字符 k-gram（中文按字切分，无需分词）
+2. 每个条目计算 MinHash 签名（默认 64 个哈希函数）
+3. 签名分段（LSH band，默认 32 段 × 2 行）放入桶中，只有落入同一个桶的条目才成为候选对
+4. 候选对计算加权相似度（Jaccard 与重叠系数的平均）：同一组里多个条目共有的 shingle
+   （如“发现N：”“需要验证”这类套话）按出现的条目数降低权重，相似度主要由各条目自己的内容决定
+5. 候选对按连通分量求最优配对（匈牙利算法，相似度总和最大；相似度相同时位置相近的优先），
+   而不是按相似度贪心配对——贪心时一个条目可能被套话相同的另一个条目“抢走”
+
+候选对数量与条目数量近似线性，数百条目的多版本对比也不会退化成两两比较。
+
+使用方法：
+    from similarity import match_items
+
+    result = match_items(old_findings, new_findings)
+    result["unchanged"]  # 完全相同的条目
+    result["changed"]    # [(旧条目, 新条目, 相似度)]
+    result["added"]      # 新增条目
+    result["removed"]    # 删除条目
+"""
+
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+
+# 去除空白和常见中英文标点
+NORMALIZE_PATTERN = re.compile(r'[\s\W_]+', re.UNICODE)
+
+# 相似度相同时，按位置差打破平局的权重（远小于任何有意义的相似度差）
+POSITION_TIE_BREAK = 1e-6
+
+# MinHash 使用的梅森素数（2^61 - 1）
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 32
+DEFAULT_THRESHOLD = 0.3
+
+
+def normalize_text(text: str) -> str:
+    """规范化文本：去掉空白和标点，英文转小写"""
+    return NORMALIZE_PATTERN.sub('', text).lower()
+
+
+def shingles(text: str, k: int = 2) -> FrozenSet[str]:
+    """字符 k-gram 集合（文本短于 k 时返回整个文本）"""
+    normalized = normalize_text(text)
+    if len(normalized) <= k:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + k] for i in range(len(normalized) - k + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard 相似度"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def weighted_similarity(a: FrozenSet[str], b: FrozenSet[str], weights: Dict[str, float]) -> float:
+    """
+    加权相似度：加权 Jaccard 与加权重叠系数（交集 / 较短一方）的平均（weights 中没有的 shingle 权重为 1）
+
+    改写时常在原条目上增删半句（“……，需要验证” → “……，并整合盖洛普结果”），
+    只用 Jaccard 会被长度差拉低；重叠系数衡量较短的一方有多少内容保留在另一方中。
+    """
+    if not a and not b:
+        return 1.0
+    weight_a = sum(weights.get(s, 1.0) for s in a)
+    weight_b = sum(weights.get(s, 1.0) for s in b)
+    shared = sum(weights.get(s, 1.0) for s in a & b)
+    union = weight_a + weight_b - shared
+    smaller = min(weight_a, weight_b)
+    if not union or not smaller:
+        return 0.0
+    return (shared / union + shared / smaller) / 2
+
+
+def boilerplate_weights(old_sets: Sequence[FrozenSet[str]], new_sets: Sequence[FrozenSet[str]]) -> Dict[str, float]:
+    """
+    shingle 权重：1 / (在同一组中出现的最多条目数)²
+
+    只在一个条目中出现的 shingle 权重为 1；两个条目共有的降到 1/4，多个条目都有的套话接近 0。
+    每组只有一个条目时所有权重都是 1，即普通 Jaccard。
+    """
+    counts = []
+    for sets in (old_sets, new_sets):
+        count: Dict[str, int] = defaultdict(int)
+        for shingle_set in sets:
+            for s in shingle_set:
+                count[s] += 1
+        counts.append(count)
+
+    old_count, new_count = counts
+    return {
+        s: 1.0 / max(old_count.get(s, 0), new_count.get(s, 0)) ** 2
+        for s in set(old_count) | set(new_count)
+        if max(old_count.get(s, 0), new_count.get(s, 0)) > 1
+    }
+
+
+def min_cost_assignment(cost: List[List[float]]) -> Dict[int, int]:
+    """
+    最小费用完全匹配（匈牙利算法，O(n²m)，要求行数 <= 列数），返回 {行: 列}
+    """
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u, v = [0.0] * (n + 1), [0.0] * (m + 1)
+    owner, way = [0] * (m + 1), [0] * (m + 1)
+
+    for row in range(1, n + 1):
+        owner[0] = row
+        col = 0
+        min_slack = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[col] = True
+            current_row, delta, next_col = owner[col], inf, 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    slack = cost[current_row - 1][j - 1] - u[current_row] - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j], way[j] = slack, col
+                    if min_slack[j] < delta:
+                        delta, next_col = min_slack[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            col = next_col
+            if owner[col] == 0:
+                break
+        while col:
+            previous = way[col]
+            owner[col] = owner[previous]
+            col = previous
+
+    return {owner[j] - 1: j - 1 for j in range(1, m + 1) if owner[j]}
+
+
+def best_pairs(pairs: Sequence[Tuple[float, int, int]]) -> Dict[int, Tuple[int, float]]:
+    """
+    从候选对 (相似度, 旧条目序号, 新条目序号) 中选出相似度总和最大的配对，返回 {旧序号: (新序号, 相似度)}
+
+    候选对按连通分量分别求解（分量通常只有几个条目）；总和相同时位置差小的配对优先。
+    """
+    parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+    def find(node):
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for _, i, j in pairs:
+        parent[find(("old", i))] = find(("new", j))
+
+    components: Dict[Tuple[str, int], List[Tuple[float, int, int]]] = defaultdict(list)
+    for pair in pairs:
+        components[find(("old", pair[1]))].append(pair)
+
+    matched = {}
+    for component in components.values():
+        olds = sorted({i for _, i, _ in component})
+        news = sorted({j for _, _, j in component})
+        similarity = {(i, j): sim for sim, i, j in component}
+
+        # 没有候选关系的格子费用为 0（等于不配对），候选对费用为负的相似度
+        transpose = len(olds) > len(news)
+        rows, cols = (news, olds) if transpose else (olds, news)
+        cost = []
+        for r in rows:
+            line = []
+            for c in cols:
+                i, j = (c, r) if transpose else (r, c)
+                sim = similarity.get((i, j))
+                line.append(0.0 if sim is None else -sim + POSITION_TIE_BREAK * abs(i - j))
+            cost.append(line)
+
+        for r, c in min_cost_assignment(cost).items():
+            i, j = (cols[c], rows[r]) if transpose else (rows[r], cols[c])
+            if (i, j) in similarity:
+                matched[i] = (j, similarity[(i, j)])
+
+    return matched
+
+
+class MinHasher:
+    """MinHash 签名生成器（同样的参数生成的签名可以互相比较）"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+        """计算 MinHash 签名"""
+        if not shingle_set:
+            return (MAX_HASH,) * self.num_perm
+
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingle_set]
+        return tuple(
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+
+class LSHIndex:
+    """LSH 索引：签名分成 bands 段，任一段完全相同即成为候选"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"哈希数量 {num_perm} 必须能被分段数 {bands} 整除")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[Any]] = defaultdict(list)
+
+    def band_keys(self, signature: Sequence[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def insert(self, key: Any, signature: Sequence[int]):
+        for band_key in self.band_keys(signature):
+            self.buckets[band_key].append(key)
+
+    def query(self, signature: Sequence[int]) -> set:
+        candidates = set()
+        for band_key in self.band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        return candidates
+
+
+_default_hasher = None
+
+
+def get_hasher() -> MinHasher:
+    """默认参数的 MinHash 生成器（排列参数只生成一次）"""
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = MinHasher()
+    return _default_hasher
+
+
+def match_items(
+    old_items: Sequence[str],
+    new_items: Sequence[str],
+    threshold: float = DEFAULT_THRESHOLD,
+    bands: int = DEFAULT_BANDS
+) -> Dict[str, List[Any]]:
+    """
+    匹配两组条目
+
+    完全相同（规范化后）的条目直接配对；其余条目通过 LSH 找候选对，
+    加权相似度（套话降权）不低于 threshold 的候选对求相似度总和最大的配对，每个条目最多配对一次。
+    返回 unchanged / changed / added / removed，各列表保持条目原有顺序。
+    """
+    result = {"unchanged": [], "changed": [], "added": [], "removed": []}
+
+    # 完全相同的条目先配对（同一文本出现多次时逐个配对）
+    old_by_text = defaultdict(list)
+    for i, item in enumerate(old_items):
+        old_by_text[normalize_text(item)].append(i)
+
+    old_left = set(range(len(old_items)))
+    new_left = []
+    for j, item in enumerate(new_items):
+        same = old_by_text.get(normalize_text(item))
+        if same:
+            old_left.discard(same.pop(0))
+            result["unchanged"].append(item)
+        else:
+            new_left.append(j)
+
+    # 剩余条目用 LSH 找候选对（套话权重按两组的全部条目统计）
+    pairs = []
+    if old_left and new_left:
+        old_sets = [shingles(item) for item in old_items]
+        new_sets = [shingles(item) for item in new_items]
+        weights = boilerplate_weights(old_sets, new_sets)
+
+        hasher = get_hasher()
+        index = LSHIndex(hasher.num_perm, bands)
+        for i in old_left:
+            index.insert(i, hasher.signature(old_sets[i]))
+
+        for j in new_left:
+            for i in index.query(hasher.signature(new_sets[j])):
+                similarity = weighted_similarity(old_sets[i], new_sets[j], weights)
+                if similarity >= threshold:
+                    pairs.append((similarity, i, j))
+
+    matched_old = best_pairs(pairs)
+    matched_new = {j: (i, similarity) for i, (j, similarity) in matched_old.items()}
+
+    for j in new_left:
+        if j in matched_new:
+            i, similarity = matched_new[j]
+            result["changed"].append((old_items[i], new_items[j], round(similarity, 3)))
+        else:
+            result["added"].append(new_items[j])
+
+    result["removed"] = [old_items[i] for i in sorted(old_left) if i not in matched_old]
+    return result
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+流式 JSON 解析 - 边接收模型输出边解析，顶层字段一完整就交给调用方
+
+提取提示词要求模型只返回一个 JSON 对象。等完整输出后再去掉 ``` 代码块、调用 json.loads，
+交互运行时要等到最后一个 token 才能看到任何结果，格式错误也要到最后才发现。
+这里逐块喂入模型的流式输出：
+
+- 顶层对象的每个字段（如 basics、work_history、top_themes）在值结束时立即解析并返回
+- 允许前后有 ```json 代码块标记和空白，其他多余内容、括号不匹配、值无法解析时立即抛出
+  StreamingJSONError，调用方可以中止请求，换下一个提供方
+
+使用方法：
+    from streaming_json import parse_stream
+
+    result = parse_stream(text_chunks, on_member=lambda key, value: print(key))
+
+    parser = StreamingJSONParser()
+    for chunk in text_chunks:
+        for key, value in parser.feed(chunk):
+            ...
+    result = parser.close()
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+WHITESPACE = " \t\r\n"
+
+CLOSING = {"{": "}", "[": "]"}
+
+
+class StreamingJSONError(ValueError):
+    """模型输出不是合法的 JSON 对象"""
+
+
+class StreamingJSONParser:
+    """
+    增量解析一个 JSON 对象（只跟踪顶层结构，每个字段的值完整后用 json.loads 解析）
+
+    状态：
+        prefix      等待 "{"（只允许空白和 ``` 代码块标记）
+        key         等待字段名（或空对象的 "}"）
+        key_string  读取字段名
+        colon       等待 ":"
+        value       等待值开始
+        in_value    读取值（stack 记录值内部未闭合的括号）
+        after       等待 "," 或 "}"
+        done        对象已结束（只允许空白和 ```）
+    """
+
+    def __init__(self):
+        self.state = "prefix"
+        self.result: Dict[str, Any] = {}
+        self.buffer = ""
+        self.pos = 0
+        self.fence = ""
+        self.key_start = 0
+        self.key: Optional[str] = None
+        self.value_start = 0
+        self.stack: List[str] = []
+        self.in_string = False
+        self.escape = False
+        self.expect_member = False
+
+    def error(self, message: str):
+        snippet = self.buffer[max(0, self.pos - 20):self.pos + 1]
+        raise StreamingJSONError(f"{message}（位置 {self.pos}，附近内容：{snippet!r}）")
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """喂入一块文本，返回这一块中完整的顶层字段 [(字段名, 值)]"""
+        self.buffer += chunk
+        members = []
+
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+
+            if self.state == "prefix":
+                self.read_prefix(char)
+
+            elif self.state == "key":
+                if char == '"':
+                    self.key_start = self.pos
+                    self.state = "key_string"
+                    self.expect_member = False
+                elif char == "}" and not self.expect_member:
+                    self.state = "done"
+                elif char not in WHITESPACE:
+                    self.error("应为字段名")
+
+            elif self.state == "key_string":
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.key = json.loads(self.buffer[self.key_start:self.pos + 1])
+                    self.state = "colon"
+
+            elif self.state == "colon":
+                if char == ":":
+                    self.state = "value"
+                elif char not in WHITESPACE:
+                    self.error("应为冒号")
+
+            elif self.state == "value":
+                if char not in WHITESPACE:
+                    self.value_start = self.pos
+                    self.state = "in_value"
+                    if char in CLOSING:
+                        self.stack = [CLOSING[char]]
+                    elif char == '"':
+                        self.in_string = True
+                    elif char in "}],:":
+                        self.error("应为字段值")
+
+            elif self.state == "in_value":
+                complete = False
+                end = self.pos + 1
+
+                if self.in_string:
+                    if self.escape:
+                        self.escape = False
+                    elif char == "\\":
+                        self.escape = True
+                    elif char == '"':
+                        self.in_string = False
+                        complete = not self.stack
+                elif self.stack:
+                    if char == '"':
+                        self.in_string = True
+                    elif char in CLOSING:
+                        self.stack.append(CLOSING[char])
+                    elif char in "}]":
+                        if char != self.stack.pop():
+                            self.error("括号不匹配")
+                        complete = not self.stack
+                elif char in WHITESPACE or char in ",}":
+                    # 数字 / true / false / null 在分隔符处结束，分隔符留给 after 状态处理
+                    complete = True
+                    end = self.pos
+                    self.pos -= 1
+
+                if complete:
+                    members.append(self.emit(self.buffer[self.value_start:end]))
+                    self.state = "after"
+
+            elif self.state == "after":
+                if char == ",":
+                    self.state = "key"
+                    self.expect_member = True
+                elif char == "}":
+                    self.state = "done"
+                elif char not in WHITESPACE:
+                    self.error("应为逗号或 }")
+
+            elif self.state == "done":
+                if char not in WHITESPACE and char != "`":
+                    self.error("JSON 对象之后有多余内容")
+
+            self.pos += 1
+
+        return members
+
+    def read_prefix(self, char: str):
+        """对象之前：空白，以及可选的 ``` 代码块标记（可带语言名，如 ```json）"""
+        if self.fence in ("", "```ws") and char == "{":
+            self.state = "key"
+        elif char in WHITESPACE:
+            if self.fence in ("```", "```lang"):
+                self.fence = "```ws"
+            elif self.fence in ("`", "``"):
+                self.error("代码块标记不正确")
+        elif char == "`" and self.fence in ("", "`", "``"):
+            self.fence += "`"
+        elif self.fence == "```" and char == "{":
+            self.state = "key"
+        elif self.fence in ("```", "```lang") and char.isalnum():
+            self.fence = "```lang"
+        else:
+            self.error("JSON 对象之前有多余内容")
+
+    def emit(self, value_text: str) -> Tuple[str, Any]:
+        try:
+            value = json.loads(value_text)
+        except ValueError as e:
+            self.error(f"字段 {self.key} 的值无法解析：{e}")
+        self.result[self.key] = value
+        return self.key, value
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def close(self) -> Dict[str, Any]:
+        """输入结束，返回完整对象（对象未结束时抛出 StreamingJSONError）"""
+        if not self.done:
+            raise StreamingJSONError("输出在 JSON 对象结束前中断")
+        return self.result
+
+
+def parse_stream(
+    chunks: Iterable[str],
+    on_member: Optional[Callable[[str, Any], None]] = None
+) -> Dict[str, Any]:
+    """
+    解析流式输出，每个顶层字段完整时回调 on_member(字段名, 值)
+
+    格式错误时立即抛出 StreamingJSONError，并关闭 chunks（生成器的 close 会中止 HTTP 流）。
+    """
+    parser = StreamingJSONParser()
+    try:
+        for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                if on_member:
+                    on_member(key, value)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+    return parser.close()
+
+
+def describe(value: Any) -> str:
+    """字段值的简短描述（用于交互运行时显示已到达的字段）"""
+    if isinstance(value, list):
+        return f"{len(value)} 条"
+    if isinstance(value, dict):
+        name = value.get("name")
+        return f"{name}" if isinstance(name, str) and name else f"{len(value)} 个字段"
+    text = str(value)
+    return text if len(text) <= 30 else text[:30] + "…"
+
+
+async def parse_stream_async(
+    chunks,
+    on_member: Optional[Callable[[str, Any], None]] = None
+) -> Dict[str, Any]:
+    """parse_stream 的异步版本（chunks 为异步迭代器）"""
+    parser = StreamingJSONParser()
+    try:
+        async for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                if on_member:
+                    on_member(key, value)
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose:
+            await aclose()
+    return parser.close()
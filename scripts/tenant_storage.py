@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+租户存储 - 按用户（租户）分片的数据目录
+
+目录结构：
+    data/decisions/                   # 默认（未指定租户）
+    data/reviews/
+    data/tenants/<tenant>/decisions/  # 指定租户后的分片目录
+    data/tenants/<tenant>/reviews/
+
+使用方法：
+    from tenant_storage import get_decision_dir, get_review_dir
+
+    get_decision_dir()          # data/decisions
+    get_decision_dir("alice")   # data/tenants/alice/decisions
+
+命令行工具通过 --tenant 参数选择租户，decision_server 通过 X-Tenant-ID 请求头选择租户。
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+
+# 数据根目录
+DATA_ROOT = Path(__file__).parent.parent / "data"
+
+# HTTP请求头名称
+TENANT_HEADER = "X-Tenant-ID"
+
+# 租户ID只允许字母、数字、下划线、点和短横线，防止路径穿越
+TENANT_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$')
+
+
+def normalize_tenant(tenant: Optional[str]) -> Optional[str]:
+    """校验并规范化租户ID，空值表示默认租户"""
+    if tenant is None:
+        return None
+
+    tenant = tenant.strip()
+    if not tenant:
+        return None
+
+    if not TENANT_PATTERN.match(tenant) or tenant in (".", ".."):
+        raise ValueError(f"无效的租户ID：{tenant}")
+
+    return tenant
+
+
+def get_data_dir(tenant: Optional[str] = None) -> Path:
+    """获取租户的数据根目录"""
+    tenant = normalize_tenant(tenant)
+    if tenant is None:
+        return DATA_ROOT
+    return DATA_ROOT / "tenants" / tenant
+
+
+def get_decision_dir(tenant: Optional[str] = None, create: bool = True) -> Path:
+    """获取租户的决策记录目录"""
+    decision_dir = get_data_dir(tenant) / "decisions"
+    if create:
+        decision_dir.mkdir(parents=True, exist_ok=True)
+    return decision_dir
+
+
+def get_review_dir(tenant: Optional[str] = None, create: bool = True) -> Path:
+    """获取租户的成长回顾目录"""
+    review_dir = get_data_dir(tenant) / "reviews"
+    if create:
+        review_dir.mkdir(parents=True, exist_ok=True)
+    return review_dir
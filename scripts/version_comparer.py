@@ -6,143 +6,175 @@
     python version_comparer.py list
     python version_comparer.py compare --old v1.1 --new v1.2
     python version_comparer.py show --version v1.2
+    python version_comparer.py timeline [--all-pairs] [--output timeline.md] [--json timeline.json]
+    python version_comparer.py archive
+    python version_comparer.py restore --version v1.1 [--output my-persona-v1.1.md]
+    python version_comparer.py delta --old v1.1 --new v1.2
 
 功能：
 - 列出所有版本
 - 对比两个版本
 - 查看版本详情
 - 生成对比报告
+- 生成全部版本的演进时间线
+- 归档历史版本（基准快照 + 增量，见 version_store.py），按需重建和查看差异
 """
 
 import sys
 import json
 import re
+import hashlib
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from persona_markdown import extract_version_fields, parse_markdown
+from persona_store import load_persona
+from similarity import match_items
+from version_store import VersionStore
 
-def find_persona_versions(interview_dir: str) -> List[Dict[str, Any]]:
-    """查找所有画像版本"""
+
+# 版本清单文件（保存在访谈目录中）
+MANIFEST_FILENAME = ".versions_manifest.json"
+
+# 版本对比结果缓存（按两个版本的内容哈希缓存，保存在访谈目录中）
+COMPARISON_CACHE_FILENAME = ".comparison_cache.json"
+
+# 对比逻辑变化时递增，使旧缓存失效
+COMPARISON_CACHE_VERSION = 2
+
+
+def extract_version_name(lines) -> str:
+    """从画像文件的行中提取版本名称"""
+    for line in lines:
+        if '版本名称' in line or '整合版' in line or '访谈版' in line:
+            # 提取版本名称
+            name_match = re.search(r'[\"*](.+?)[\"*]', line)
+            if name_match:
+                return name_match.group(1)
+    return ""
+
+
+def load_version_manifest(interview_dir: str) -> Dict[str, Any]:
+    """
+    加载并刷新版本清单
+
+    清单记录每个画像文件的版本号、修改时间、大小、内容哈希和版本名称。
+    只有修改时间或大小变化的文件才会被重新读取，未变化的文件不会被打开。
+    """
     interviews_path = Path(interview_dir)
-    versions = []
+    manifest_path = interviews_path / MANIFEST_FILENAME
+
+    manifest = {"files": {}}
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {"files": {}}
+
+    old_entries = manifest.get("files", {})
+    entries = {}
+    changed = False
 
     # 查找所有 my-persona-*.md 文件
     for file in interviews_path.glob("my-persona-*.md"):
         # 提取版本号
         match = re.search(r'v(\d+)\.(\d+)', file.name)
-        if match:
-            major, minor = int(match.group(1)), int(match.group(2))
-            version = f"v{major}.{minor}"
-
-            # 读取文件获取版本名称
-            version_name = ""
-            with open(file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if '版本名称' in line or '整合版' in line or '访谈版' in line:
-                        # 提取版本名称
-                        name_match = re.search(r'[\"*](.+?)[\"*]', line)
-                        if name_match:
-                            version_name = name_match.group(1)
-                            break
-
-            versions.append({
-                "version": version,
-                "major": major,
-                "minor": minor,
-                "file": file.name,
-                "version_name": version_name
-            })
+        if not match:
+            continue
+
+        stat = file.stat()
+        entry = old_entries.get(file.name)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            entries[file.name] = entry
+            continue
+
+        # 新文件或已修改：读取一次，计算哈希并提取版本名称
+        with open(file, 'rb') as f:
+            raw = f.read()
+
+        major, minor = int(match.group(1)), int(match.group(2))
+        entries[file.name] = {
+            "version": f"v{major}.{minor}",
+            "major": major,
+            "minor": minor,
+            "file": file.name,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "version_name": extract_version_name(raw.decode('utf-8').splitlines())
+        }
+        changed = True
+
+    if changed or set(entries) != set(old_entries):
+        manifest = {"updated_at": datetime.now().isoformat(), "files": entries}
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️  无法写入版本清单：{e}")
+
+    return {"files": entries}
+
+
+def find_persona_versions(interview_dir: str) -> List[Dict[str, Any]]:
+    """查找所有画像版本（基于版本清单）"""
+    versions = list(load_version_manifest(interview_dir)["files"].values())
 
     # 按版本号排序
     versions.sort(key=lambda x: (x["major"], x["minor"]))
     return versions
 
 
-def load_version_data(interview_dir: str, version: str) -> Optional[Dict[str, Any]]:
-    """加载指定版本的数据"""
-    versions = find_persona_versions(interview_dir)
-
-    # 查找匹配的版本
-    target_version = None
-    for v in versions:
+def find_version(interview_dir: str, version: str) -> Optional[Dict[str, Any]]:
+    """在版本清单中查找指定版本"""
+    for v in find_persona_versions(interview_dir):
         if v["version"] == version:
-            target_version = v
-            break
+            return v
+    return None
+
+
+def load_version_data(
+    interview_dir: str,
+    version: str,
+    target_version: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """加载指定版本的数据（target_version 为已查到的清单条目，可避免重复刷新清单）"""
+    target_version = target_version or find_version(interview_dir, version)
 
     if not target_version:
-        return None
+        # 访谈目录中已没有该文件时，从版本存储中重建
+        return load_archived_version_data(interview_dir, version)
 
     file_path = Path(interview_dir) / target_version["file"]
 
-    # 读取文件
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # 从画像存储加载（文件未变化时直接读取编译结果，不重新解析）
+    persona = load_persona(str(file_path), save=False)
 
-    # 提取基本信息
     data = {
         "version": target_version["version"],
         "version_name": target_version["version_name"],
-        "file": file_path.name,
-        "created_at": None,
-        "data_sources": [],
-        "summary": "",
-        "key_findings": [],
-        "strengths": [],
-        "weaknesses": [],
-        "suitable_directions": [],
-        "unsuitable_directions": []
+        "file": file_path.name
     }
+    data.update(persona["profile"])
+    return data
+
 
-    # 提取创建时间
-    date_match = re.search(r'\*\*生成时间\*\*[：:]\s*(\d{4}-\d{2}-\d{2})', content)
-    if date_match:
-        data["created_at"] = date_match.group(1)
-
-    # 提取数据源
-    sources_match = re.search(r'\*\*数据来源\*\*[：:]\s*(.+)', content)
-    if sources_match:
-        sources_text = sources_match.group(1)
-        data["data_sources"] = [s.strip() for s in sources_text.split('+')]
-
-    # 提取摘要
-    summary_match = re.search(r'>\s*(.+)', content)
-    if summary_match:
-        data["summary"] = summary_match.group(1).strip()
-
-    # 提取核心发现
-    findings_section = re.search(r'##\s+核心发现.*?(?=##|\Z)', content, re.DOTALL)
-    if findings_section:
-        findings_lines = findings_section.group(0).split('\n')
-        for line in findings_lines:
-            line = line.strip()
-            if line.startswith('-') or line.startswith('•'):
-                data["key_findings"].append(line.lstrip('-*• ').strip())
-
-    # 提取优势
-    strengths_match = re.search(r'##\s+我的核心优势.*?(?=##|\Z)', content, re.DOTALL)
-    if strengths_match:
-        # 提取 ⭐⭐⭐⭐⭐ 的项目
-        strength_items = re.findall(r'[⭐*]{5}\s+(.+?)(?:\n|$)', strengths_match.group(0))
-        data["strengths"] = [s.strip() for s in strength_items]
-
-    # 提取劣势
-    weaknesses_match = re.search(r'##\s+我的核心劣势.*?(?=##|\Z)', content, re.DOTALL)
-    if weaknesses_match:
-        weakness_items = re.findall(r'[-*]\s+(.+?)(?:\n|$)', weaknesses_match.group(0))
-        data["weaknesses"] = [w.strip() for w in weakness_items if w.strip()]
-
-    # 提取适合方向
-    suitable_match = re.search(r'##\s+适合的职业方向.*?(?=##|\Z)', content, re.DOTALL)
-    if suitable_match:
-        # 提取 ⭐⭐⭐⭐⭐ 的项目
-        suitable_items = re.findall(r'[⭐*]{5}\s+(.+?)(?:\n|$)', suitable_match.group(0))
-        data["suitable_directions"] = [s.strip() for s in suitable_items]
-
-    # 提取不适合方向
-    unsuitable_items = re.findall(r'[-*]\s+❌\s+(.+?)(?:\n|$)', content)
-    data["unsuitable_directions"] = [u.strip() for u in unsuitable_items if u.strip()]
+def load_archived_version_data(interview_dir: str, version: str) -> Optional[Dict[str, Any]]:
+    """从版本存储中重建并解析指定版本"""
+    store = VersionStore.for_interview_dir(interview_dir)
+    entry = store.get(version)
+    if not entry:
+        return None
 
+    content = store.materialize(version)
+    data = {
+        "version": version,
+        "version_name": extract_version_name(content.splitlines()),
+        "file": entry.get("source_file") or f"{version}（版本存储）"
+    }
+    data.update(extract_version_fields(parse_markdown(content)))
     return data
 
 
@@ -177,36 +209,45 @@ def compare_versions(old_data: Dict, new_data: Dict) -> Dict[str, Any]:
             "description": "画像摘要已更新"
         })
 
-    # 对比核心发现
-    old_findings = set(old_data.get("key_findings", []))
-    new_findings = set(new_data.get("key_findings", []))
+    # 对比核心发现、优势、劣势（改写过措辞的条目按相似度配对，记为调整）
+    findings = match_items(old_data.get("key_findings", []), new_data.get("key_findings", []))
 
-    for finding in new_findings - old_findings:
+    for finding in findings["added"]:
         comparison["improvements"].append({
             "type": "new_finding",
             "description": finding
         })
 
-    # 对比优势
-    old_strengths = set(old_data.get("strengths", []))
-    new_strengths = set(new_data.get("strengths", []))
+    strengths = match_items(old_data.get("strengths", []), new_data.get("strengths", []))
 
-    for strength in new_strengths - old_strengths:
+    for strength in strengths["added"]:
         comparison["improvements"].append({
             "type": "new_strength",
             "description": f"新发现优势：{strength}"
         })
 
-    # 对比劣势
-    old_weaknesses = set(old_data.get("weaknesses", []))
-    new_weaknesses = set(new_data.get("weaknesses", []))
+    weaknesses = match_items(old_data.get("weaknesses", []), new_data.get("weaknesses", []))
 
-    for weakness in new_weaknesses - old_weaknesses:
+    for weakness in weaknesses["added"]:
         comparison["new_issues"].append({
             "type": "new_weakness",
             "description": f"新发现劣势：{weakness}"
         })
 
+    for change_type, label, matched in (
+        ("changed_finding", "核心发现", findings),
+        ("changed_strength", "优势", strengths),
+        ("changed_weakness", "劣势", weaknesses)
+    ):
+        for old_item, new_item, similarity in matched["changed"]:
+            comparison["changes"].append({
+                "type": change_type,
+                "description": f"{label}调整：{old_item} → {new_item}",
+                "old": old_item,
+                "new": new_item,
+                "similarity": similarity
+            })
+
     # 对比适合方向
     old_suitable = set(old_data.get("suitable_directions", []))
     new_suitable = set(new_data.get("suitable_directions", []))
@@ -332,8 +373,16 @@ def show_version_details(interview_dir: str, version: str):
 
 def compare_versions_command(interview_dir: str, old_version: str, new_version: str, output_path: Optional[str] = None):
     """对比两个版本"""
-    old_data = load_version_data(interview_dir, old_version)
-    new_data = load_version_data(interview_dir, new_version)
+    # 清单只刷新一次，然后只打开这两个版本的文件（访谈目录中没有的版本从版本存储中重建）
+    versions = {v["version"]: v for v in find_persona_versions(interview_dir)}
+
+    def load(version):
+        if version in versions:
+            return load_version_data(interview_dir, version, versions[version])
+        return load_archived_version_data(interview_dir, version)
+
+    old_data = load(old_version)
+    new_data = load(new_version)
 
     if not old_data:
         print(f"❌ 未找到版本：{old_version}")
@@ -362,20 +411,232 @@ def compare_versions_command(interview_dir: str, old_version: str, new_version:
     print(f"  变化：{len(comparison['changes'])} 项")
 
 
+def archive_versions_command(interview_dir: str):
+    """把访谈目录中的所有版本归档到版本存储（已归档的版本跳过）"""
+    store = VersionStore.for_interview_dir(interview_dir)
+
+    print(f"\n📦 归档画像版本到：{store.store_dir}\n")
+    for v in find_persona_versions(interview_dir):
+        if store.get(v["version"]) and store.get(v["version"])["sha256"] == v["sha256"]:
+            print(f"  ⏭️  {v['version']} 已归档")
+            continue
+
+        with open(Path(interview_dir) / v["file"], 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        try:
+            entry = store.archive(v["version"], content, v["file"])
+        except ValueError as e:
+            print(f"  ⚠️  {e}")
+            continue
+
+        kind = "完整快照" if entry["kind"] == "full" else f"增量（相对 {entry['parent']}）"
+        print(f"  ✅ {v['version']} → {kind}，{entry['size']} → {entry['stored_bytes']} 字节")
+
+    stats = store.stats()
+    print(f"\n📊 共 {stats['versions']} 个版本（{stats['snapshots']} 个完整快照），"
+          f"原始 {stats['original_bytes']} 字节，实际占用 {stats['stored_bytes']} 字节\n")
+
+
+def restore_version_command(interview_dir: str, version: str, output_path: Optional[str] = None):
+    """从版本存储中重建指定版本"""
+    store = VersionStore.for_interview_dir(interview_dir)
+    if not store.get(version):
+        print(f"❌ 版本存储中没有：{version}（先运行 archive 命令归档）")
+        return
+
+    content = store.materialize(version)
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        print(f"✅ {version} 已重建到：{output_path}")
+    else:
+        print(content)
+
+
+def delta_command(interview_dir: str, old_version: str, new_version: str, output_path: Optional[str] = None):
+    """输出两个已归档版本之间的逐行差异"""
+    store = VersionStore.for_interview_dir(interview_dir)
+    for version in (old_version, new_version):
+        if not store.get(version):
+            print(f"❌ 版本存储中没有：{version}（先运行 archive 命令归档）")
+            return
+
+    diff = "".join(line if line.endswith("\n") else line + "\n" for line in store.diff(old_version, new_version))
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(diff)
+        print(f"✅ 差异已保存到：{output_path}")
+    else:
+        print(diff, end="")
+
+
+def load_comparison_cache(interview_dir: str) -> Dict[str, Any]:
+    """加载版本对比缓存（对比逻辑版本不一致时丢弃）"""
+    cache_path = Path(interview_dir) / COMPARISON_CACHE_FILENAME
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("cache_version") == COMPARISON_CACHE_VERSION:
+                return cache.get("pairs", {})
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def save_comparison_cache(interview_dir: str, pairs: Dict[str, Any]):
+    """保存版本对比缓存"""
+    cache_path = Path(interview_dir) / COMPARISON_CACHE_FILENAME
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({"cache_version": COMPARISON_CACHE_VERSION, "pairs": pairs}, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠️  无法写入对比缓存：{e}")
+
+
+def build_timeline(interview_dir: str, all_pairs: bool = False) -> Dict[str, Any]:
+    """
+    对比所有版本，生成演进时间线
+
+    默认对比相邻版本，all_pairs 时对比所有版本两两组合。每个版本只解析一次；
+    对比结果按 (旧版本内容哈希, 新版本内容哈希) 缓存，文件未变化的版本对不会重新对比。
+    """
+    versions = find_persona_versions(interview_dir)
+    version_data = {v["version"]: load_version_data(interview_dir, v["version"], v) for v in versions}
+
+    if all_pairs:
+        pairs = [(old, new) for i, old in enumerate(versions) for new in versions[i + 1:]]
+    else:
+        pairs = list(zip(versions, versions[1:]))
+
+    cached_pairs = load_comparison_cache(interview_dir)
+    used_pairs = {}
+    comparisons = []
+    cache_hits = 0
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    for old, new in pairs:
+        key = f"{old['sha256']}:{new['sha256']}"
+        comparison = cached_pairs.get(key)
+        if comparison is None:
+            comparison = compare_versions(version_data[old["version"]], version_data[new["version"]])
+        else:
+            cache_hits += 1
+            # 内容相同但文件可能已重命名，版本号以当前清单为准
+            comparison = dict(comparison, old_version=old["version"], new_version=new["version"], comparison_date=today)
+
+        used_pairs[key] = comparison
+        comparisons.append(comparison)
+
+    # 只保留本次用到的版本对，避免缓存无限增长
+    if used_pairs != cached_pairs:
+        save_comparison_cache(interview_dir, used_pairs)
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "mode": "all_pairs" if all_pairs else "consecutive",
+        "cache_hits": cache_hits,
+        "versions": [version_data[v["version"]] for v in versions],
+        "comparisons": comparisons
+    }
+
+
+def generate_timeline_report(timeline: Dict[str, Any]) -> str:
+    """生成演进时间线报告（Markdown格式）"""
+    version_data = {data["version"]: data for data in timeline["versions"]}
+    report = []
+
+    report.append("# 画像演进时间线\n")
+    report.append(f"**生成时间**：{timeline['generated_at'][:19].replace('T', ' ')}")
+    report.append(f"**版本数量**：{len(timeline['versions'])}")
+    report.append(f"**对比方式**：{'所有版本两两对比' if timeline['mode'] == 'all_pairs' else '相邻版本对比'}\n")
+
+    # 版本概览
+    report.append("## 版本概览\n")
+    report.append("| 版本 | 版本名称 | 创建时间 | 数据源 | 核心发现 | 优势 | 劣势 |")
+    report.append("|------|----------|----------|--------|----------|------|------|")
+    for data in timeline["versions"]:
+        report.append(
+            f"| {data['version']} | {data['version_name'] or '-'} | {data['created_at'] or '-'} "
+            f"| {len(data['data_sources'])} | {len(data['key_findings'])} "
+            f"| {len(data['strengths'])} | {len(data['weaknesses'])} |"
+        )
+    report.append("")
+
+    # 对比摘要
+    if timeline["comparisons"]:
+        report.append("## 对比摘要\n")
+        report.append("| 对比 | 新增数据源 | 进步点 | 新问题 | 变化 |")
+        report.append("|------|------------|--------|--------|------|")
+        for comparison in timeline["comparisons"]:
+            report.append(
+                f"| {comparison['old_version']} → {comparison['new_version']} "
+                f"| {len(comparison['new_data_sources'])} | {len(comparison['improvements'])} "
+                f"| {len(comparison['new_issues'])} | {len(comparison['changes'])} |"
+            )
+        report.append("")
+
+    # 每一对版本的详细对比（标题降一级后拼接）
+    for comparison in timeline["comparisons"]:
+        section = generate_comparison_report(
+            comparison,
+            version_data[comparison["old_version"]],
+            version_data[comparison["new_version"]]
+        )
+        report.append("#" + section + "\n")
+
+    return "\n".join(report)
+
+
+def timeline_command(
+    interview_dir: str,
+    all_pairs: bool = False,
+    output_path: Optional[str] = None,
+    json_path: Optional[str] = None
+):
+    """生成演进时间线"""
+    timeline = build_timeline(interview_dir, all_pairs)
+
+    if len(timeline["versions"]) < 2:
+        print("❌ 至少需要两个版本才能生成时间线")
+        return
+
+    report = generate_timeline_report(timeline)
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"✅ 时间线报告已保存到：{output_path}")
+    elif not json_path:
+        print("\n" + report)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(timeline, f, ensure_ascii=False, indent=2)
+        print(f"✅ 时间线数据已保存到：{json_path}")
+
+    print(f"\n📊 共 {len(timeline['versions'])} 个版本，{len(timeline['comparisons'])} 组对比（缓存命中 {timeline['cache_hits']} 组）")
+
+
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Persona版本对比工具")
-    parser.add_argument("command", choices=["list", "compare", "show"], help="命令")
+    parser.add_argument("command", choices=["list", "compare", "show", "timeline", "archive", "restore", "delta"], help="命令")
 
     # list命令不需要额外参数
     # compare命令需要 --old 和 --new
     # show命令需要 --version
+    # timeline命令可选 --all-pairs、--output、--json
+    # archive命令不需要额外参数，restore命令需要 --version，delta命令需要 --old 和 --new
 
     parser.add_argument("--old", help="旧版本（如：v1.1）")
     parser.add_argument("--new", help="新版本（如：v1.2）")
     parser.add_argument("--version", help="版本号（如：v1.2）")
     parser.add_argument("--output", help="输出文件路径")
+    parser.add_argument("--json", dest="json_path", help="timeline命令：JSON数据输出路径")
+    parser.add_argument("--all-pairs", action="store_true", help="timeline命令：对比所有版本两两组合（默认只对比相邻版本）")
     parser.add_argument("--interview-dir", default="interviews", help="访谈目录路径")
 
     args = parser.parse_args()
@@ -406,6 +667,28 @@ def main():
 
             show_version_details(str(interview_dir), args.version)
 
+        elif args.command == "timeline":
+            timeline_command(str(interview_dir), args.all_pairs, args.output, args.json_path)
+
+        elif args.command == "archive":
+            archive_versions_command(str(interview_dir))
+
+        elif args.command == "restore":
+            if not args.version:
+                print("❌ restore命令需要 --version 参数")
+                print("示例：python version_comparer.py restore --version v1.1")
+                sys.exit(1)
+
+            restore_version_command(str(interview_dir), args.version, args.output)
+
+        elif args.command == "delta":
+            if not args.old or not args.new:
+                print("❌ delta命令需要 --old 和 --new 参数")
+                print("示例：python version_comparer.py delta --old v1.1 --new v1.2")
+                sys.exit(1)
+
+            delta_command(str(interview_dir), args.old, args.new, args.output)
+
     except Exception as e:
         print(f"❌ 错误：{e}")
         import traceback
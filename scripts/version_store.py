@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+版本存储 - 画像历史版本以"基准快照 + 增量"的方式保存
+
+存储结构（data/versions/<访谈目录名>-<路径哈希>/）：
+    index.json            # 版本索引（版本号、内容哈希、父版本、对象文件）
+    objects/v1.0.full.gz  # 基准快照（完整内容）
+    objects/v1.1.delta.gz # 相对父版本的行级增量
+
+增量由 difflib 按行计算，只记录"复制父版本第 i1~i2 行"和"插入新行"两种操作，
+存储空间随修改量增长，而不是随版本数量增长。每 KEYFRAME_INTERVAL 个增量保存一次
+完整快照，限制重建时需要回放的增量链长度。
+
+重建任意版本时从最近的快照（或 LRU 缓存中最近物化过的祖先版本）开始回放增量；
+相邻版本的差异可以直接从增量中读出，不需要对两个完整文件重新做 diff。
+
+使用方法：
+    from version_store import VersionStore
+
+    store = VersionStore.for_interview_dir("interviews")
+    store.archive("v1.2", content)
+    content = store.materialize("v1.1")
+    for line in store.diff("v1.1", "v1.2"):
+        print(line)
+"""
+
+import gzip
+import json
+import difflib
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from tenant_storage import DATA_ROOT
+
+
+VERSIONS_ROOT = DATA_ROOT / "versions"
+
+# 每隔多少个增量保存一次完整快照
+KEYFRAME_INTERVAL = 16
+
+# 物化版本的 LRU 缓存大小
+MATERIALIZED_CACHE_SIZE = 8
+
+
+def compute_delta(old_lines: List[str], new_lines: List[str]) -> List[list]:
+    """
+    计算行级增量
+
+    返回操作列表：["=", i1, i2] 复制父版本第 i1~i2 行，["+", [行...]] 插入新行
+    """
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append(["+", new_lines[j1:j2]])
+        # delete：不复制即可
+    return ops
+
+
+def apply_delta(old_lines: List[str], ops: List[list]) -> List[str]:
+    """在父版本上回放增量"""
+    new_lines = []
+    for op in ops:
+        if op[0] == "=":
+            new_lines.extend(old_lines[op[1]:op[2]])
+        else:
+            new_lines.extend(op[1])
+    return new_lines
+
+
+class VersionStore:
+    """单个访谈目录的画像版本存储"""
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / "objects"
+        self.index_path = self.store_dir / "index.json"
+        self.cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.index = self.load_index()
+
+    @classmethod
+    def for_interview_dir(cls, interview_dir: str) -> "VersionStore":
+        """访谈目录对应的版本存储（同名目录按绝对路径区分）"""
+        path = Path(interview_dir).resolve()
+        path_hash = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:8]
+        return cls(VERSIONS_ROOT / f"{path.name}-{path_hash}")
+
+    def load_index(self) -> Dict[str, Any]:
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {"versions": {}, "order": []}
+
+    def save_index(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2)
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """按归档顺序返回版本条目"""
+        return [self.index["versions"][v] for v in self.index["order"]]
+
+    def get(self, version: str) -> Optional[Dict[str, Any]]:
+        return self.index["versions"].get(version)
+
+    def write_object(self, name: str, payload: Any) -> int:
+        """写入压缩对象，返回占用字节数"""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        with open(self.objects_dir / name, 'wb') as f:
+            f.write(data)
+        return len(data)
+
+    def read_object(self, name: str) -> Any:
+        with open(self.objects_dir / name, 'rb') as f:
+            return json.loads(gzip.decompress(f.read()).decode('utf-8'))
+
+    def archive(self, version: str, content: str, source_file: Optional[str] = None) -> Dict[str, Any]:
+        """
+        归档一个版本（相对最后归档的版本保存增量）
+
+        已归档且内容相同的版本直接返回原条目；内容不同则抛出 ValueError（历史版本不可修改）。
+        """
+        sha256 = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        existing = self.get(version)
+        if existing:
+            if existing["sha256"] != sha256:
+                raise ValueError(f"版本 {version} 已归档且内容不同，历史版本不可修改")
+            return existing
+
+        lines = content.splitlines(keepends=True)
+        parent = self.index["order"][-1] if self.index["order"] else None
+        chain = self.get(parent)["chain_length"] + 1 if parent else 0
+
+        if parent is None or chain >= KEYFRAME_INTERVAL:
+            kind, parent, chain = "full", None, 0
+            object_name = f"{version}.full.gz"
+            stored_bytes = self.write_object(object_name, lines)
+        else:
+            kind = "delta"
+            object_name = f"{version}.delta.gz"
+            stored_bytes = self.write_object(object_name, compute_delta(self.materialize_lines(parent), lines))
+
+        entry = {
+            "version": version,
+            "kind": kind,
+            "parent": parent,
+            "chain_length": chain,
+            "object": object_name,
+            "sha256": sha256,
+            "size": len(content.encode('utf-8')),
+            "stored_bytes": stored_bytes,
+            "source_file": source_file,
+            "archived_at": datetime.now().isoformat()
+        }
+        self.index["versions"][version] = entry
+        self.index["order"].append(version)
+        self.save_index()
+
+        self.remember(version, lines)
+        return entry
+
+    def remember(self, version: str, lines: List[str]):
+        """放入物化版本 LRU 缓存"""
+        self.cache[version] = lines
+        self.cache.move_to_end(version)
+        while len(self.cache) > MATERIALIZED_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def materialize_lines(self, version: str) -> List[str]:
+        """重建指定版本（从最近的快照或已缓存的祖先开始回放增量）"""
+        if version in self.cache:
+            self.cache.move_to_end(version)
+            return self.cache[version]
+
+        entry = self.get(version)
+        if not entry:
+            raise KeyError(f"版本存储中没有 {version}")
+
+        # 沿父版本向上找到快照或已缓存的祖先
+        chain = []
+        current = entry
+        while current["kind"] == "delta" and current["version"] not in self.cache:
+            chain.append(current)
+            current = self.get(current["parent"])
+
+        if current["version"] in self.cache:
+            lines = self.cache[current["version"]]
+        else:
+            lines = self.read_object(current["object"])
+            self.remember(current["version"], lines)
+
+        for delta_entry in reversed(chain):
+            lines = apply_delta(lines, self.read_object(delta_entry["object"]))
+
+        if hashlib.sha256("".join(lines).encode('utf-8')).hexdigest() != entry["sha256"]:
+            raise ValueError(f"版本 {version} 重建后内容哈希不一致，存储可能已损坏")
+
+        self.remember(version, lines)
+        return lines
+
+    def materialize(self, version: str) -> str:
+        """重建指定版本的完整内容"""
+        return "".join(self.materialize_lines(version))
+
+    def diff(self, old_version: str, new_version: str) -> Iterator[str]:
+        """
+        两个版本的差异（--- / +++ 文件头加上逐行的 -删除 / +新增）
+
+        new_version 的增量正是相对 old_version 保存的时候，直接由增量生成差异，
+        否则重建两个版本后再比较。
+        """
+        entry = self.get(new_version)
+        if not entry or not self.get(old_version):
+            missing = new_version if not entry else old_version
+            raise KeyError(f"版本存储中没有 {missing}")
+
+        yield f"--- {old_version}\n"
+        yield f"+++ {new_version}\n"
+
+        if entry["kind"] == "delta" and entry["parent"] == old_version:
+            # 未被复制的父版本行即为删除的行；插入的行暂存，输出在对应删除行之后
+            old_lines = self.materialize_lines(old_version)
+            position = 0
+            inserted = []
+            for op in self.read_object(entry["object"]) + [["=", len(old_lines), len(old_lines)]]:
+                if op[0] == "=":
+                    for line in old_lines[position:op[1]]:
+                        yield "-" + line
+                    for line in inserted:
+                        yield "+" + line
+                    inserted = []
+                    position = op[2]
+                else:
+                    inserted.extend(op[1])
+            return
+
+        old_lines = self.materialize_lines(old_version)
+        new_lines = self.materialize_lines(new_version)
+        # 跳过 unified_diff 自己的两行文件头和 @@ 块头，内容行（包括删除的 Markdown 分隔线 ---）原样输出
+        for index, line in enumerate(difflib.unified_diff(old_lines, new_lines, n=0)):
+            if index >= 2 and not line.startswith("@@ "):
+                yield line
+
+    def stats(self) -> Dict[str, int]:
+        """存储统计：原始总大小与实际占用"""
+        entries = self.versions()
+        return {
+            "versions": len(entries),
+            "snapshots": sum(1 for e in entries if e["kind"] == "full"),
+            "original_bytes": sum(e["size"] for e in entries),
+            "stored_bytes": sum(e["stored_bytes"] for e in entries)
+        }
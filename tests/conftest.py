@@ -0,0 +1,96 @@
+"""测试共用的本地桩：模拟 Anthropic / OpenAI 流式 API 的 HTTP/1.1 服务器（不访问网络）"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+# 桩服务器的正常回复（通过简历 schema 校验）
+STUB_RESULT = {
+    "basics": {"name": "张三", "email": "zhangsan@example.com"},
+    "summary": "后端工程师",
+    "work_history": [{"company": "ACME", "position": "工程师"}],
+    "skills": ["Python", "SQL"],
+}
+
+# 按请求中的 model 选择回复方式
+MODEL_OK = "stub-ok"            # 正常 JSON，分成 12 个字符一块、每块间隔 10ms
+MODEL_MALFORMED = "stub-bad"    # 格式错误的 JSON，后面还有很长的输出
+MODEL_STALL = "stub-stall"      # 发出一块后停顿 8 秒
+
+TOKEN_SIZE = 12
+TOKEN_DELAY = 0.01
+STALL_SECONDS = 8.0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def write_token(self, text: str):
+        if self.path.endswith("/messages"):
+            event = {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}}
+            self.write_chunk(f"event: content_block_delta\ndata: {json.dumps(event)}\n\n".encode())
+        else:
+            self.write_chunk(f"data: {json.dumps({'choices': [{'delta': {'content': text}}]})}\n\n".encode())
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = request.get("model")
+        if model == MODEL_MALFORMED:
+            text = '{"basics": {"name": "x"}, "skills": [1, 2}' + " garbage" * 200
+        else:
+            text = "```json\n" + json.dumps(STUB_RESULT, ensure_ascii=False) + "\n```"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i in range(0, len(text), TOKEN_SIZE):
+                time.sleep(STALL_SECONDS if model == MODEL_STALL and i else TOKEN_DELAY)
+                self.write_token(text[i:i + TOKEN_SIZE])
+            if self.path.endswith("/messages"):
+                self.write_chunk(b'event: message_stop\ndata: {"type": "message_stop"}\n\n')
+            else:
+                self.write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except OSError:
+            # 客户端中止了流
+            pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """启动桩服务器，并让 llm_clients 的标准库路径指向它；返回 "127.0.0.1:端口"（connection_stats 的键）"""
+    import llm_clients
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    host = f"127.0.0.1:{server.server_port}"
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "stub-key")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", f"http://{host}")
+    monkeypatch.setenv("OPENAI_API_KEY", "stub-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://{host}/v1")
+    # 即使安装了 SDK 也走标准库连接池
+    monkeypatch.setattr(llm_clients, "get_client", lambda provider, asynchronous=False: None)
+
+    yield host
+
+    server.shutdown()
+    server.server_close()
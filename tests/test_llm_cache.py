@@ -0,0 +1,67 @@
+"""llm_cache 的缓存命中与校验测试，用 StubProvider 代替真实 API（运行：python -m pytest tests/）"""
+
+import asyncio
+
+import pytest
+
+from llm_cache import LLMCache, StubProvider, cached_extract, cached_extract_async
+from schema_check import SchemaError
+
+RESULT = {"basics": {"name": "张三"}}
+
+
+def test_second_call_hits_the_cache(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    stub = StubProvider(RESULT)
+
+    assert cached_extract("stub", "stub-model", "resume-v1", "简历原文", stub, cache) == RESULT
+    assert cached_extract("stub", "stub-model", "resume-v1", "简历原文", stub, cache) == RESULT
+    assert stub.calls == 1
+
+    # 文本、提示词版本或模型变化时重新调用
+    cached_extract("stub", "stub-model", "resume-v2", "简历原文", stub, cache)
+    cached_extract("stub", "other-model", "resume-v1", "简历原文", stub, cache)
+    cached_extract("stub", "stub-model", "resume-v1", "另一份简历", stub, cache)
+    assert stub.calls == 4
+
+
+def test_async_call_hits_the_cache(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    stub = StubProvider(RESULT, delay=0.01)
+
+    async def run():
+        for _ in range(3):
+            assert await cached_extract_async("stub", "stub-model", "resume-v1", "简历原文", stub.call_async, cache) == RESULT
+
+    asyncio.run(run())
+    assert stub.calls == 1
+
+
+def test_failed_calls_are_not_cached(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    stub = StubProvider(RESULT, failures=1)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cached_extract_async("stub", "stub-model", "resume-v1", "简历原文", stub.call_async, cache)
+        return await cached_extract_async("stub", "stub-model", "resume-v1", "简历原文", stub.call_async, cache)
+
+    assert asyncio.run(run()) == RESULT
+    assert stub.calls == 2
+
+
+def test_results_failing_validation_are_not_cached(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    stub = StubProvider({"basics": "不是对象"})
+
+    def check(result):
+        return [] if isinstance(result.get("basics"), dict) else ["basics 应为对象"]
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(SchemaError):
+                await cached_extract_async("stub", "stub-model", "resume-v1", "简历原文", stub.call_async, cache, check)
+
+    asyncio.run(run())
+    assert stub.calls == 2
+    assert cache.stats()["entries"] == 0
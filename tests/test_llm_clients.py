@@ -0,0 +1,81 @@
+"""llm_clients 标准库路径的测试：连接复用、流式解析、取消时中止（运行：python -m pytest tests/）"""
+
+import asyncio
+import time
+
+import pytest
+
+from conftest import MODEL_MALFORMED, MODEL_OK, MODEL_STALL, STUB_RESULT
+from llm_clients import connection_stats, stream, stream_async
+from llm_orchestrator import ExtractionOrchestrator
+from streaming_json import StreamingJSONError, parse_stream, parse_stream_async
+
+
+@pytest.mark.parametrize("provider", ["anthropic", "openai"])
+def test_sequential_streams_reuse_one_connection(stub_server, provider):
+    for _ in range(5):
+        assert parse_stream(stream(provider, MODEL_OK, "prompt")) == STUB_RESULT
+
+    stats = connection_stats()[stub_server]
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+
+
+def test_concurrent_streams_open_at_most_one_connection_each(stub_server):
+    async def run():
+        for _ in range(2):
+            results = await asyncio.gather(*(
+                parse_stream_async(stream_async("anthropic", MODEL_OK, "prompt")) for _ in range(4)
+            ))
+            assert results == [STUB_RESULT] * 4
+
+    asyncio.run(run())
+
+    stats = connection_stats()[stub_server]
+    assert stats["requests"] == 8
+    assert stats["connections_opened"] <= 4
+
+
+def test_streamed_fields_arrive_before_the_response_ends(stub_server):
+    arrivals = {}
+    start = time.monotonic()
+
+    result = parse_stream(
+        stream("anthropic", MODEL_OK, "prompt"),
+        lambda key, value: arrivals.setdefault(key, time.monotonic() - start)
+    )
+
+    # 每块间隔 10ms：basics 在输出开头，比最后的 skills 早几块到达
+    assert result == STUB_RESULT
+    assert arrivals["basics"] < arrivals["skills"] - 0.03
+
+
+def test_malformed_stream_fails_fast_and_keeps_the_pool_usable(stub_server):
+    start = time.monotonic()
+    with pytest.raises(StreamingJSONError):
+        parse_stream(stream("anthropic", MODEL_MALFORMED, "prompt"))
+    # 完整输出需要约 1.5 秒，格式错误在前几块就被发现
+    assert time.monotonic() - start < 0.5
+
+    assert parse_stream(stream("anthropic", MODEL_OK, "prompt")) == STUB_RESULT
+
+
+def test_cancelled_stream_aborts_its_reader_thread(stub_server):
+    async def slow(text):
+        return await parse_stream_async(stream_async("anthropic", MODEL_STALL, text))
+
+    async def fast(text):
+        return await parse_stream_async(stream_async("openai", MODEL_OK, text))
+
+    orchestrator = ExtractionOrchestrator(
+        [{"name": "anthropic", "label": "Slow", "call": slow}, {"name": "openai", "label": "Fast", "call": fast}],
+        strategy="race"
+    )
+
+    start = time.monotonic()
+    result, label = asyncio.run(orchestrator.extract("prompt"))
+
+    # 落败的流被中止，asyncio.run 不必等桩服务器停顿的 8 秒
+    assert (result, label) == (STUB_RESULT, "Fast")
+    assert time.monotonic() - start < 3
@@ -0,0 +1,84 @@
+"""resume_parser 批量模式测试，用 StubProvider 代替真实 API（运行：python -m pytest tests/）"""
+
+import json
+
+import pytest
+
+import llm_cache
+import provider_health
+import resume_parser
+from conftest import STUB_RESULT
+from llm_cache import LLMCache, StubProvider
+from provider_health import ProviderHealth
+
+
+@pytest.fixture
+def isolated_state(tmp_path, monkeypatch):
+    """缓存和熔断状态写到临时目录，不影响 data/"""
+    monkeypatch.setattr(llm_cache, "_default_cache", LLMCache(str(tmp_path / "llm_cache")))
+    monkeypatch.setattr(provider_health, "_default_health", ProviderHealth(str(tmp_path / "health.json")))
+
+
+def write_resumes(directory, count):
+    directory.mkdir()
+    for i in range(count):
+        (directory / f"resume{i}.md").write_text(f"张三{i}\n邮箱：zhang{i}@example.com\n", encoding="utf-8")
+
+
+def stub_providers(stub):
+    return [{"name": "stub", "label": "Stub", "model": "stub-model", "call": stub.call_async}]
+
+
+def test_rerun_skips_completed_files(tmp_path, isolated_state):
+    write_resumes(tmp_path / "in", 6)
+    stub = StubProvider(STUB_RESULT, delay=0.01)
+
+    first = resume_parser.run_batch(
+        str(tmp_path / "in"), output_dir=str(tmp_path / "out"), concurrency=3, workers=2, providers=stub_providers(stub)
+    )
+    assert (first["processed"], first["skipped"], first["failed"]) == (6, 0, [])
+    assert stub.calls == 6
+
+    saved = json.loads((tmp_path / "out" / "resume0_parsed.json").read_text(encoding="utf-8"))
+    assert saved["extraction_method"] == "Stub"
+    assert saved["basics"] == STUB_RESULT["basics"]
+
+    second = resume_parser.run_batch(
+        str(tmp_path / "in"), output_dir=str(tmp_path / "out"), concurrency=3, workers=2, providers=stub_providers(stub)
+    )
+    assert (second["processed"], second["skipped"]) == (0, 6)
+    assert stub.calls == 6
+
+    # 修改过的文件重新提取
+    (tmp_path / "in" / "resume0.md").write_text("李四\n邮箱：lisi@example.com\n", encoding="utf-8")
+    third = resume_parser.run_batch(
+        str(tmp_path / "in"), output_dir=str(tmp_path / "out"), concurrency=3, workers=2, providers=stub_providers(stub)
+    )
+    assert (third["processed"], third["skipped"]) == (1, 5)
+    assert stub.calls == 7
+
+
+def test_failed_provider_calls_are_retried(tmp_path, isolated_state, monkeypatch):
+    monkeypatch.setattr(resume_parser, "RETRY_BASE_DELAY", 0.01)
+    write_resumes(tmp_path / "in", 1)
+    stub = StubProvider(STUB_RESULT, failures=2)
+
+    summary = resume_parser.run_batch(
+        str(tmp_path / "in"), output_dir=str(tmp_path / "out"), workers=1, retries=2, providers=stub_providers(stub)
+    )
+
+    assert summary["processed"] == 1
+    assert stub.calls == 3
+
+
+def test_same_named_resumes_do_not_overwrite_each_other(tmp_path, isolated_state):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "resume.md").write_text("张三\n邮箱：zhang@example.com\n", encoding="utf-8")
+    (tmp_path / "in" / "resume.txt").write_text("李四\n邮箱：li@example.com\n", encoding="utf-8")
+
+    summary = resume_parser.run_batch(str(tmp_path / "in"), output_dir=str(tmp_path / "out"), workers=1, use_llm=False)
+
+    assert summary["processed"] == 2
+    assert sorted(p.name for p in (tmp_path / "out").glob("*_parsed.json")) == [
+        "resume_md_parsed.json", "resume_txt_parsed.json"
+    ]
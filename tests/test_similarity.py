@@ -0,0 +1,76 @@
+"""similarity.match_items 的配对测试（运行：python -m pytest tests/）"""
+
+import itertools
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from similarity import match_items, min_cost_assignment  # noqa: E402
+
+
+def test_shared_boilerplate_does_not_steal_reworded_finding():
+    old = [
+        "发现0：偏好在小圈子内建立深度关系，这一点需要在后续访谈中进一步验证",
+        "发现1：决策时依赖直觉而非数据，这一点需要在后续访谈中进一步验证",
+        "发现2：对长期目标有清晰规划",
+    ]
+    new = [
+        "发现0：偏好在小圈子内建立深度关系，并整合盖洛普结果",
+        "发现1：决策时依赖直觉而非数据，这一点需要在后续访谈中进一步验证",
+        "发现2：对长期目标有清晰规划",
+        "发现4：习惯独立工作，这一点需要在后续访谈中进一步验证",
+    ]
+
+    result = match_items(old, new)
+
+    assert [(o, n) for o, n, _ in result["changed"]] == [(old[0], new[0])]
+    assert result["added"] == [new[3]]
+    assert result["removed"] == []
+
+
+def test_extended_strength_is_a_change_not_a_new_item():
+    old = [
+        "深度关系建立，需要验证",
+        "战略思维，需要验证",
+        "责任心强，需要验证",
+    ]
+    new = [
+        "深度关系建立，结合访谈并整合盖洛普结果",
+        "战略思维，需要验证",
+        "责任心强，需要验证",
+    ]
+
+    result = match_items(old, new)
+
+    assert [(o, n) for o, n, _ in result["changed"]] == [(old[0], new[0])]
+    assert result["added"] == []
+    assert result["removed"] == []
+
+
+def test_equal_similarity_pairs_by_position():
+    old = ["甲方案，需要验证", "乙方案，需要验证"]
+    new = ["甲方案调整，需要确认", "乙方案调整，需要确认"]
+
+    result = match_items(old, new)
+
+    assert [(o, n) for o, n, _ in result["changed"]] == list(zip(old, new))
+
+
+def test_min_cost_assignment_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(200):
+        rows = rng.randint(1, 4)
+        cols = rng.randint(rows, 5)
+        cost = [[rng.choice([0.0, -rng.random()]) for _ in range(cols)] for _ in range(rows)]
+
+        assignment = min_cost_assignment(cost)
+        best = min(
+            sum(cost[r][perm[r]] for r in range(rows))
+            for perm in itertools.permutations(range(cols), rows)
+        )
+
+        assert sorted(assignment) == list(range(rows))
+        assert len(set(assignment.values())) == rows
+        assert abs(sum(cost[r][c] for r, c in assignment.items()) - best) < 1e-9
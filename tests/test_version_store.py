@@ -0,0 +1,19 @@
+"""version_store.VersionStore 的差异输出测试（运行：python -m pytest tests/）"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from version_store import VersionStore  # noqa: E402
+
+
+def test_diff_keeps_removed_markdown_rule(tmp_path):
+    store = VersionStore(tmp_path / "versions")
+    store.archive("v1", "# 标题\n---\n规则A\n")
+    store.archive("v2", "# 标题\n规则A\n")
+    store.archive("v3", "# 标题\n规则A\n规则B\n")
+
+    # v1 → v3 不是相邻增量，走 difflib 路径
+    assert list(store.diff("v1", "v3")) == ["--- v1\n", "+++ v3\n", "----\n", "+规则B\n"]
+    assert list(store.diff("v1", "v2")) == ["--- v1\n", "+++ v2\n", "----\n"]